@@ -0,0 +1,205 @@
+"""
+Multi-worker overlay broadcast load test
+
+Starts the server with 1, 2, 4... workers (run.py, local backplane hub),
+attaches overlay chat sockets from several client processes, posts chat
+webhooks and reports delivered frames per second for each worker count.
+
+    python -m benchmarks.backplane_scale --workers 1 2 4 --clients 400 --events 200
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MEETING_ID = 424242
+TOKEN_SECRET = 'backplane-benchmark'
+WEBHOOK_SECRET = 'backplane-webhooks'
+
+
+def chat_event(index: int):
+    return {
+        'event': 'meeting.chat_message_sent',
+        'event_ts': int(time.time() * 1000),
+        'payload': {
+            'account_id': 'bench',
+            'operator': 'bench',
+            'object': {
+                'id': MEETING_ID,
+                'uuid': 'bench',
+                'chat_message': {
+                    'id': str(index),
+                    'message_id': str(index),
+                    'date_time': datetime.utcnow().isoformat() + 'Z',
+                    'sender_name': f"Attendee {index % 50}",
+                    'sender_email': 'bench@example.com',
+                    'sender_session_id': f"bench-{index}",  # Unique, so chat moderation never rate limits
+                    'sender_type': 'guest',
+                    'recipient_type': 'everyone',
+                    'message': f"load test message {index}",
+                    'message_content': f"load test message {index}"
+                }
+            }
+        }
+    }
+
+
+async def overlay_clients(url: str, token: str, count: int, events: int, ready, results):
+    """Open sockets, signal readiness, then time until every socket saw all events"""
+    async with aiohttp.ClientSession() as session:
+        sockets = []
+        for _ in range(count):
+            ws = await session.ws_connect(url, max_msg_size=0)
+            await ws.send_json({'type': 'auth', 'token': token, 'meeting_id': str(MEETING_ID)})
+            sockets.append(ws)
+        ready.put(count)
+
+        async def drain(ws):
+            seen = 0
+            while seen < events:
+                message = await ws.receive()
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                if json.loads(message.data).get('type') == 'chat':
+                    seen += 1
+            return time.time(), seen
+
+        done = await asyncio.gather(*[drain(ws) for ws in sockets])
+        results.put((max(finished for finished, _ in done), sum(seen for _, seen in done)))
+        for ws in sockets:
+            await ws.close()
+
+
+def client_process(url, token, count, events, ready, results):
+    asyncio.run(overlay_clients(url, token, count, events, ready, results))
+
+
+async def post_events(base_url: str, events: int, concurrency: int):
+    from src.server.webhooks.routes import signature_headers
+
+    latencies = []
+    queue = asyncio.Queue()
+    for index in range(events):
+        queue.put_nowait(index)
+
+    async with aiohttp.ClientSession() as session:
+        async def poster():
+            while not queue.empty():
+                index = queue.get_nowait()
+                body = json.dumps(chat_event(index)).encode()
+                headers = {'Content-Type': 'application/json', **signature_headers(WEBHOOK_SECRET, body)}
+                started = time.perf_counter()
+                async with session.post(f"{base_url}/webhooks/zoom", data=body, headers=headers) as response:
+                    await response.read()
+                    if response.status != 200:
+                        raise RuntimeError(f"Webhook failed: {response.status}")
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*[poster() for _ in range(concurrency)])
+    return latencies
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0):
+    async def poll():
+        deadline = time.time() + timeout
+        async with aiohttp.ClientSession() as session:
+            while time.time() < deadline:
+                try:
+                    async with session.get(f"{base_url}/health") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("Server did not start")
+    asyncio.run(poll())
+
+
+def run_round(workers: int, args, token: str, scratch: str):
+    port = args.port + workers
+    env = dict(os.environ,
+               OVERLAY_TOKEN_SECRET=TOKEN_SECRET,
+               SECRET_TOKEN=WEBHOOK_SECRET,
+               SUBSCRIPTION_DB_PATH=os.path.join(scratch, f"subscriptions-{workers}.db"),
+               TOKEN_DB_PATH=os.path.join(scratch, f"tokens-{workers}.db"))
+    env.pop('OVERLAY_BACKPLANE_URL', None)
+
+    server = subprocess.Popen(
+        [sys.executable, 'run.py', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--backplane-port', str(args.port + 100 + workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_server(base_url)
+
+        ready, results = multiprocessing.Queue(), multiprocessing.Queue()
+        per_process = args.clients // args.client_processes
+        clients = [
+            multiprocessing.Process(target=client_process, args=(
+                f"ws://127.0.0.1:{port}/ws/overlay/chat", token, per_process, args.events, ready, results))
+            for _ in range(args.client_processes)
+        ]
+        for client in clients:
+            client.start()
+        for _ in clients:
+            ready.get(timeout=60)
+        time.sleep(0.5)  # Let the last subscriptions register
+
+        started = time.time()
+        latencies = asyncio.run(post_events(base_url, args.events, args.concurrency))
+        finished = [results.get(timeout=120) for _ in clients]
+        elapsed = max(done for done, _ in finished) - started
+        delivered = sum(seen for _, seen in finished)
+        for client in clients:
+            client.join()
+
+        latencies.sort()
+        return {
+            'workers': workers,
+            'frames_delivered': delivered,
+            'seconds': round(elapsed, 3),
+            'frames_per_second': round(delivered / elapsed),
+            'webhook_p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'webhook_p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2)
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=400)
+    parser.add_argument('--client-processes', type=int, default=4)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=18000)
+    args = parser.parse_args()
+
+    os.environ['OVERLAY_TOKEN_SECRET'] = TOKEN_SECRET
+    from src.server.overlay_tokens import overlay_tokens
+    token = overlay_tokens.mint('bench', 'chat', datetime.now() + timedelta(hours=1), MEETING_ID)
+
+    print(f"cpus: {os.cpu_count()}  clients: {args.clients}  events: {args.events}")
+    with tempfile.TemporaryDirectory() as scratch:
+        for workers in args.workers:
+            print(json.dumps(run_round(workers, args, token, scratch)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Chat moderation cost as the term list grows
+
+Times the server-side chat stage per message for blocklists of increasing
+size, comparing the compiled TermMatcher (Aho-Corasick, one pass over the
+message) with a single combined word-boundary regex over the same terms.
+Messages are drawn from a fixed vocabulary with an occasional blocked term.
+
+    python -m benchmarks.chat_moderation --terms 10 1000 10000 50000 --messages 5000
+"""
+import argparse
+import json
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.server.websocket.moderation import ChatModerator, TermMatcher, fold, sanitize  # noqa: E402
+
+WORDS = (
+    'hello', 'from', 'london', 'great', 'talk', 'thanks', 'question', 'about', 'the', 'slides',
+    'can', 'you', 'share', 'link', 'again', 'audio', 'is', 'fine', 'now', 'love', 'this', 'demo'
+)
+
+
+def make_terms(count: int, rng: random.Random):
+    """Random lowercase words and a few two-word phrases, none from the message vocabulary"""
+    terms = set()
+    while len(terms) < count:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        if word not in WORDS:
+            terms.add(word if rng.random() < 0.9 else f"{word} {rng.choice(string.ascii_lowercase) * 3}")
+    return sorted(terms)
+
+
+def make_messages(count: int, terms, rng: random.Random):
+    messages = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(3, 20))
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words)), rng.choice(terms).upper())
+        messages.append(' '.join(words))
+    return messages
+
+
+def combined_regex(terms):
+    """The alternative: one alternation of every term, case-insensitive, whole words"""
+    escaped = sorted((re.escape(term) for term in terms), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(escaped) + r')\b', re.IGNORECASE)
+
+
+def time_per_message(match, messages) -> float:
+    """Mean seconds per message, best of three passes"""
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        for message in messages:
+            match(message)
+        best = min(best, time.perf_counter() - started)
+    return best / len(messages)
+
+
+def run(count: int, args):
+    rng = random.Random(count)
+    terms = make_terms(count, rng)
+    messages = make_messages(args.messages, terms, rng)
+
+    started = time.perf_counter()
+    matcher = TermMatcher(terms)
+    matcher_build = time.perf_counter() - started
+    started = time.perf_counter()
+    pattern = combined_regex(terms)
+    regex_build = time.perf_counter() - started
+
+    # Both must flag the same messages, or the timing comparison means nothing
+    flagged = sum(bool(matcher.find(message)) for message in messages)
+    assert flagged == sum(bool(pattern.search(fold(message))) for message in messages)
+
+    moderator = ChatModerator(terms, duplicate_window=0, rate=1e9, burst=10 ** 9)
+
+    def stage(message):
+        moderator.review('bench', 'sender', {'sender': 'Attendee', 'content': message})
+
+    return {
+        'terms': count,
+        'flagged': flagged,
+        'matcher_build_ms': round(matcher_build * 1000, 1),
+        'regex_build_ms': round(regex_build * 1000, 1),
+        'matcher_us': round(time_per_message(matcher.find, messages) * 1e6, 2),
+        'regex_us': round(time_per_message(lambda message: pattern.findall(fold(message)), messages) * 1e6, 2),
+        'sanitize_us': round(time_per_message(sanitize, messages) * 1e6, 2),
+        'stage_us': round(time_per_message(stage, messages) * 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--terms', type=int, nargs='+', default=[10, 1000, 10000, 50000])
+    parser.add_argument('--messages', type=int, default=5000)
+    args = parser.parse_args()
+
+    for count in args.terms:
+        print(json.dumps(run(count, args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Cold-start benchmark for the OAuth/overlay server
+
+Starts fresh interpreters and measures what a serverless cold start pays
+before the first response: importing src.server.oauth_server, running the
+lifespan startup and serving GET /health. One extra run with
+`python -X importtime` lists the slowest imports.
+
+    python -m benchmarks.cold_start --runs 5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter; prints one JSON line of timings in seconds
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+from src.server.oauth_server import app
+imported = time.perf_counter()
+
+async def cold_request():
+    sent = []
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    async def send(message):
+        sent.append(message)
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+             'scheme': 'http', 'path': '/health', 'raw_path': b'/health', 'query_string': b'',
+             'root_path': '', 'headers': [], 'client': ('127.0.0.1', 1), 'server': ('127.0.0.1', 80)}
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        await app(scope, receive, send)
+        return ready, sent[0]['status']
+
+ready, status = asyncio.run(cold_request())
+served = time.perf_counter()
+print(json.dumps({'import': imported - started, 'startup': ready - imported,
+                  'first_request': served - ready, 'status': status}))
+"""
+
+
+def child_env(scratch: str):
+    env = dict(os.environ, PYTHONPATH=str(ROOT),
+               SUBSCRIPTION_DB_PATH=os.path.join(scratch, 'subscriptions.db'),
+               TOKEN_DB_PATH=os.path.join(scratch, 'tokens.db'))
+    env.pop('OVERLAY_BACKPLANE_URL', None)
+    return env
+
+
+def cold_start(env):
+    """Interpreter launch to first response, plus the in-process breakdown"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    total = time.perf_counter() - started
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['total'] = total
+    return timings
+
+
+def slowest_imports(env, top: int):
+    """(cumulative us, self us, module) from `python -X importtime`"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import src.server.oauth_server'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), int(own), module.strip()))
+    # Third-party packages by their root, our own code module by module
+    packages = [row for row in rows if '.' not in row[2] or row[2].startswith('src.')]
+    return sorted(packages, reverse=True)[:top], sum(own for _, own, _ in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = child_env(scratch)
+        runs = [cold_start(env) for _ in range(args.runs)]
+
+        print(f"{'phase':<16}{'median ms':>12}{'min ms':>10}")
+        for phase in ('import', 'startup', 'first_request', 'total'):
+            values = [run[phase] * 1000 for run in runs]
+            print(f"{phase:<16}{statistics.median(values):>12.1f}{min(values):>10.1f}")
+
+        imports, total_us = slowest_imports(env, args.top)
+        print(f"\nimport total: {total_us / 1000:.1f} ms; slowest imports (cumulative):")
+        for cumulative, own, module in imports:
+            print(f"{cumulative / 1000:>9.1f} ms  {own / 1000:>7.1f} ms self  {module}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Event-loop stall caused by logging
+
+Runs an asyncio loop that logs at a fixed rate into a deliberately slow
+sink (a blocked pipe, a busy terminal, a container log driver) while a
+monitor task measures how late its 1 ms timer fires. Compares:
+
+    sync      StreamHandler on the loop thread (the old basicConfig setup)
+    sync-json the JSON formatter, still on the loop thread
+    queue     src.utils.logging pipeline (QueueHandler -> listener thread)
+    sampled   the pipeline keeping 1 in 10 of the hot logger's info lines
+
+    python -m benchmarks.log_stall --rate 2000 --duration 5 --sink-latency-us 200
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.logging import JSONFormatter, correlation, log_pipeline, setup_logging  # noqa: E402
+
+MODES = ('sync', 'sync-json', 'queue', 'sampled')
+HOT_LOGGER = 'src.server.websocket.broker'
+
+
+class SlowSink(io.TextIOBase):
+    """Text stream whose writes block for a fixed time before reaching /dev/null"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.target = open(os.devnull, 'w')
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        self.writes += 1
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+def configure(mode: str, sink: SlowSink):
+    root = logging.getLogger()
+    log_pipeline.stop()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    if mode.startswith('sync'):
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(JSONFormatter() if mode == 'sync-json' else
+                             logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    else:
+        setup_logging('INFO', sample_rates={HOT_LOGGER: 10} if mode == 'sampled' else None, stream=sink)
+
+
+async def workload(rate: float, duration: float, tick: float):
+    """Log at `rate` records/s while measuring timer lateness; returns lateness samples (s)"""
+    hot = logging.getLogger(HOT_LOGGER)
+    other = logging.getLogger('src.server.webhooks.routes')
+    lateness = []
+    running = True
+
+    async def monitor():
+        while running:
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            lateness.append(max(0.0, time.perf_counter() - expected))
+
+    async def produce():
+        started = time.perf_counter()
+        for index in range(int(rate * duration)):
+            # Always yield, like a request handler would, even when behind schedule
+            await asyncio.sleep(max(0.0, started + index / rate - time.perf_counter()))
+            with correlation(request=f"req-{index % 64}", meeting='434343'):
+                if index % 100 == 99:
+                    other.warning(f"Rejected webhook meeting.chat_message_sent: missing field {index}")
+                else:
+                    hot.info(f"Overlay subscribed: 434343/chat ({index})", extra={'connections': index % 500})
+
+    watcher = asyncio.create_task(monitor())
+    await produce()
+    running = False
+    await watcher
+    return lateness
+
+
+def run_mode(mode: str, args):
+    sink = SlowSink(args.sink_latency_us / 1e6)
+    configure(mode, sink)
+    started = time.perf_counter()
+    lateness = sorted(asyncio.run(workload(args.rate, args.duration, args.tick_ms / 1000)))
+    loop_seconds = time.perf_counter() - started
+    backlog = log_pipeline.queue.qsize() if not mode.startswith('sync') else 0
+    log_pipeline.stop()  # Drains the queue
+    drained = time.perf_counter() - started - loop_seconds
+
+    return {
+        'mode': mode,
+        'records_written': sink.writes,
+        'loop_seconds': round(loop_seconds, 3),
+        'stall_p50_ms': round(lateness[len(lateness) // 2] * 1000, 3),
+        'stall_p99_ms': round(lateness[int(len(lateness) * 0.99)] * 1000, 3),
+        'stall_max_ms': round(lateness[-1] * 1000, 3),
+        'stall_total_ms': round(sum(lateness) * 1000, 1),
+        'backlog_at_end': backlog,
+        'drain_seconds': round(drained, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--rate', type=float, default=2000, help="Log records per second")
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--sink-latency-us', type=float, default=200, help="Blocking time per write")
+    parser.add_argument('--tick-ms', type=float, default=1.0, help="Monitor timer interval")
+    args = parser.parse_args()
+
+    print(f"rate: {args.rate:.0f}/s  duration: {args.duration}s  sink latency: {args.sink_latency_us:.0f} us")
+    for mode in args.modes:
+        print(json.dumps(run_mode(mode, args)))
+
+
+if __name__ == '__main__':
+    main()
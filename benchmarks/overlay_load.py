@@ -0,0 +1,414 @@
+"""
+End-to-end overlay load generator
+
+Starts the server (run.py), attaches N overlay websocket clients spread over
+the chat, participants, word_cloud and world_map overlays, then replays a
+synthetic Zoom webhook stream at a fixed rate. Payloads are generated from
+the event schemas in webhook_meetings.json, so they pass the same validator
+as real Zoom traffic. Each chat message and participant carries its send
+time, which clients use to measure event-to-delivery latency.
+
+Reactions have no webhook event; they only arrive over the realtime
+connection, so they are not part of the replayed stream.
+
+Reports per rate: delivery latency p50/p99, frames/s, webhook latency and
+the server's memory and CPU per connection (from /proc). Results can be
+saved as JSON to compare runs.
+
+    python -m benchmarks.overlay_load --rates 50 200 --clients 200 --duration 10 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MEETING_ID = 434343
+TOKEN_SECRET = 'overlay-load-benchmark'
+WEBHOOK_SECRET = 'overlay-load-webhooks'
+OVERLAYS = ('chat', 'participants', 'word_cloud', 'world_map')
+# Frames that carry a send timestamp (the rest are throttled aggregates)
+TIMED_FRAMES = {'chat', 'participant_joined', 'participant_left'}
+DEFAULT_MIX = [
+    'meeting.chat_message_sent:6', 'meeting.participant_joined:3', 'meeting.participant_left:1',
+    'meeting.registration_created:1'
+]
+WORDS = ['stage', 'lights', 'camera', 'music', 'great', 'question', 'applause', 'hello', 'demo', 'thanks']
+CITIES = [('London', 'GB'), ('Tokyo', 'JP'), ('Paris', 'FR'), ('New York', 'US'), ('Sydney', 'AU'), ('Berlin', 'DE')]
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def synthesize(node):
+    """Smallest value that satisfies a compact schema node (see webhooks.validator)"""
+    if 'e' in node:
+        return node['e'][0]
+    if 'a' in node:
+        return synthesize(node['a'][0])
+
+    kind = node.get('t', ['object'])[0]
+    if kind == 'object':
+        properties = node.get('p', {})
+        return {key: synthesize(properties.get(key, {})) for key in node.get('r', [])}
+    if kind == 'array':
+        return []
+    return {'string': 'bench', 'integer': 0, 'number': 0, 'boolean': False, 'null': None}.get(kind)
+
+
+class EventStream:
+    """
+    Synthetic Zoom webhook events
+    1. One template per event type, built from webhook_meetings.json
+    2. Fields the overlays read are filled with varied, realistic values
+    3. Message and participant ids embed the send time in nanoseconds
+    """
+    def __init__(self, mix):
+        from src.server.webhooks.validator import load_compact_spec
+        spec = load_compact_spec()
+        self.templates = {name: synthesize(spec[name]) for name, _ in mix}
+        # Some event schemas declare the meeting id as a string, others as an integer
+        self.string_ids = {
+            name for name, _ in mix
+            if 'string' in spec[name]['p']['payload']['p']['object']['p']['id'].get('t', [])
+        }
+        self.names = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.random = random.Random(7)
+        self.index = 0
+
+    def next(self):
+        name = self.random.choices(self.names, self.weights)[0]
+        event = json.loads(json.dumps(self.templates[name]))
+        self.index += 1
+        stamp = f"bench-{time.time_ns()}"
+
+        event['event'] = name
+        event['event_ts'] = int(time.time() * 1000)
+        meeting = event['payload']['object']
+        meeting['id'] = str(MEETING_ID) if name in self.string_ids else MEETING_ID
+        if name.endswith('chat_message_sent'):
+            text = ' '.join(self.random.choices(WORDS, k=4))
+            meeting.setdefault('chat_message', {}).update({
+                'message_id': stamp,
+                # One sender per message, so chat moderation's per-sender rate limit never applies
+                'sender_session_id': f"attendee-{self.index}",
+                'sender_name': f"Attendee {self.index % 50}",
+                'recipient_type': 'everyone',
+                'date_time': datetime.utcnow().isoformat() + 'Z',
+                'message': text,
+                'message_content': text
+            })
+        elif name.endswith('registration_created'):
+            city, country = self.random.choice(CITIES)
+            meeting.setdefault('registrant', {}).update({'city': city, 'country': country})
+        else:
+            meeting.setdefault('participant', {}).update({
+                'user_id': stamp,
+                'user_name': f"Attendee {self.index % 50}"
+            })
+        return event
+
+
+def sent_at(frame):
+    """Send time (ns) carried by a timed frame, or None"""
+    if frame.get('type') == 'chat':
+        marker = frame.get('message_id')
+    else:
+        marker = (frame.get('participant') or {}).get('id')
+    if isinstance(marker, str) and marker.startswith('bench-'):
+        return int(marker[len('bench-'):])
+    return None
+
+
+async def overlay_clients(base_url: str, token: str, overlays, ready, stop, results):
+    """Open one socket per overlay entry; record latency and frame counts until stopped"""
+    latencies, frames, received = [], 0, 0
+
+    async with aiohttp.ClientSession() as session:
+        sockets = []
+        for overlay in overlays:
+            ws = await session.ws_connect(f"{base_url}/ws/overlay/{overlay}", max_msg_size=0)
+            await ws.send_json({'type': 'auth', 'token': token, 'meeting_id': str(MEETING_ID)})
+            sockets.append(ws)
+        ready.put(len(sockets))
+
+        async def drain(ws):
+            nonlocal frames, received
+            while not stop.is_set():
+                try:
+                    message = await ws.receive(timeout=0.2)
+                except asyncio.TimeoutError:
+                    continue
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                arrived = time.time_ns()
+                received += len(message.data)
+                frame = json.loads(message.data)
+                frames += 1
+                if frame.get('type') in TIMED_FRAMES:
+                    sent = sent_at(frame)
+                    if sent:
+                        latencies.append((arrived - sent) / 1e6)
+
+        await asyncio.gather(*[drain(ws) for ws in sockets])
+        for ws in sockets:
+            await ws.close()
+
+    results.put({'latencies': latencies, 'frames': frames, 'bytes': received})
+
+
+def client_process(base_url, token, overlays, ready, stop, results):
+    asyncio.run(overlay_clients(base_url, token, overlays, ready, stop, results))
+
+
+async def replay(base_url: str, stream: EventStream, rate: float, duration: float, concurrency: int):
+    """Open-loop replay: events are sent on schedule whether or not earlier ones finished"""
+    from src.server.webhooks.routes import signature_headers
+
+    latencies, errors = [], 0
+    slots = asyncio.Semaphore(concurrency)
+
+    async with aiohttp.ClientSession() as session:
+        async def post(event):
+            nonlocal errors
+            async with slots:
+                started = time.perf_counter()
+                body = json.dumps(event).encode()
+                headers = {'Content-Type': 'application/json', **signature_headers(WEBHOOK_SECRET, body)}
+                try:
+                    async with session.post(f"{base_url}/webhooks/zoom", data=body, headers=headers) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                except aiohttp.ClientError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        tasks = []
+        started = time.perf_counter()
+        for index in range(int(rate * duration)):
+            delay = started + index / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Stamp at send time, not at schedule time
+            tasks.append(asyncio.create_task(post(stream.next())))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def process_tree(pid: int):
+    """pid plus its descendants (uvicorn workers, backplane hub)"""
+    children = {}
+    for entry in Path('/proc').iterdir():
+        if entry.name.isdigit():
+            try:
+                fields = (entry / 'stat').read_text().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            children.setdefault(int(fields[1]), []).append(int(entry.name))
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def resources(pid: int):
+    """(RSS bytes, CPU seconds) summed over the server's process tree"""
+    rss, cpu = 0, 0.0
+    for member in process_tree(pid):
+        try:
+            fields = Path(f"/proc/{member}/stat").read_text().rsplit(')', 1)[1].split()
+            status = Path(f"/proc/{member}/status").read_text()
+        except OSError:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+        for line in status.splitlines():
+            if line.startswith('VmRSS:'):
+                rss += int(line.split()[1]) * 1024
+    return rss, cpu
+
+
+def percentile(values, fraction: float):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0):
+    async def poll():
+        deadline = time.time() + timeout
+        async with aiohttp.ClientSession() as session:
+            while time.time() < deadline:
+                try:
+                    async with session.get(f"{base_url}/health") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("Server did not start")
+    asyncio.run(poll())
+
+
+def run_round(rate: float, args, token: str, mix, scratch: str):
+    port = args.port
+    env = dict(os.environ,
+               OVERLAY_TOKEN_SECRET=TOKEN_SECRET,
+               SECRET_TOKEN=WEBHOOK_SECRET,
+               SUBSCRIPTION_DB_PATH=os.path.join(scratch, f"subscriptions-{rate}.db"),
+               TOKEN_DB_PATH=os.path.join(scratch, f"tokens-{rate}.db"))
+    env.pop('OVERLAY_BACKPLANE_URL', None)
+
+    server = subprocess.Popen(
+        [sys.executable, 'run.py', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(args.workers), '--backplane-port', str(port + 100)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_server(base_url)
+        time.sleep(0.5)
+        idle_rss, _ = resources(server.pid)
+
+        # Overlay types are dealt round-robin so every process holds a mix
+        overlays = [OVERLAYS[index % len(OVERLAYS)] for index in range(args.clients)]
+        ready, results, stop = multiprocessing.Queue(), multiprocessing.Queue(), multiprocessing.Event()
+        clients = [
+            multiprocessing.Process(target=client_process, args=(
+                base_url.replace('http', 'ws', 1), token, overlays[offset::args.client_processes],
+                ready, stop, results))
+            for offset in range(args.client_processes)
+        ]
+        for client in clients:
+            client.start()
+        for _ in clients:
+            ready.get(timeout=120)
+        time.sleep(0.5)  # Let the last subscriptions register
+
+        connected_rss, cpu_before = resources(server.pid)
+        webhook_latencies, errors, elapsed = asyncio.run(
+            replay(base_url, EventStream(mix), rate, args.duration, args.concurrency))
+        time.sleep(args.grace)  # Throttled overlays flush after the last event
+        _, cpu_after = resources(server.pid)
+
+        stop.set()
+        finished = [results.get(timeout=120) for _ in clients]
+        for client in clients:
+            client.join()
+
+        latencies = sorted(latency for result in finished for latency in result['latencies'])
+        frames = sum(result['frames'] for result in finished)
+        webhook_latencies.sort()
+        cpu_seconds = cpu_after - cpu_before
+        return {
+            'rate': rate,
+            'events': len(webhook_latencies),
+            'webhook_errors': errors,
+            'replay_seconds': round(elapsed, 3),
+            'frames_delivered': frames,
+            'timed_frames': len(latencies),
+            'frames_per_second': round(frames / (elapsed + args.grace)),
+            'bytes_delivered': sum(result['bytes'] for result in finished),
+            'delivery_p50_ms': round(percentile(latencies, 0.5), 2) if latencies else None,
+            'delivery_p99_ms': round(percentile(latencies, 0.99), 2) if latencies else None,
+            'delivery_max_ms': round(latencies[-1], 2) if latencies else None,
+            'webhook_p50_ms': round(percentile(webhook_latencies, 0.5) * 1000, 2),
+            'webhook_p99_ms': round(percentile(webhook_latencies, 0.99) * 1000, 2),
+            'server_rss_idle_mb': round(idle_rss / 2 ** 20, 1),
+            'server_rss_connected_mb': round(connected_rss / 2 ** 20, 1),
+            'memory_per_connection_kb': round((connected_rss - idle_rss) / args.clients / 1024, 1),
+            'server_cpu_seconds': round(cpu_seconds, 3),
+            'server_cpu_percent': round(cpu_seconds / (elapsed + args.grace) * 100, 1),
+            'cpu_per_connection_ms': round(cpu_seconds * 1000 / args.clients, 3)
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def parse_mix(entries):
+    mix = []
+    for entry in entries:
+        name, _, weight = entry.partition(':')
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rates', type=float, nargs='+', default=[50, 200],
+                        help="Webhook events per second, one round each")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds of replay per round")
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--client-processes', type=int, default=4)
+    parser.add_argument('--mix', nargs='+', default=DEFAULT_MIX, help="event:weight pairs")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=32, help="Webhook requests in flight")
+    parser.add_argument('--grace', type=float, default=1.0, help="Seconds to wait for trailing frames")
+    parser.add_argument('--port', type=int, default=18200)
+    parser.add_argument('--output', help="Write the run as JSON to this path")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    os.environ['OVERLAY_TOKEN_SECRET'] = TOKEN_SECRET
+    from src.server.overlay_tokens import ALL_OVERLAYS, overlay_tokens
+    from src.server.webhooks.validator import webhook_validators
+
+    # Fail fast if the generated payloads no longer match the spec
+    webhook_validators.load()
+    sample = EventStream(mix)
+    for _ in range(100):
+        event = sample.next()
+        error = webhook_validators.validate(event)
+        if error:
+            parser.error(f"{event['event']}: generated payload is invalid ({error})")
+
+    token = overlay_tokens.mint('bench', ALL_OVERLAYS, datetime.now() + timedelta(hours=1), MEETING_ID)
+
+    print(f"cpus: {os.cpu_count()}  clients: {args.clients}  workers: {args.workers}  duration: {args.duration}s")
+    rounds = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for rate in args.rates:
+            result = run_round(rate, args, token, mix, scratch)
+            rounds.append(result)
+            print(json.dumps(result))
+
+    if args.output:
+        run = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'config': {key: value for key, value in vars(args).items() if key != 'output'},
+            'rounds': rounds
+        }
+        with open(args.output, 'w') as file:
+            json.dump(run, file, indent=2)
+        print(f"Saved {args.output}")
+
+
+if __name__ == '__main__':
+    main()
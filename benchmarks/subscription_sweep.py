@@ -0,0 +1,97 @@
+"""
+Subscription sweeper benchmark
+
+Loads N synthetic subscriptions into a scratch SQLite database, then times
+one bulk sweep and compares access checks for active users with and
+without the precomputed active-until map.
+
+    python -m benchmarks.subscription_sweep --subscriptions 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.subscription.database import SubscriptionDB
+from src.subscription.manager import SubscriptionManager
+from src.subscription.sweeper import SubscriptionSweeper
+
+
+def synthetic_rows(count: int):
+    """Subscriptions spread across active, grace period and expired"""
+    now = datetime.now()
+    for index in range(count):
+        expiry = now + timedelta(days=random.uniform(-30, 30))
+        yield (
+            f"user-{index}",
+            random.choice(('monthly', 'yearly')),
+            'active',
+            (expiry - timedelta(days=30)).isoformat(sep=' '),
+            expiry.isoformat(sep=' '),
+            (expiry + timedelta(days=10)).isoformat(sep=' '),
+            '9.99',
+            'USD'
+        )
+
+
+async def run(count: int, checks: int):
+    db = SubscriptionDB()
+    await db.initialize()
+    await db.pool.executemany(
+        'INSERT INTO subscriptions (user_id, plan_type, status, start_date, expiry_date, '
+        'grace_period_end, amount, currency) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        synthetic_rows(count)
+    )
+
+    started = time.perf_counter()
+    counts = await SubscriptionSweeper(db).sweep()
+    sweep_time = time.perf_counter() - started
+
+    manager = SubscriptionManager()
+    active = list(db.active_until)
+    users = [random.choice(active) for _ in range(checks)]
+
+    # Per-user path: row lookup (cold cache) plus date comparisons
+    db.active_until_loaded = False
+    db.invalidate()
+    started = time.perf_counter()
+    for user_id in users:
+        await manager.validate_access(user_id)
+    per_user = time.perf_counter() - started
+
+    # Precomputed path: one comparison against the active-until map
+    db.active_until_loaded = True
+    db.invalidate()
+    started = time.perf_counter()
+    for user_id in users:
+        await manager.validate_access(user_id)
+    precomputed = time.perf_counter() - started
+
+    print(f"subscriptions:          {count}")
+    print(f"sweep:                  {sweep_time * 1000:.1f} ms {counts}")
+    print(f"active users in map:    {len(db.active_until)}")
+    print(f"access check (per-row): {per_user / checks * 1e6:.1f} us")
+    print(f"access check (map):     {precomputed / checks * 1e6:.1f} us")
+    await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--subscriptions', type=int, default=100_000)
+    parser.add_argument('--checks', type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ['SUBSCRIPTION_DB_PATH'] = os.path.join(scratch, 'subscriptions.db')
+        asyncio.run(run(args.subscriptions, args.checks))
+
+
+if __name__ == '__main__':
+    main()
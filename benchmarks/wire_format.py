@@ -0,0 +1,86 @@
+"""
+Overlay wire format benchmark
+
+Encodes a burst of chat frames and a burst of reaction batches with each
+available codec and reports bytes on the wire and encode CPU per frame,
+plus the cost of encoding once per broadcast versus once per recipient.
+
+    python -m benchmarks.wire_format --frames 5000 --subscribers 200
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.server.websocket.encoding import CODECS, DeflateCodec, JSON_CODEC
+
+WORDS = ('hello', 'from', 'sydney', 'great', 'talk', 'question', 'about', 'python',
+         'thanks', 'everyone', 'the', 'slides', 'can', 'you', 'share', 'link')
+EMOJIS = ('👍', '❤️', '😂', '😮', '👏', '🎉')
+
+
+def chat_burst(count: int):
+    return [{
+        'type': 'chat',
+        'sender': f"Attendee {random.randrange(5000)}",
+        'content': ' '.join(random.choices(WORDS, k=random.randint(3, 15))),
+        'message_id': f"{random.getrandbits(64):016x}",
+        'timestamp': 1700000000000 + index,
+        'seq': index + 1
+    } for index in range(count)]
+
+
+def reaction_burst(count: int):
+    return [{
+        'type': 'reaction_batch',
+        'window_ms': 100,
+        'counts': {emoji: random.randint(1, 200) for emoji in random.sample(EMOJIS, 3)},
+        'names': [f"Attendee {random.randrange(5000)}" for _ in range(10)],
+        'total': random.randint(10, 600),
+        'seq': index + 1
+    } for index in range(count)]
+
+
+def measure(codec, events):
+    started = time.perf_counter()
+    frames = [codec.encode(event) for event in events]
+    elapsed = time.perf_counter() - started
+    size = sum(len(frame.encode() if isinstance(frame, str) else frame) for frame in frames)
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=5_000)
+    parser.add_argument('--subscribers', type=int, default=200)
+    args = parser.parse_args()
+    random.seed(7)
+
+    codecs = list(CODECS.values()) + [DeflateCodec(dictionary=b'')]
+    for label, events in (('chat', chat_burst(args.frames)), ('reactions', reaction_burst(args.frames))):
+        json_size, _ = measure(JSON_CODEC, events)
+        print(f"{label} burst ({args.frames} frames)")
+        for codec in codecs:
+            name = codec.name if getattr(codec, 'dictionary', True) else 'deflate (no dict)'
+            size, elapsed = measure(codec, events)
+            print(f"  {name:<18} {size / args.frames:7.1f} B/frame  "
+                  f"{size / json_size * 100:5.1f}% of json  {elapsed / args.frames * 1e6:6.2f} us/encode")
+
+    # One broadcast to N subscribers: encode once vs per recipient
+    event = chat_burst(1)[0]
+    started = time.perf_counter()
+    for _ in range(args.subscribers):
+        JSON_CODEC.encode(event)
+    per_recipient = time.perf_counter() - started
+    started = time.perf_counter()
+    JSON_CODEC.encode(event)
+    once = time.perf_counter() - started
+    print(f"broadcast to {args.subscribers}: per-recipient encode {per_recipient * 1e6:.0f} us, "
+          f"encode once {once * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,37 @@
-from src.server.oauth_server import app
+import argparse
+import asyncio
+import multiprocessing
+import os
+
 import uvicorn
 
+APP = "src.server.oauth_server:app"
+
+
+def run_hub(port: int):
+    """Local Redis-protocol hub so workers can share Zoom events"""
+    from src.server.backplane import RespHub
+    asyncio.run(RespHub(port=port).serve_forever())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual Stage Academy overlay server")
+    parser.add_argument('--host', default="0.0.0.0")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--backplane-port', type=int, default=6390,
+                        help="Port for the local hub when OVERLAY_BACKPLANE_URL is not set")
+    args = parser.parse_args()
+
+    # More than one worker needs a backplane; start a local hub unless one is configured
+    if args.workers > 1 and not os.getenv('OVERLAY_BACKPLANE_URL'):
+        hub = multiprocessing.Process(target=run_hub, args=(args.backplane_port,), daemon=True)
+        hub.start()
+        os.environ['OVERLAY_BACKPLANE_URL'] = f"redis://127.0.0.1:{args.backplane_port}"
+
+    # log_config=None: uvicorn's loggers propagate into the app's queued JSON pipeline
+    uvicorn.run(APP, host=args.host, port=args.port, workers=args.workers, log_config=None)
+
+
 if __name__ == '__main__':
-    uvicorn.run(app, host="0.0.0.0", port=5000) 
\ No newline at end of file
+    main()
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).with_name('config.yaml')
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+ENV_PREFIXES = {
+    'development': 'DEV',
+    'preview': 'PREVIEW',
+    'production': 'PROD'
+}
+
+# (section, field) -> environment variable; {prefix} is the active environment's prefix
+ENV_VARS = {
+    ('zoom', 'client_id'): '{prefix}_CLIENT_ID',
+    ('zoom', 'client_secret'): '{prefix}_CLIENT_SECRET',
+    ('zoom', 'redirect_uri'): '{prefix}_REDIRECT_URI',
+    ('zoom', 'websocket_url'): '{prefix}_WEBSOCKET_URL',
+    ('zoom', 'home_url'): '{prefix}_HOME_URL',
+    ('security', 'token_encryption_key'): 'TOKEN_ENCRYPTION_KEY',
+    ('security', 'secret_token'): 'SECRET_TOKEN',
+    ('security', 'verification_token'): 'VERIFICATION_TOKEN',
+    ('security', 'overlay_token_secret'): 'OVERLAY_TOKEN_SECRET',
+    ('overlay', 'base_url'): 'OVERLAY_BASE_URL',
+    ('overlay', 'backplane_url'): 'OVERLAY_BACKPLANE_URL',
+    ('obs', 'websocket_url'): 'OBS_WEBSOCKET_URL',
+    ('obs', 'password'): 'OBS_WEBSOCKET_PASSWORD',
+    ('storage', 'data_dir'): 'DATA_DIR',
+    ('storage', 'token_db'): 'TOKEN_DB_PATH',
+    ('storage', 'subscription_db'): 'SUBSCRIPTION_DB_PATH',
+    ('logging', 'level'): 'LOG_LEVEL',
+    ('logging', 'format'): 'LOG_FORMAT'
+}
+
+
+class _Section(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+
+class ZoomSettings(_Section):
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    redirect_uri: Optional[str] = None
+    websocket_url: Optional[str] = None
+    home_url: Optional[str] = None
+
+
+class SecuritySettings(_Section):
+    token_encryption_key: Optional[str] = None
+    secret_token: Optional[str] = None
+    verification_token: Optional[str] = None
+    overlay_token_secret: Optional[str] = None
+
+
+class OverlaySettings(_Section):
+    base_url: str = 'http://localhost:5000/overlays'
+    backplane_url: Optional[str] = None
+
+
+class OBSSettings(_Section):
+    websocket_url: str = 'ws://localhost:4455'
+    password: Optional[str] = None
+    update_rate: float = Field(30.0, gt=0)
+    request_timeout: float = Field(5.0, gt=0)
+
+
+class StorageSettings(_Section):
+    """SQLite files; read when the stores open, so changes need a restart"""
+    data_dir: Optional[str] = None  # Default: <project>/data, or the temp dir on read-only hosts (Vercel)
+    token_db: str = 'tokens.db'     # Relative names are inside data_dir
+    subscription_db: str = 'subscriptions.db'
+
+    @property
+    def data_path(self) -> Path:
+        if self.data_dir:
+            return Path(self.data_dir)
+        if os.getenv('VERCEL'):
+            # Only the temp dir is writable in a serverless function
+            return Path(tempfile.gettempdir()) / 'vsa'
+        return PROJECT_ROOT / 'data'
+
+    def database(self, name: str) -> str:
+        """Path of a database file, creating its directory"""
+        path = self.data_path / name  # An absolute name replaces the data dir
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+
+class LoggingSettings(_Section):
+    level: Literal['DEBUG', 'INFO', 'WARNING', 'ERROR'] = 'INFO'
+    format: Literal['json', 'text'] = 'json'
+    sample: Dict[str, int] = Field(default_factory=dict)  # Logger name -> keep 1 in N info/debug records
+
+    @field_validator('level', mode='before')
+    @classmethod
+    def _upper_level(cls, value: Any) -> Any:
+        return value.upper() if isinstance(value, str) else value
+
+    @model_validator(mode='after')
+    def _positive_rates(self) -> 'LoggingSettings':
+        for name, rate in self.sample.items():
+            if rate < 1:
+                raise ValueError(f"logging.sample.{name} must be at least 1")
+        return self
+
+
+class ModerationSettings(_Section):
+    enabled: bool = True
+    action: Literal['mask', 'drop'] = 'mask'
+    blocklist: List[str] = Field(default_factory=list)
+    allowlist: List[str] = Field(default_factory=list)  # Terms that contain a blocked word but are fine
+    blocklist_file: Optional[str] = None                # One term per line, relative to config.yaml
+    max_length: int = Field(500, gt=0)
+    rate: float = Field(1.0, gt=0)                      # Messages per second per sender, sustained
+    burst: int = Field(5, ge=1)
+    duplicate_window: float = Field(30.0, ge=0)         # 0 disables duplicate suppression
+
+
+class TuningSettings(_Section):
+    """Knobs that a reload applies to running workers"""
+    subscriber_queue_size: int = Field(256, gt=0)
+    event_queue_size: int = Field(1000, gt=0)
+    reaction_window: float = Field(0.1, gt=0)
+    word_cloud_interval: float = Field(0.5, gt=0)
+    world_map_interval: float = Field(0.25, gt=0)
+    subscription_cache_ttl: float = Field(60.0, gt=0)
+    token_cache_ttl: float = Field(300.0, gt=0)
+    overlay_token_cache_ttl: float = Field(300.0, gt=0)
+    reload_interval: float = Field(5.0, gt=0)
+
+
+class Settings(_Section):
+    environment: Literal['development', 'preview', 'production'] = 'development'
+    zoom: ZoomSettings = ZoomSettings()
+    security: SecuritySettings = SecuritySettings()
+    overlay: OverlaySettings = OverlaySettings()
+    obs: OBSSettings = OBSSettings()
+    storage: StorageSettings = StorageSettings()
+    logging: LoggingSettings = LoggingSettings()
+    moderation: ModerationSettings = ModerationSettings()
+    tuning: TuningSettings = TuningSettings()
+
+    @property
+    def env_prefix(self) -> str:
+        return ENV_PREFIXES[self.environment]
+
+    @model_validator(mode='after')
+    def _require_production_secrets(self) -> 'Settings':
+        if self.environment == 'production':
+            missing = [name for name, value in (
+                ('zoom.client_id', self.zoom.client_id),
+                ('zoom.client_secret', self.zoom.client_secret),
+                ('zoom.redirect_uri', self.zoom.redirect_uri),
+                ('security.token_encryption_key', self.security.token_encryption_key)
+            ) if not value]
+            if missing:
+                raise ValueError(f"Missing required production settings: {', '.join(missing)}")
+        if self.environment != 'development' and not self.security.secret_token:
+            # Webhooks are only accepted signed, so a deployment without it receives no events
+            raise ValueError(f"security.secret_token (SECRET_TOKEN) is required in {self.environment}")
+        return self
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    import yaml  # Only needed when a YAML file is present
+    with open(path, 'r') as file:
+        return yaml.safe_load(file) or {}
+
+
+def build_settings(yaml_config: Dict[str, Any]) -> Settings:
+    """Validate config.yaml values overlaid with environment variables (which win)"""
+    environment = os.getenv('ACTIVE_ENVIRONMENT') or yaml_config.get('environment') or 'development'
+    values: Dict[str, Any] = {
+        section: dict(fields) for section, fields in yaml_config.items() if isinstance(fields, dict)
+    }
+    values['environment'] = environment.strip()
+
+    prefix = ENV_PREFIXES.get(values['environment'], 'DEV')
+    for (section, field), name in ENV_VARS.items():
+        value = os.getenv(name.format(prefix=prefix))
+        if value:
+            values.setdefault(section, {})[field] = value.strip()
+    return Settings(**values)
+
+
+class ConfigStore:
+    """
+    Process-wide settings, shared by reference
+    1. Built on first use from .env, the environment and config.yaml, and validated
+    2. Attribute access reads the current Settings, so holders of the store
+       see reloaded values without re-fetching anything
+    3. reload() re-reads config.yaml; an invalid file keeps the previous settings
+    4. Reload listeners push tuning knobs into running components
+    """
+    def __init__(self, path: Path = CONFIG_PATH):
+        self.path = path
+        self._settings: Optional[Settings] = None
+        self._mtime: Optional[float] = None
+        self._listeners: List[Callable[[Settings], None]] = []
+
+    @property
+    def current(self) -> Settings:
+        if self._settings is None:
+            self.load()
+        return self._settings
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names the store itself doesn't define
+        return getattr(self.current, name)
+
+    def load(self) -> Settings:
+        """Read .env once and build the settings; raises if they are invalid"""
+        load_dotenv()
+        self.path = Path(os.getenv('CONFIG_PATH') or self.path)
+        self._mtime = self._stat()
+        self._settings = build_settings(_read_yaml(self.path))
+        logger.info(f"Loaded {self._settings.environment} settings")
+        return self._settings
+
+    def reload(self) -> bool:
+        """Re-read config.yaml and notify listeners; False if the new settings are invalid"""
+        self._mtime = self._stat()
+        try:
+            settings = build_settings(_read_yaml(self.path))
+        except Exception as e:
+            logger.error(f"Keeping previous settings, reload of {self.path} failed: {e}")
+            return False
+
+        self._settings = settings
+        logger.info(f"Reloaded settings from {self.path}")
+        for listener in self._listeners:
+            try:
+                listener(settings)
+            except Exception as e:
+                logger.error(f"Settings reload listener failed: {e}")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        if self._settings is None or self._stat() == self._mtime:
+            return False
+        return self.reload()
+
+    def on_reload(self, listener: Callable[[Settings], None]):
+        self._listeners.append(listener)
+
+    async def watch(self):
+        """Reload whenever config.yaml changes (run as a background task)"""
+        while True:
+            await asyncio.sleep(self.current.tuning.reload_interval)
+            self.reload_if_changed()
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+
+# Shared settings for the process
+settings = ConfigStore()
@@ -1,3 +1,3 @@
-from .overlays import app
+from .overlays.shared import create_app
 
-__all__ = ['app']
+__all__ = ['create_app']
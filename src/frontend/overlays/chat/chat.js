@@ -4,21 +4,26 @@ class ChatOverlay extends OverlayClient {
         this.messageContainer = document.querySelector('.messages-wrapper');
     }
 
-    handleMessage(event) {
-        const data = JSON.parse(event.data);
+    handleMessage(event, data) {
         if (data.type === 'chat') {
             this.addChatMessage(data);
         }
     }
 
+    initializeOverlay(data) {
+        // Full state replaces whatever was on screen before a reconnect
+        this.messageContainer.replaceChildren();
+        super.initializeOverlay(data);
+    }
+
     addChatMessage(data) {
         const messageEl = document.createElement('div');
         messageEl.classList.add('chat-message');
-        messageEl.innerHTML = `
-            <span class="sender">${this.escapeHtml(data.sender)}</span>
-            <span class="content">${this.escapeHtml(data.content)}</span>
-        `;
-        
+        messageEl.append(
+            this.textElement('span', 'sender', data.sender),
+            this.textElement('span', 'content', data.content)
+        );
+
         this.messageContainer.appendChild(messageEl);
         this.cleanupOldMessages();
     }
@@ -29,12 +34,6 @@ class ChatOverlay extends OverlayClient {
             messages[0].remove();
         }
     }
-
-    escapeHtml(text) {
-        const div = document.createElement('div');
-        div.textContent = text;
-        return div.innerHTML;
-    }
 }
 
 document.addEventListener('DOMContentLoaded', () => {
@@ -1,53 +1,79 @@
-class CountdownOverlay {
-    constructor() {
+class CountdownOverlay extends OverlayClient {
+    constructor(accessToken) {
+        super('countdown', accessToken);
         this.minutesEl = document.getElementById('minutes');
         this.secondsEl = document.getElementById('seconds');
         this.timerEl = document.querySelector('.timer');
         this.beepSound = document.getElementById('beep');
-        this.timeLeft = 0;
-        this.originalTime = 0;
-        this.interval = null;
-        this.isPaused = false;
+        // Server state: time left as of started_at (epoch ms on the server clock), or frozen while paused
+        this.timer = null;
+        this.shownSeconds = null;
+        this.tick = null;
         this.soundEnabled = true;
-        this.initialize();
+        // Only the host's control URL carries this; viewer tokens can't drive the timer
+        this.controlToken = new URLSearchParams(window.location.search).get('control');
     }
 
     initialize() {
         const params = new URLSearchParams(window.location.search);
-        
-        // Get duration
+
+        // Get duration (shown until the server sends the meeting's timer)
         let duration = params.get('duration') || '5';
         if (duration === '30s') duration = '0.5';
         if (duration === '10s') duration = '0.167';
-        
+
         // Get theme
         const theme = params.get('theme') || 'default';
         this.timerEl.classList.add(theme);
-        
+
         // Get sound preference
         this.soundEnabled = params.get('sound') !== 'off';
-        
-        // Convert to milliseconds
-        this.timeLeft = Math.floor(parseFloat(duration) * 60);
-        this.originalTime = this.timeLeft;
-        
+
         // Validate duration
-        if (this.timeLeft > 5400) this.timeLeft = 5400;
-        if (this.timeLeft < 10) this.timeLeft = 10;
+        const seconds = Math.min(Math.max(Math.floor(parseFloat(duration) * 60), 10), 5400);
+        this.timer = { status: 'paused', duration: seconds * 1000, remaining: seconds * 1000, started_at: null };
 
         this.setupKeyboardControls();
-        this.updateDisplay();
-        this.startCountdown();
+        this.render();
+        this.connect();
+    }
+
+    handleMessage(event, data) {
+        if (data.type === 'countdown') {
+            this.applyState(data);
+        }
+    }
+
+    initializeOverlay(data) {
+        // Latest timer state for this meeting, if one was ever started
+        if (data.state.event) {
+            this.applyState(data.state.event);
+        }
+    }
+
+    applyState(state) {
+        this.timer = state;
+        this.timerEl.style.animation = '';
+        this.timerEl.classList.toggle('paused', state.status !== 'running');
+        this.render();
     }
 
     setupKeyboardControls() {
+        // Keys drive the shared server timer, so every display follows
         document.addEventListener('keypress', (e) => {
             switch(e.key.toLowerCase()) {
                 case ' ':
-                    this.togglePause();
+                    if (this.timer.status === 'running') {
+                        this.control('pause');
+                    } else if (this.timer.remaining === this.timer.duration) {
+                        // A fresh start carries this source's duration; otherwise the server resumes
+                        this.control('start', this.timer.duration / 1000);
+                    } else {
+                        this.control('start');
+                    }
                     break;
                 case 'r':
-                    this.reset();
+                    this.control('reset', this.timer.duration / 1000);
                     break;
                 case 's':
                     this.toggleSound();
@@ -56,65 +82,72 @@ class CountdownOverlay {
         });
     }
 
-    togglePause() {
-        this.isPaused = !this.isPaused;
-        this.timerEl.classList.toggle('paused', this.isPaused);
-        
-        if (this.isPaused) {
-            clearInterval(this.interval);
-        } else {
-            this.startCountdown();
-        }
-    }
-
-    reset() {
-        this.timeLeft = this.originalTime;
-        this.updateDisplay();
-        if (!this.isPaused) {
-            clearInterval(this.interval);
-            this.startCountdown();
+    control(action, duration) {
+        if (!this.controlToken) {
+            return; // A display-only source; sound can still be toggled
         }
+        const url = `${WS_BASE_URL.replace(/^ws/, 'http')}/countdown/${this.meetingId}/${action}`;
+        fetch(url, {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${this.controlToken}`,
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(duration ? { duration } : {})
+        }).catch(error => console.error(`Countdown ${action} failed:`, error));
     }
 
     toggleSound() {
         this.soundEnabled = !this.soundEnabled;
     }
 
-    startCountdown() {
-        if (this.interval) clearInterval(this.interval);
-        
-        this.interval = setInterval(() => {
-            if (!this.isPaused) {
-                this.timeLeft--;
-                this.updateDisplay();
+    remainingMs() {
+        if (this.timer.status !== 'running') {
+            return this.timer.remaining;
+        }
+        return Math.max(0, this.timer.started_at + this.timer.remaining - this.serverNow());
+    }
 
-                if (this.timeLeft <= 0) {
-                    this.endCountdown();
-                } else if (this.timeLeft <= 10 && this.soundEnabled) {
-                    this.beepSound.play().catch(() => {});
-                }
+    render() {
+        clearTimeout(this.tick);
+        const remaining = this.remainingMs();
+        const timeLeft = Math.ceil(remaining / 1000);
+
+        if (timeLeft !== this.shownSeconds) {
+            this.shownSeconds = timeLeft;
+            this.updateDisplay(timeLeft);
+            if (this.timer.status === 'running' && timeLeft > 0 && timeLeft <= 10 && this.soundEnabled) {
+                this.beepSound.play().catch(() => {});
             }
-        }, 1000);
+        }
+
+        if (this.timer.status !== 'running') return;
+        if (remaining <= 0) {
+            this.endCountdown();
+            return;
+        }
+        // Wake up when the displayed second changes rather than on a free-running interval
+        this.tick = setTimeout(() => this.render(), (remaining % 1000) || 1000);
     }
 
-    updateDisplay() {
-        const minutes = Math.floor(this.timeLeft / 60);
-        const seconds = this.timeLeft % 60;
+    updateDisplay(timeLeft) {
+        const minutes = Math.floor(timeLeft / 60);
+        const seconds = timeLeft % 60;
 
         this.minutesEl.textContent = minutes.toString().padStart(2, '0');
         this.secondsEl.textContent = seconds.toString().padStart(2, '0');
 
         // Update styles based on time remaining
-        this.updateStyles();
+        this.updateStyles(timeLeft);
     }
 
-    updateStyles() {
+    updateStyles(timeLeft) {
         this.timerEl.classList.remove('warning', 'danger');
 
-        if (this.timeLeft <= 10) {
+        if (timeLeft <= 10) {
             this.timerEl.classList.add('danger');
             this.pulseAnimation();
-        } else if (this.timeLeft <= 30) {
+        } else if (timeLeft <= 30) {
             this.timerEl.classList.add('warning');
         }
     }
@@ -129,9 +162,8 @@ class CountdownOverlay {
     }
 
     endCountdown() {
-        clearInterval(this.interval);
         this.timerEl.style.animation = 'fadeOut 1s forwards';
-        
+
         // Optional: Notify OBS that countdown is complete
         if (window.obsstudio) {
             setTimeout(() => {
@@ -139,9 +171,18 @@ class CountdownOverlay {
             }, 1000);
         }
     }
+
+    cleanup() {
+        clearTimeout(this.tick);
+        super.cleanup();
+    }
 }
 
 // Initialize when DOM is ready
 document.addEventListener('DOMContentLoaded', () => {
-    new CountdownOverlay();
-}); 
\ No newline at end of file
+    const accessToken = new URLSearchParams(window.location.search).get('token');
+
+    if (accessToken) {
+        new CountdownOverlay(accessToken).initialize();
+    }
+});
@@ -3,20 +3,35 @@ class ReactionsOverlay extends OverlayClient {
         super('reactions', accessToken);
         this.container = document.getElementById('reactions-container');
         this.animations = ['float', 'spin'];
+        this.maxNodesPerBatch = 12; // Cap DOM nodes created per batch frame
     }
 
-    handleMessage(event) {
-        const data = JSON.parse(event.data);
+    handleMessage(event, data) {
         if (data.type === 'reaction') {
             this.showReaction(data.content);
+        } else if (data.type === 'reaction_batch') {
+            this.showReactionBatch(data);
         }
     }
 
-    showReaction(emoji) {
+    showReactionBatch(data) {
+        // Share the node budget between emojis by count; scale up busy ones
+        const total = data.total || 1;
+        Object.entries(data.counts).forEach(([emoji, count]) => {
+            const nodes = Math.max(1, Math.round(this.maxNodesPerBatch * count / total));
+            const scale = Math.min(2, 1 + Math.log10(count) / 2);
+            for (let i = 0; i < Math.min(nodes, count); i++) {
+                this.showReaction(emoji, scale);
+            }
+        });
+    }
+
+    showReaction(emoji, scale = 1) {
         const reaction = document.createElement('div');
         reaction.classList.add('reaction');
         reaction.classList.add(this.getRandomAnimation());
         reaction.style.right = `${this.getRandomPosition()}px`;
+        reaction.style.fontSize = `${2.5 * scale}em`;
         reaction.textContent = emoji;
         
         this.container.appendChild(reaction);
@@ -1,5 +1,5 @@
 from .obs_handler import OBSHandler
-from .overlay_handler import app
+from .overlay_handler import create_app
 from .overlay_manager import OverlayManager
 
-__all__ = ['app', 'OverlayManager', 'OBSHandler']
+__all__ = ['create_app', 'OverlayManager', 'OBSHandler']
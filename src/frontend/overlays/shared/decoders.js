@@ -0,0 +1,237 @@
+/**
+ * Decoders for the compact overlay wire formats, served from this origin
+ * 1. MessagePack (vsa.msgpack): the types the server's msgpack encoder emits
+ * 2. Raw deflate with a preset dictionary (vsa.deflate), per RFC 1951
+ */
+const FrameDecoders = (() => {
+    const utf8 = new TextDecoder();
+
+    function msgpack(bytes) {
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        let pos = 0;
+
+        const advance = (size, value) => {
+            pos += size;
+            return value;
+        };
+        const u8 = () => bytes[pos++];
+        const u16 = () => advance(2, view.getUint16(pos));
+        const u32 = () => advance(4, view.getUint32(pos));
+        const str = (size) => advance(size, utf8.decode(bytes.subarray(pos, pos + size)));
+        const bin = (size) => advance(size, bytes.slice(pos, pos + size));
+        const array = (size) => Array.from({ length: size }, read);
+        const map = (size) => {
+            const out = {};
+            for (let i = 0; i < size; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        };
+
+        function read() {
+            if (pos >= bytes.length) {
+                throw new Error('Truncated MessagePack frame');
+            }
+            const type = u8();
+            if (type < 0x80) return type;
+            if (type < 0x90) return map(type & 0x0f);
+            if (type < 0xa0) return array(type & 0x0f);
+            if (type < 0xc0) return str(type & 0x1f);
+            if (type >= 0xe0) return type - 0x100;
+            switch (type) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: return bin(u8());
+                case 0xc5: return bin(u16());
+                case 0xc6: return bin(u32());
+                case 0xca: return advance(4, view.getFloat32(pos));
+                case 0xcb: return advance(8, view.getFloat64(pos));
+                case 0xcc: return u8();
+                case 0xcd: return u16();
+                case 0xce: return u32();
+                case 0xcf: return advance(8, Number(view.getBigUint64(pos)));
+                case 0xd0: return advance(1, view.getInt8(pos));
+                case 0xd1: return advance(2, view.getInt16(pos));
+                case 0xd2: return advance(4, view.getInt32(pos));
+                case 0xd3: return advance(8, Number(view.getBigInt64(pos)));
+                case 0xd9: return str(u8());
+                case 0xda: return str(u16());
+                case 0xdb: return str(u32());
+                case 0xdc: return array(u16());
+                case 0xdd: return array(u32());
+                case 0xde: return map(u16());
+                case 0xdf: return map(u32());
+            }
+            throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`);
+        }
+
+        return read();
+    }
+
+    const LENGTH_BASE = [3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+        35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258];
+    const LENGTH_EXTRA = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2,
+        3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0];
+    const DISTANCE_BASE = [1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193,
+        257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577];
+    const DISTANCE_EXTRA = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6,
+        7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13];
+    // Order the code length code lengths are stored in a dynamic block header
+    const CODE_LENGTH_ORDER = [16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15];
+
+    function huffman(lengths) {
+        // Canonical code as symbol counts per bit length plus symbols in code order
+        const counts = new Uint16Array(16);
+        for (const length of lengths) counts[length]++;
+        counts[0] = 0;
+        const offsets = new Uint16Array(16);
+        for (let length = 1; length < 16; length++) {
+            offsets[length] = offsets[length - 1] + counts[length - 1];
+        }
+        const symbols = new Uint16Array(lengths.length);
+        lengths.forEach((length, symbol) => {
+            if (length) symbols[offsets[length]++] = symbol;
+        });
+        return { counts, symbols };
+    }
+
+    const FIXED_LITERALS = huffman(Array.from({ length: 288 },
+        (_, symbol) => (symbol < 144 ? 8 : symbol < 256 ? 9 : symbol < 280 ? 7 : 8)));
+    const FIXED_DISTANCES = huffman(new Array(30).fill(5));
+
+    function inflateRaw(data, dictionary = null) {
+        // The dictionary is the start of the window, so matches can reach back into it
+        const prefix = dictionary ? dictionary.length : 0;
+        let out = new Uint8Array(prefix + data.length * 4 + 64);
+        if (dictionary) out.set(dictionary);
+        let size = prefix;
+        let pos = 0;
+        let bitBuffer = 0;
+        let bitCount = 0;
+
+        const reserve = (extra) => {
+            if (size + extra > out.length) {
+                const grown = new Uint8Array((size + extra) * 2);
+                grown.set(out.subarray(0, size));
+                out = grown;
+            }
+        };
+        const bits = (count) => {
+            while (bitCount < count) {
+                if (pos >= data.length) throw new Error('Truncated deflate stream');
+                bitBuffer |= data[pos++] << bitCount;
+                bitCount += 8;
+            }
+            const value = bitBuffer & ((1 << count) - 1);
+            bitBuffer >>>= count;
+            bitCount -= count;
+            return value;
+        };
+        const decode = ({ counts, symbols }) => {
+            let code = 0;
+            let first = 0;
+            let index = 0;
+            for (let length = 1; length < 16; length++) {
+                code |= bits(1);
+                const count = counts[length];
+                if (code - first < count) return symbols[index + code - first];
+                index += count;
+                first = (first + count) << 1;
+                code <<= 1;
+            }
+            throw new Error('Invalid Huffman code');
+        };
+
+        const stored = () => {
+            bitBuffer = 0; // Stored blocks start on a byte boundary
+            bitCount = 0;
+            const length = data[pos] | (data[pos + 1] << 8);
+            pos += 4;
+            if (pos + length > data.length) throw new Error('Truncated stored block');
+            reserve(length);
+            out.set(data.subarray(pos, pos + length), size);
+            pos += length;
+            size += length;
+        };
+        const dynamicTables = () => {
+            const literalCount = bits(5) + 257;
+            const distanceCount = bits(5) + 1;
+            const codeLengthCount = bits(4) + 4;
+            const codeLengths = new Uint8Array(19);
+            for (let i = 0; i < codeLengthCount; i++) codeLengths[CODE_LENGTH_ORDER[i]] = bits(3);
+            const codeLengthCode = huffman(codeLengths);
+
+            const lengths = new Uint8Array(literalCount + distanceCount);
+            for (let i = 0; i < lengths.length;) {
+                const symbol = decode(codeLengthCode);
+                if (symbol < 16) {
+                    lengths[i++] = symbol;
+                    continue;
+                }
+                let value = 0;
+                let repeat;
+                if (symbol === 16) {
+                    if (!i) throw new Error('Repeat with no previous length');
+                    value = lengths[i - 1];
+                    repeat = 3 + bits(2);
+                } else {
+                    repeat = symbol === 17 ? 3 + bits(3) : 11 + bits(7);
+                }
+                if (i + repeat > lengths.length) throw new Error('Too many code lengths');
+                lengths.fill(value, i, i + repeat);
+                i += repeat;
+            }
+            return [huffman(lengths.subarray(0, literalCount)), huffman(lengths.subarray(literalCount))];
+        };
+        const compressed = (literals, distances) => {
+            for (;;) {
+                const symbol = decode(literals);
+                if (symbol < 256) {
+                    reserve(1);
+                    out[size++] = symbol;
+                } else if (symbol === 256) {
+                    return;
+                } else {
+                    const lengthCode = symbol - 257;
+                    if (lengthCode >= 29) throw new Error('Invalid length code');
+                    const length = LENGTH_BASE[lengthCode] + bits(LENGTH_EXTRA[lengthCode]);
+                    const distanceCode = decode(distances);
+                    if (distanceCode >= 30) throw new Error('Invalid distance code');
+                    const distance = DISTANCE_BASE[distanceCode] + bits(DISTANCE_EXTRA[distanceCode]);
+                    if (distance > size) throw new Error('Distance too far back');
+                    reserve(length);
+                    for (let i = 0; i < length; i++, size++) out[size] = out[size - distance];
+                }
+            }
+        };
+
+        let last;
+        do {
+            last = bits(1);
+            const type = bits(2);
+            if (type === 0) {
+                stored();
+            } else if (type === 1) {
+                compressed(FIXED_LITERALS, FIXED_DISTANCES);
+            } else if (type === 2) {
+                compressed(...dynamicTables());
+            } else {
+                throw new Error('Invalid deflate block type');
+            }
+        } while (!last);
+
+        return out.slice(prefix, size);
+    }
+
+    return {
+        msgpack,
+        inflateRaw,
+        inflateText: (data, dictionary) => utf8.decode(inflateRaw(data, dictionary))
+    };
+})();
+
+if (typeof module !== 'undefined') {
+    module.exports = FrameDecoders; // Lets the test suite run the decoders under node
+}
@@ -1,46 +1,228 @@
+import asyncio
+import base64
+import hashlib
 import json
 import logging
-from typing import Any, Dict
+import time
+import uuid
+from typing import Any, Dict, List, Optional
 
 import websockets
 
-from ....config.config_loader import get_environment_config
+from ....config.settings import settings
+from ....utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+RPC_VERSION = 1
+RECONNECT_DELAY = 1.0       # First reconnect delay; doubles up to MAX_RECONNECT_DELAY
+MAX_RECONNECT_DELAY = 30.0
+
+REQUEST_SECONDS = metrics.histogram('vsa_obs_request_seconds', 'OBS request round-trip time', ('op',))
+REQUEST_ERRORS = metrics.counter('vsa_obs_request_errors_total', 'OBS requests that failed or timed out', ('op',))
+
+
+class OpCode:
+    """obs-websocket v5 message types"""
+    HELLO = 0
+    IDENTIFY = 1
+    IDENTIFIED = 2
+    EVENT = 5
+    REQUEST = 6
+    REQUEST_RESPONSE = 7
+    REQUEST_BATCH = 8
+    REQUEST_BATCH_RESPONSE = 9
+
+
+# Label values for request metrics
+OP_NAMES = {OpCode.REQUEST: 'request', OpCode.REQUEST_BATCH: 'batch'}
+
+
+class OBSRequestError(Exception):
+    """OBS answered a request with a failed requestStatus"""
+    def __init__(self, request_type: str, code: Optional[int], comment: Optional[str] = None):
+        super().__init__(f"{request_type} failed ({code}): {comment or 'no comment'}")
+        self.request_type = request_type
+        self.code = code
+
+
 class OBSHandler:
     """
-    Handles OBS WebSocket communication
-    1. Manages OBS WebSocket connection
-    2. Updates overlays based on Zoom events
-    3. Handles OBS scene/source updates
+    Handles OBS WebSocket communication (obs-websocket v5)
+    1. Keeps one identified connection open, reconnecting in the background
+    2. Matches replies to requests by requestId so requests can be pipelined
+    3. Updates overlay text sources, batching multi-source updates
+    4. Collapses queued source updates (last write wins) and flushes at a fixed rate
+    5. Requeues updates lost to a dropped connection unless a newer one is pending
     """
-    def __init__(self):
-        self.config = get_environment_config()
-        self.obs_ws_url = "ws://localhost:4455"  # Default OBS WebSocket port
-        self.obs_password = self.config.get('OBS_WEBSOCKET_PASSWORD')
+    def __init__(self, obs_ws_url: Optional[str] = None,
+                 obs_password: Optional[str] = None,
+                 request_timeout: Optional[float] = None,
+                 update_rate: Optional[float] = None):
+        # Unset arguments come from settings.obs (OBS_WEBSOCKET_URL / OBS_WEBSOCKET_PASSWORD)
+        self.settings = settings
+        self.obs_ws_url = obs_ws_url or settings.obs.websocket_url
+        self.obs_password = obs_password if obs_password is not None else settings.obs.password
+        self.request_timeout = request_timeout or settings.obs.request_timeout
         self.connected = False
         self.ws = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._identified = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._closing = False
+        # sourceName -> latest inputSettings awaiting the next flush
+        self.update_interval = 1.0 / (update_rate or settings.obs.update_rate)
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush = 0.0
+        self.sent_updates = 0
+        self.dropped_updates = 0
 
     async def connect(self) -> bool:
-        """Establish connection to OBS WebSocket"""
+        """Start the connection loop and wait until OBS has identified us"""
+        self._closing = False
+        if not self._runner or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
         try:
-            self.ws = await websockets.connect(
-                self.obs_ws_url,
-                extra_headers={"Authorization": self.obs_password}
-            )
-            self.connected = True
-            logger.info("Connected to OBS WebSocket")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to OBS: {e}")
-            return False
+            await asyncio.wait_for(self._identified.wait(), timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Timed out connecting to OBS WebSocket")
+        return self.connected
+
+    async def close(self):
+        """Stop reconnecting and close the socket"""
+        self._closing = True
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self.ws:
+            await self.ws.close()
+        self._on_disconnect()
+
+    async def _run(self):
+        """Connect, receive until the socket drops, then reconnect with backoff"""
+        delay = RECONNECT_DELAY
+        while not self._closing:
+            try:
+                await self._open()
+                delay = RECONNECT_DELAY
+                async for message in self.ws:
+                    self._handle_message(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except websockets.ConnectionClosed as e:
+                logger.warning(f"OBS WebSocket closed: {e}")
+            except Exception as e:
+                logger.error(f"OBS WebSocket error: {e}")
+
+            self._on_disconnect()
+            if not self._closing:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _open(self):
+        """Open the socket and complete the Hello/Identify handshake"""
+        self.ws = await websockets.connect(self.obs_ws_url)
+        hello = json.loads(await self.ws.recv())
+        if hello.get('op') != OpCode.HELLO:
+            raise ConnectionError(f"Expected Hello from OBS, got op {hello.get('op')}")
+
+        identify: Dict[str, Any] = {'rpcVersion': RPC_VERSION, 'eventSubscriptions': 0}
+        challenge = hello['d'].get('authentication')
+        if challenge:
+            identify['authentication'] = self._auth_response(challenge['salt'], challenge['challenge'])
+        await self.ws.send(json.dumps({'op': OpCode.IDENTIFY, 'd': identify}))
+
+        identified = json.loads(await self.ws.recv())
+        if identified.get('op') != OpCode.IDENTIFIED:
+            raise ConnectionError("OBS rejected Identify")
+
+        self.connected = True
+        self._identified.set()
+        logger.info(f"Connected to OBS WebSocket (rpc v{identified['d'].get('negotiatedRpcVersion')})")
+
+    def _auth_response(self, salt: str, challenge: str) -> str:
+        """base64(sha256(base64(sha256(password + salt)) + challenge))"""
+        if not self.obs_password:
+            raise ConnectionError("OBS requires a password but none is configured")
+        secret = base64.b64encode(hashlib.sha256((self.obs_password + salt).encode()).digest())
+        return base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+
+    def _on_disconnect(self):
+        self.connected = False
+        self.ws = None
+        self._identified.clear()
+        # In-flight requests will never be answered on a new connection
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("OBS WebSocket disconnected"))
+        self._pending.clear()
+
+    def _handle_message(self, message: Dict[str, Any]):
+        """Resolve the request a response belongs to"""
+        op = message.get('op')
+        if op in (OpCode.REQUEST_RESPONSE, OpCode.REQUEST_BATCH_RESPONSE):
+            future = self._pending.pop(message['d'].get('requestId'), None)
+            if future and not future.done():
+                future.set_result(message['d'])
+        elif op == OpCode.EVENT:
+            logger.debug(f"OBS event: {message['d'].get('eventType')}")
+
+    async def _call(self, op: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request and wait for the reply with the same requestId"""
+        if not self.connected and not await self.connect():
+            raise ConnectionError("OBS WebSocket not connected")
+
+        request_id = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[request_id] = future
+        started = loop.time()
+        try:
+            await self.ws.send(json.dumps({'op': op, 'd': {**data, 'requestId': request_id}}))
+            response = await asyncio.wait_for(future, timeout=self.request_timeout)
+            REQUEST_SECONDS.labels(OP_NAMES.get(op, str(op))).observe(loop.time() - started)
+            return response
+        except Exception:
+            REQUEST_ERRORS.labels(OP_NAMES.get(op, str(op))).inc()
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+            if future.done() and not future.cancelled():
+                future.exception()  # A disconnect can fail the future while send() is still raising
+
+    async def request(self, request_type: str, request_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one request; concurrent calls share the connection"""
+        response = await self._call(OpCode.REQUEST, {
+            'requestType': request_type,
+            'requestData': request_data or {}
+        })
+        status = response.get('requestStatus', {})
+        if not status.get('result'):
+            raise OBSRequestError(request_type, status.get('code'), status.get('comment'))
+        return response.get('responseData') or {}
+
+    async def request_batch(self, requests: List[Dict[str, Any]], halt_on_failure: bool = False) -> List[Dict[str, Any]]:
+        """Send several {'requestType', 'requestData'} requests in one message"""
+        response = await self._call(OpCode.REQUEST_BATCH, {
+            'haltOnFailure': halt_on_failure,
+            'requests': requests
+        })
+        results = response.get('results', [])
+        for result in results:
+            if not result.get('requestStatus', {}).get('result'):
+                logger.warning(f"OBS batch request {result.get('requestType')} failed: {result.get('requestStatus')}")
+        return results
 
     async def update_overlay(self, event_type: str, data: Dict[str, Any]):
         """Update OBS overlay based on event type"""
-        if not self.connected:
-            await self.connect()
-
         try:
             if event_type == 'chat_update':
                 await self._update_chat_source(data)
@@ -49,35 +231,74 @@ class OBSHandler:
         except Exception as e:
             logger.error(f"Failed to update OBS overlay: {e}")
 
-    async def _update_chat_source(self, data: Dict[str, Any]):
-        """Update chat overlay source in OBS"""
-        request = {
-            'request-type': 'SetSourceSettings',
-            'sourceName': 'ChatOverlay',
-            'sourceSettings': {
-                'text': f"{data['sender']}: {data['message']}"
-            }
-        }
-        await self._send_obs_request(request)
+    async def update_sources(self, texts: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Set the text of several sources in one RequestBatch"""
+        return await self._set_inputs({name: {'text': text} for name, text in texts.items()})
 
-    async def _update_reaction_source(self, data: Dict[str, Any]):
-        """Update reaction overlay source in OBS"""
-        request = {
-            'request-type': 'SetSourceSettings',
-            'sourceName': 'ReactionOverlay',
-            'sourceSettings': {
-                'text': f"{data['user']} reacted with {data['type']}"
-            }
+    def schedule_update(self, source_name: str, input_settings: Dict[str, Any]):
+        """Queue input settings for the next flush; a newer update replaces a pending one"""
+        if source_name in self._pending_updates:
+            self.dropped_updates += 1
+        self._pending_updates[source_name] = input_settings
+        if not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush_updates())
+
+    def update_stats(self) -> Dict[str, int]:
+        return {
+            'pending': len(self._pending_updates),
+            'sent': self.sent_updates,
+            'dropped': self.dropped_updates
         }
-        await self._send_obs_request(request)
 
-    async def _send_obs_request(self, request: Dict[str, Any]):
-        """Send request to OBS WebSocket"""
+    async def _flush_updates(self):
+        """Send the latest settings per source, at most once per update interval"""
         try:
-            await self.ws.send(json.dumps(request))
-            response = await self.ws.recv()
-            return json.loads(response)
+            delay = self._last_flush + self.update_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            updates, self._pending_updates = self._pending_updates, {}
+            self._last_flush = time.monotonic()
+            try:
+                await self._set_inputs(updates)
+                self.sent_updates += len(updates)
+            except OBSRequestError as e:
+                logger.error(f"OBS rejected overlay update: {e}")  # Resending won't help
+            except (ConnectionError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                logger.error(f"Failed to flush OBS updates, will retry: {e}")
+                self._requeue(updates)
+        except asyncio.CancelledError:
+            return
         except Exception as e:
-            logger.error(f"OBS request failed: {e}")
-            self.connected = False
-            raise 
\ No newline at end of file
+            logger.error(f"Failed to flush OBS updates: {e}")
+
+        # Updates queued while this flush was in flight go out in the next frame
+        self._flush_task = asyncio.create_task(self._flush_updates()) if self._pending_updates else None
+
+    def _requeue(self, updates: Dict[str, Dict[str, Any]]):
+        """Put back updates from a failed flush; ones queued since are newer and win"""
+        for name, input_settings in updates.items():
+            if name in self._pending_updates:
+                self.dropped_updates += 1
+            else:
+                self._pending_updates[name] = input_settings
+
+    async def _set_inputs(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """SetInputSettings for one source, or a RequestBatch for several"""
+        if len(updates) == 1:
+            (name, input_settings), = updates.items()
+            await self.request('SetInputSettings', {'inputName': name, 'inputSettings': input_settings})
+            return []
+        return await self.request_batch([
+            {'requestType': 'SetInputSettings',
+             'requestData': {'inputName': name, 'inputSettings': input_settings}}
+            for name, input_settings in updates.items()
+        ])
+
+    async def _update_chat_source(self, data: Dict[str, Any]):
+        """Update chat overlay source in OBS (OBS only ever shows the latest text)"""
+        self.schedule_update('ChatOverlay', {'text': f"{data['sender']}: {data['message']}"})
+
+    async def _update_reaction_source(self, data: Dict[str, Any]):
+        """Update reaction overlay source in OBS"""
+        self.schedule_update('ReactionOverlay', {'text': f"{data['user']} reacted with {data['type']}"})
@@ -8,7 +8,14 @@ class OverlayClient {
     constructor(overlayType, accessToken) {
         this.overlayType = overlayType;
         this.accessToken = accessToken;
+        this.meetingId = new URLSearchParams(window.location.search).get('meeting');
         this.ws = null;
+        this.lastSeq = null; // Last sequence number seen, so reconnects only get missed frames
+        this.epoch = null; // Which server state lastSeq counts in; another worker's numbers differ
+        this.dictionary = null; // Preset dictionary for vsa.deflate frames
+        this.clockOffset = 0; // Server clock minus local clock, in ms
+        this.clockSamples = [];
+        this.participants = new Map(); // Participant id -> participant, for the participants overlay
         this.connected = false;
         this.reconnectAttempts = 0;
         this.maxReconnectAttempts = 5;
@@ -18,18 +25,23 @@ class OverlayClient {
         try {
             // Connect to WebSocket with auth token
             const wsUrl = `${WS_BASE_URL}/overlay/${this.overlayType}`;
-            this.ws = new WebSocket(wsUrl);
+            this.ws = new WebSocket(wsUrl, await this.supportedProtocols());
+            this.ws.binaryType = 'arraybuffer';
             
-            // Add auth header
-            this.ws.addListener('open', () => {
+            // Authenticate and join the meeting's overlay topic
+            this.ws.addEventListener('open', () => {
                 this.ws.send(JSON.stringify({
                     type: 'auth',
-                    token: this.accessToken
+                    token: this.accessToken,
+                    meeting_id: this.meetingId,
+                    last_seq: this.lastSeq,
+                    epoch: this.epoch
                 }));
+                this.syncClock();
             });
 
             // Setup event handlers
-            this.ws.addEventListener('message', this.handleMessage.bind(this));
+            this.ws.addEventListener('message', this.handleFrame.bind(this));
             this.ws.addEventListener('close', this.handleDisconnect.bind(this));
             this.ws.addEventListener('error', this.handleError.bind(this));
 
@@ -42,10 +54,95 @@ class OverlayClient {
         }
     }
 
-    async handleMessage(event) {
+    async supportedProtocols() {
+        // Offer compact encodings only when decoders.js is loaded; JSON always works
+        const protocols = [];
+        if (typeof FrameDecoders !== 'undefined') {
+            protocols.push('vsa.msgpack');
+            try {
+                if (!this.dictionary) {
+                    const response = await fetch(`${WS_BASE_URL.replace(/^ws/, 'http')}/dictionary`);
+                    this.dictionary = new Uint8Array(await response.arrayBuffer());
+                }
+                protocols.push('vsa.deflate');
+            } catch (error) {
+                console.warn('Deflate dictionary unavailable:', error);
+            }
+        }
+        protocols.push('vsa.json');
+        return protocols;
+    }
+
+    decodeFrame(event) {
+        if (typeof event.data === 'string') {
+            return JSON.parse(event.data);
+        }
+        const bytes = new Uint8Array(event.data);
+        if (this.ws.protocol === 'vsa.msgpack') {
+            return FrameDecoders.msgpack(bytes);
+        }
+        return JSON.parse(FrameDecoders.inflateText(bytes, this.dictionary));
+    }
+
+    handleFrame(event) {
+        let data;
+        try {
+            data = this.decodeFrame(event);
+        } catch (error) {
+            console.error('Invalid frame:', error);
+            return;
+        }
+
+        if (data.type === 'clock') {
+            this.handleClock(data);
+            return;
+        }
+        if (data.type === 'epoch') {
+            if (data.epoch !== this.epoch) {
+                // Reached a different worker (or a restarted one): our last_seq means nothing here
+                this.epoch = data.epoch;
+                this.lastSeq = null;
+            }
+            return;
+        }
+        if (typeof data.seq === 'number') {
+            this.lastSeq = data.seq;
+        }
+        if (data.type === 'initial_state') {
+            this.initializeOverlay(data);
+        } else {
+            this.handleMessage(event, data);
+        }
+    }
+
+    syncClock(probes = 5) {
+        // A few spaced probes; the lowest-latency reply gives the best offset estimate
+        this.clockSamples = [];
+        for (let i = 0; i < probes; i++) {
+            setTimeout(() => {
+                if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+                    this.ws.send(JSON.stringify({ type: 'clock', t0: Date.now() }));
+                }
+            }, i * 200);
+        }
+    }
+
+    handleClock(data) {
+        const t1 = Date.now();
+        this.clockSamples.push({
+            rtt: t1 - data.t0,
+            offset: data.server_time - (data.t0 + t1) / 2
+        });
+        const best = this.clockSamples.reduce((a, b) => (b.rtt < a.rtt ? b : a));
+        this.clockOffset = best.offset;
+    }
+
+    serverNow() {
+        return Date.now() + this.clockOffset;
+    }
+
+    async handleMessage(event, data) {
         try {
-            const data = JSON.parse(event.data);
-            
             switch (data.type) {
                 case 'chat':
                     this.updateChatOverlay(data);
@@ -53,11 +150,19 @@ class OverlayClient {
                 case 'reaction':
                     this.updateReactionOverlay(data);
                     break;
+                case 'reaction_batch':
+                    this.updateReactionBatchOverlay(data);
+                    break;
                 case 'participants':
                     this.updateParticipantsOverlay(data);
                     break;
-                case 'initial_state':
-                    this.initializeOverlay(data);
+                case 'participant_joined':
+                    this.participants.set(data.participant.id, data.participant);
+                    this.renderParticipants();
+                    break;
+                case 'participant_left':
+                    this.participants.delete(data.participant.id);
+                    this.renderParticipants();
                     break;
                 default:
                     console.log('Unknown event type:', data.type);
@@ -74,19 +179,19 @@ class OverlayClient {
         const chatContainer = document.getElementById('chat-container');
         const messageEl = document.createElement('div');
         messageEl.classList.add('chat-message');
-        messageEl.innerHTML = `
-            <span class="sender">${data.sender}</span>
-            <span class="content">${data.content}</span>
-        `;
+        messageEl.append(
+            this.textElement('span', 'sender', data.sender),
+            this.textElement('span', 'content', data.content)
+        );
         chatContainer.appendChild(messageEl);
     }
 
     updateReactionOverlay(data) {
-        if (this.overlayType !== 'reaction') return;
+        if (this.overlayType !== 'reactions') return;
         
         const reactionEl = document.createElement('div');
         reactionEl.classList.add('reaction');
-        reactionEl.innerHTML = data.content;
+        reactionEl.textContent = data.content;
         
         document.body.appendChild(reactionEl);
         
@@ -94,18 +199,50 @@ class OverlayClient {
         setTimeout(() => reactionEl.remove(), 3000);
     }
 
+    updateReactionBatchOverlay(data) {
+        if (this.overlayType !== 'reactions') return;
+
+        // One node per emoji per window, labelled with its count
+        Object.entries(data.counts).forEach(([emoji, count]) => {
+            const reactionEl = document.createElement('div');
+            reactionEl.classList.add('reaction');
+            reactionEl.textContent = count > 1 ? `${emoji} x${count}` : emoji;
+
+            document.body.appendChild(reactionEl);
+            setTimeout(() => reactionEl.remove(), 3000);
+        });
+    }
+
     updateParticipantsOverlay(data) {
+        // Full roster: initial_state on join/reconnect
+        this.participants = new Map(data.participants.map(p => [p.id, p]));
+        this.renderParticipants();
+    }
+
+    renderParticipants() {
         if (this.overlayType !== 'participants') return;
-        
+
         const participantsList = document.getElementById('participants-list');
-        participantsList.innerHTML = data.participants
-            .map(p => `<div class="participant">${p.name}</div>`)
-            .join('');
+        participantsList.replaceChildren(
+            ...[...this.participants.values()].map(p => this.textElement('div', 'participant', p.name))
+        );
+    }
+
+    textElement(tag, className, text) {
+        // Event text is always rendered as text, never parsed as markup
+        const el = document.createElement(tag);
+        el.classList.add(className);
+        el.textContent = text ?? '';
+        return el;
     }
 
     initializeOverlay(data) {
-        console.log('Initializing overlay with:', data);
-        // Set initial state based on overlay type
+        if (data.state.participants) {
+            this.updateParticipantsOverlay(data.state);
+            return;
+        }
+        // List-like overlays receive their recent frames; replay them in order
+        (data.state.events || []).forEach(event => this.handleMessage(null, event));
     }
 
     async handleDisconnect() {
@@ -1,6 +1,7 @@
 import logging
+from functools import lru_cache
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 
@@ -8,25 +9,39 @@ from .overlay_manager import OverlayManager
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+router = APIRouter()
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
-)
 
-overlay_manager = OverlayManager()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+@lru_cache()
+def get_overlay_manager() -> OverlayManager:
+    """Shared OverlayManager, built on the first overlay request"""
+    return OverlayManager()
+
+
+def create_app() -> FastAPI:
+    """Build the overlay app"""
+    app = FastAPI()
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allows all origins
+        allow_credentials=True,
+        allow_methods=["*"],  # Allows all methods
+        allow_headers=["*"],  # Allows all headers
+    )
+
+    app.include_router(router)
+    return app
+
 
-@app.get("/overlay/{overlay_type}")
-async def get_overlay(overlay_type: str, token: str = Depends(oauth2_scheme)):
+@router.get("/overlay/{overlay_type}")
+async def get_overlay(overlay_type: str, token: str = Depends(oauth2_scheme),
+                      overlay_manager: OverlayManager = Depends(get_overlay_manager)):
     """Handle overlay requests"""
     # Validate access
-    access = await overlay_manager.validate_overlay_access(token)
+    access = await overlay_manager.validate_overlay_access(token, overlay_type)
     if not access:
         raise HTTPException(status_code=401, detail="Invalid or expired access")
 
@@ -35,4 +50,4 @@ async def get_overlay(overlay_type: str, token: str = Depends(oauth2_scheme)):
         'type': overlay_type,
         'client_id': access['client_id'],
         'content': f"OBS Browser Source URL for {overlay_type}"
-    } 
\ No newline at end of file
+    }
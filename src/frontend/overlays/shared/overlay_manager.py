@@ -2,8 +2,10 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from ....config.config_loader import get_environment_config
+from ....config.settings import settings
+from ....server.overlay_tokens import ALL_OVERLAYS, COUNTDOWN_CONTROL, overlay_tokens
 from ....server.token_manager import TokenManager
+from ....server.zoom_api import ZoomAPI
 from ....subscription.database import SubscriptionDB
 
 logger = logging.getLogger(__name__)
@@ -16,38 +18,52 @@ class OverlayManager:
     3. WebSocket connection management
     """
     def __init__(self):
-        self.config = get_environment_config()
+        self.settings = settings
         self.subscription_db = SubscriptionDB()
         self.token_manager = TokenManager()
+        self.overlay_tokens = overlay_tokens
 
-    def get_overlay_urls(self, client_id: str) -> Dict[str, str]:
-        """Generate overlay URLs with access token"""
-        base_url = self.config['OVERLAY_BASE_URL']
-        
-        return {
-            'chat': f"{base_url}/chat",
-            'reactions': f"{base_url}/reactions",
-            'participants': f"{base_url}/participants",
-            'combined': f"{base_url}/combined"
-        }
-
-    async def validate_overlay_access(self, token: str) -> Optional[Dict[str, Any]]:
-        """Validate overlay access request"""
+    async def get_overlay_urls(self, client_id: str, meeting_id: str) -> Dict[str, str]:
+        """Generate a meeting's overlay URLs with signed access tokens"""
+        subscription = await self.subscription_db.get_subscription(client_id)
+        if not subscription or not self._is_subscription_active(subscription):
+            return {}
+
+        # Tokens open one meeting's streams, so only mint them for meetings this account hosts
+        if not await self._hosts_meeting(client_id, meeting_id):
+            logger.warning(f"{client_id} requested overlays for meeting {meeting_id} it does not host")
+            return {}
+
+        base_url = self.settings.overlay.base_url.rstrip('/')
+        expires_at = subscription['expiry_date']
+
+        # Each token only opens its own overlay and lapses with the subscription
+        urls = {}
+        for overlay_type in ('chat', 'reactions', 'participants', 'word_cloud', 'world_map', 'countdown'):
+            token = self.overlay_tokens.mint(client_id, overlay_type, expires_at, meeting_id)
+            urls[overlay_type] = f"{base_url}/{overlay_type}?token={token}&meeting={meeting_id}"
+        combined = self.overlay_tokens.mint(client_id, ALL_OVERLAYS, expires_at, meeting_id)
+        urls['combined'] = f"{base_url}/combined?token={combined}&meeting={meeting_id}"
+        # Host-only: a countdown source whose keys drive the timer, for an interactive OBS dock
+        control = self.overlay_tokens.mint(client_id, COUNTDOWN_CONTROL, expires_at, meeting_id)
+        urls['countdown_control'] = f"{urls['countdown']}&control={control}"
+        return urls
+
+    async def _hosts_meeting(self, client_id: str, meeting_id: str) -> bool:
+        """Ask Zoom whether the meeting (or webinar) belongs to this account"""
+        access_token = await self.token_manager.get_valid_token(client_id)
+        if not access_token:
+            return False
+        meeting = await ZoomAPI().get_meeting(access_token, meeting_id)
+        return bool(meeting) and meeting.get('host_id') == client_id
+
+    async def validate_overlay_access(self, token: str, overlay_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Validate overlay access request
+        Signature and expiry checks only; the subscription expiry is in the token
+        """
         try:
-            # Verify token and get client info
-            token_data = await self.token_manager.verify_token(token)
-            if not token_data:
-                return None
-
-            # Check subscription status
-            subscription = await self.subscription_db.get_subscription(token_data['client_id'])
-            if not subscription or not self._is_subscription_active(subscription):
-                return None
-
-            return {
-                'client_id': token_data['client_id'],
-                'subscription': subscription
-            }
+            return self.overlay_tokens.verify(token, overlay_type)
 
         except Exception as e:
             logger.error(f"Overlay access validation failed: {e}")
@@ -1,7 +1,7 @@
 class WordCloudOverlay extends OverlayClient {
     constructor(accessToken) {
         super('word_cloud', accessToken);
-        this.words = new Map(); // word -> frequency
+        this.words = new Map(); // word -> weight (0..1), ranked on the server
         this.svg = null;
         this.width = window.innerWidth;
         this.height = window.innerHeight;
@@ -20,35 +20,35 @@ class WordCloudOverlay extends OverlayClient {
         window.addEventListener('resize', this.handleResize.bind(this));
     }
 
-    handleMessage(event) {
-        const data = JSON.parse(event.data);
-        if (data.type === 'chat') {
-            this.processMessage(data.content);
+    handleMessage(event, data) {
+        if (data.type === 'word_cloud_diff') {
+            this.applyDiff(data);
         }
     }
 
-    processMessage(message) {
-        // Split message into words and count frequencies
-        const words = message.toLowerCase()
-            .replace(/[^\w\s]/g, '')
-            .split(/\s+/)
-            .filter(word => word.length > 3);
-
-        words.forEach(word => {
-            this.words.set(word, (this.words.get(word) || 0) + 1);
-        });
+    initializeOverlay(data) {
+        // Snapshot of the last ranking the server pushed
+        this.words = new Map(data.state.words.map(({ text, weight }) => [text, weight]));
+        this.order = data.state.words.map(({ text }) => text);
+        this.updateWordCloud();
+    }
 
+    applyDiff(data) {
+        // The server only sends a diff when the ranking changed
+        data.remove.forEach(text => this.words.delete(text));
+        data.set.forEach(({ text, weight }) => this.words.set(text, weight));
+        this.order = data.order;
         this.updateWordCloud();
     }
 
     updateWordCloud() {
-        // Convert words map to array and sort by frequency
-        const wordArray = Array.from(this.words.entries())
-            .map(([text, size]) => ({
+        // Server order is already ranked; map weights to font sizes
+        const wordArray = (this.order || Array.from(this.words.keys()))
+            .filter(text => this.words.has(text))
+            .map(text => ({
                 text,
-                size: Math.max(20, Math.min(100, size * 10))
+                size: 20 + Math.round(this.words.get(text) * 80)
             }))
-            .sort((a, b) => b.size - a.size)
             .slice(0, this.maxWords);
 
         // Generate word cloud layout
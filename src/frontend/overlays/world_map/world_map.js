@@ -1,7 +1,8 @@
 class WorldMapOverlay extends OverlayClient {
     constructor(accessToken) {
         super('world_map', accessToken);
-        this.locationData = new Map(); // Store location frequencies
+        this.locationData = new Map(); // Grid cell -> location count
+        this.cellSize = 5;
         this.svg = null;
         this.projection = null;
         this.path = null;
@@ -36,57 +37,43 @@ class WorldMapOverlay extends OverlayClient {
         await super.connect();
     }
 
-    handleMessage(event) {
-        const data = JSON.parse(event.data);
-        if (data.type === 'location') {
-            this.highlightLocation(data.location);
+    handleMessage(event, data) {
+        if (data.type === 'map_bins') {
+            this.applyBins(data);
         }
     }
 
-    highlightLocation(location) {
-        // Convert location to coordinates using geocoding service
-        this.geocodeLocation(location).then(coords => {
-            if (coords) {
-                // Add heat point
-                this.svg.append("circle")
-                    .attr("class", "heat-point")
-                    .attr("cx", this.projection(coords)[0])
-                    .attr("cy", this.projection(coords)[1])
-                    .attr("r", 5)
-                    .transition()
-                    .duration(3000)
-                    .style("opacity", 0)
-                    .remove();
-
-                // Update heat map intensity
-                this.updateHeatMap(coords);
-            }
-        });
+    initializeOverlay(data) {
+        // Snapshot of every occupied cell
+        this.locationData.clear();
+        this.applyBins(data.state);
     }
 
-    async geocodeLocation(location) {
-        try {
-            const response = await fetch(
-                `https://api.opencagedata.com/geocode/v1/json?q=${encodeURIComponent(location)}&key=YOUR_API_KEY`
-            );
-            const data = await response.json();
-            if (data.results.length > 0) {
-                const { lng, lat } = data.results[0].geometry;
-                return [lng, lat];
-            }
-        } catch (error) {
-            console.error('Geocoding error:', error);
-        }
-        return null;
+    applyBins(data) {
+        // Server sends [cell, count] pairs for changed cells of a fixed lat/lng grid
+        this.cellSize = data.cell;
+        data.bins.forEach(([cell, count]) => this.locationData.set(cell, count));
+        this.renderHeatMap();
     }
 
-    updateHeatMap(coords) {
-        const key = `${coords[0]},${coords[1]}`;
-        const count = (this.locationData.get(key) || 0) + 1;
-        this.locationData.set(key, count);
+    cellCenter(cell) {
+        const cols = Math.round(360 / this.cellSize);
+        const col = cell % cols;
+        const row = Math.floor(cell / cols);
+        return [-180 + (col + 0.5) * this.cellSize, 90 - (row + 0.5) * this.cellSize];
+    }
 
-        // Update visualization based on frequency
-        this.renderHeatMap();
+    renderHeatMap() {
+        // One circle per occupied cell, however many locations arrive
+        const max = Math.max(1, ...this.locationData.values());
+        this.svg.selectAll("circle.heat-bin")
+            .data(Array.from(this.locationData), ([cell]) => cell)
+            .join("circle")
+            .attr("class", "heat-bin")
+            .attr("cx", ([cell]) => this.projection(this.cellCenter(cell))[0])
+            .attr("cy", ([cell]) => this.projection(this.cellCenter(cell))[1])
+            .attr("r", ([, count]) => 3 + 12 * Math.sqrt(count / max))
+            .style("fill-opacity", ([, count]) => 0.3 + 0.5 * (count / max));
     }
 }
 
@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS oauth_tokens (
+    client_id VARCHAR(255) PRIMARY KEY,
+    token_data BLOB NOT NULL,         -- Fernet-encrypted JSON token payload
+    expires_at DOUBLE PRECISION,      -- Access token expiry (epoch seconds)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS token_leases (
+    name VARCHAR(255) PRIMARY KEY,        -- What is held, e.g. one client's token refresh
+    owner VARCHAR(64) NOT NULL,           -- Worker/attempt holding the lease
+    expires_at DOUBLE PRECISION NOT NULL  -- Lease expiry (epoch seconds), so a crashed holder can't block others
+);
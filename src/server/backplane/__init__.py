@@ -0,0 +1,7 @@
+from .base import Backplane, InProcessBackplane, create_backplane, get_backplane
+from .resp import RespBackplane, RespHub
+
+__all__ = [
+    'Backplane', 'InProcessBackplane', 'RespBackplane', 'RespHub',
+    'create_backplane', 'get_backplane'
+]
@@ -0,0 +1,66 @@
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'vsa:zoom-events'
+
+EventHandler = Callable[[Dict[str, Any]], int]
+
+
+class Backplane(ABC):
+    """
+    Fans Zoom events out to every worker process
+    1. Any worker publishes an event it received (webhook or realtime)
+    2. Every worker, including the publisher, dispatches it to its own overlays
+    3. Each worker keeps its own overlay state: sequence numbers start where
+       that worker started and timed aggregates flush on its own clock, so
+       frames are only comparable within one worker (see OverlayState.epoch)
+    """
+    def __init__(self):
+        self.handler: Optional[EventHandler] = None
+
+    async def start(self, handler: EventHandler):
+        self.handler = handler
+
+    @abstractmethod
+    async def publish(self, event: Dict[str, Any]) -> int:
+        """Send an event to all workers; returns a delivery count"""
+
+    async def close(self):
+        self.handler = None
+
+    def _deliver(self, event: Dict[str, Any]) -> int:
+        if not self.handler:
+            return 0
+        try:
+            return self.handler(event)
+        except Exception as e:
+            logger.error(f"Failed to dispatch {event.get('event')}: {e}")
+            return 0
+
+
+class InProcessBackplane(Backplane):
+    """Single worker: publishing is dispatching"""
+    async def publish(self, event: Dict[str, Any]) -> int:
+        """Returns the number of overlay sockets reached"""
+        return self._deliver(event)
+
+
+def create_backplane(url: Optional[str] = None) -> Backplane:
+    """In-process unless OVERLAY_BACKPLANE_URL points at a Redis-protocol server"""
+    url = url if url is not None else settings.overlay.backplane_url
+    if not url:
+        return InProcessBackplane()
+    from .resp import RespBackplane
+    return RespBackplane(url)
+
+
+@lru_cache()
+def get_backplane() -> Backplane:
+    """Shared backplane for this worker, chosen from the environment on first use"""
+    return create_backplane()
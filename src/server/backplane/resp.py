@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from .base import CHANNEL, Backplane, EventHandler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 6379
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 10.0
+SUBSCRIBE_TIMEOUT = 5.0
+DRAIN_TIMEOUT = 5.0         # Hub drops a subscriber that stops reading for this long
+
+
+class RespError(Exception):
+    """Error reply from the server"""
+
+
+def encode_command(*parts: Any) -> bytes:
+    """RESP array of bulk strings"""
+    encoded = [part if isinstance(part, bytes) else str(part).encode() for part in parts]
+    return b''.join(
+        [b'*%d\r\n' % len(encoded)] + [b'$%d\r\n%s\r\n' % (len(part), part) for part in encoded]
+    )
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP2 value"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Backplane connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b'+':
+        return rest.decode()
+    if kind == b'-':
+        raise RespError(rest.decode())
+    if kind == b':':
+        return int(rest)
+    if kind == b'$':
+        length = int(rest)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if kind == b'*':
+        length = int(rest)
+        return None if length < 0 else [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unexpected reply type {kind!r}")
+
+
+class RespBackplane(Backplane):
+    """
+    Backplane over the Redis pub/sub protocol
+    1. Works against Redis or the bundled RespHub stand-in, no client library
+    2. One pipelined connection publishes; a second one subscribes
+    3. The subscriber reconnects with backoff if the server goes away
+    """
+    def __init__(self, url: str, channel: str = CHANNEL):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or DEFAULT_PORT
+        self.password = parsed.password
+        self.channel = channel
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._replies: Deque[asyncio.Future] = deque()
+        self._reply_reader: Optional[asyncio.Task] = None
+        self._subscriber: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self._connecting: Optional[asyncio.Future] = None
+
+    async def start(self, handler: EventHandler):
+        await super().start(handler)
+        self._subscriber = asyncio.create_task(self._subscribe_loop())
+        # Don't accept publishes before this worker can hear them back
+        await asyncio.wait_for(self._subscribed.wait(), timeout=SUBSCRIBE_TIMEOUT)
+        logger.info(f"Backplane subscribed at {self.host}:{self.port}")
+
+    async def publish(self, event: Dict[str, Any]) -> int:
+        """Returns the number of workers subscribed when the event was published"""
+        if self._writer is None or self._writer.is_closing():
+            await self._connect_publisher()
+
+        future = asyncio.get_running_loop().create_future()
+        # write + enqueue without awaiting in between keeps replies in request order
+        self._writer.write(encode_command('PUBLISH', self.channel, json.dumps(event, separators=(',', ':'))))
+        self._replies.append(future)
+        return await future
+
+    async def _connect_publisher(self):
+        # Concurrent publishers share one connection attempt
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._open_publisher())
+        try:
+            await asyncio.shield(self._connecting)
+        finally:
+            self._connecting = None
+
+    async def _open_publisher(self):
+        reader, writer = await self._open()
+        self._writer = writer
+        self._reply_reader = asyncio.create_task(self._read_replies(reader))
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(encode_command('AUTH', self.password))
+            await read_reply(reader)
+        return reader, writer
+
+    async def _read_replies(self, reader: asyncio.StreamReader):
+        """Resolve pipelined PUBLISH replies in order"""
+        try:
+            while True:
+                try:
+                    reply = await read_reply(reader)
+                except RespError as e:
+                    self._replies.popleft().set_exception(e)
+                    continue
+                self._replies.popleft().set_result(reply)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Backplane publisher disconnected: {e}")
+        finally:
+            self._writer = None
+            while self._replies:
+                future = self._replies.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("Backplane publisher disconnected"))
+
+    async def _subscribe_loop(self):
+        delay = RECONNECT_DELAY
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._open()
+                writer.write(encode_command('SUBSCRIBE', self.channel))
+                await read_reply(reader)  # ['subscribe', channel, count]
+                self._subscribed.set()
+                delay = RECONNECT_DELAY
+
+                while True:
+                    kind, _, payload = await read_reply(reader)
+                    if kind == b'message':
+                        self._deliver(json.loads(payload))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Backplane subscriber error: {e}")
+            finally:
+                self._subscribed.clear()
+                if writer:
+                    writer.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def close(self):
+        for task in (self._subscriber, self._reply_reader):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self._writer:
+            self._writer.close()
+        self._writer = None
+        await super().close()
+
+
+def _confirmation(kind: bytes, channel: bytes, count: int) -> bytes:
+    """[kind, channel, subscription count] reply to (UN)SUBSCRIBE"""
+    return b'*3\r\n$%d\r\n%s\r\n$%d\r\n%s\r\n:%d\r\n' % (len(kind), kind, len(channel), channel, count)
+
+
+class RespHub:
+    """
+    Minimal Redis-protocol pub/sub server for local multi-worker runs
+    1. Supports PING, AUTH, SUBSCRIBE, UNSUBSCRIBE and PUBLISH
+    2. Publishes are handled one at a time, so every subscriber sees one order
+    3. A publish is answered once every subscriber has drained it, so buffers stay
+       bounded; a subscriber stuck for DRAIN_TIMEOUT is dropped and resubscribes
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Backplane hub listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: List[bytes] = []
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not command:
+                    continue
+                name = command[0].upper()
+                if name == b'PUBLISH':
+                    writer.write(b':%d\r\n' % await self._publish(command[1], command[2]))
+                elif name == b'SUBSCRIBE':
+                    for channel in command[1:]:
+                        self.channels.setdefault(channel, set()).add(writer)
+                        subscriptions.append(channel)
+                        writer.write(_confirmation(b'subscribe', channel, len(subscriptions)))
+                elif name == b'UNSUBSCRIBE':
+                    for channel in command[1:] or list(subscriptions):
+                        self.channels.get(channel, set()).discard(writer)
+                        if channel in subscriptions:
+                            subscriptions.remove(channel)
+                        writer.write(_confirmation(b'unsubscribe', channel, len(subscriptions)))
+                elif name == b'PING':
+                    writer.write(b'+PONG\r\n')
+                elif name == b'AUTH':
+                    writer.write(b'+OK\r\n')
+                else:
+                    writer.write(b'-ERR unknown command\r\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self.channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    async def _publish(self, channel: bytes, payload: bytes) -> int:
+        subscribers = list(self.channels.get(channel, ()))
+        if not subscribers:
+            return 0
+        # Written to everyone before yielding, so a concurrent publish can't interleave
+        message = encode_command('message', channel, payload)
+        for subscriber in subscribers:
+            subscriber.write(message)
+        await asyncio.gather(*(self._drain(subscriber) for subscriber in subscribers))
+        return len(subscribers)
+
+    async def _drain(self, subscriber: asyncio.StreamWriter):
+        try:
+            await asyncio.wait_for(subscriber.drain(), timeout=DRAIN_TIMEOUT)
+        except (ConnectionError, asyncio.TimeoutError):
+            logger.warning("Dropping a backplane subscriber that stopped reading")
+            for subscribers in self.channels.values():
+                subscribers.discard(subscriber)
+            subscriber.transport.abort()  # close() would wait to flush to a reader that isn't reading
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Redis-protocol pub/sub hub")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(RespHub(args.host, args.port).serve_forever())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+from .gazetteer import Gazetteer, Place, gazetteer
+
+__all__ = ['Gazetteer', 'Place', 'gazetteer']
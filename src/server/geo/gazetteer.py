@@ -0,0 +1,142 @@
+import csv
+import difflib
+import logging
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+DEFAULT_CACHE_SIZE = 4096
+FUZZY_CUTOFF = 0.85     # difflib similarity needed for a typo match
+MAX_PHRASE_WORDS = 4    # Longest place name tried inside free text
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_SEPARATORS = re.compile(r'[,;/|()]|\s-\s')
+_FILLER = frozenset('from in near the greater city of area im i am live living based'.split())
+
+
+class Place(NamedTuple):
+    name: str
+    country_code: str
+    lng: float
+    lat: float
+
+    @property
+    def coordinates(self) -> List[float]:
+        """[lng, lat], the order d3 projections expect"""
+        return [self.lng, self.lat]
+
+
+def normalize(text: str) -> str:
+    """Fold accents and case, collapse punctuation to single spaces"""
+    folded = unicodedata.normalize('NFKD', text)
+    folded = ''.join(char for char in folded if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', folded.lower()).strip()
+
+
+class Gazetteer:
+    """
+    Offline place name -> coordinate lookup
+    1. Loads the bundled countries/major cities table once, on first use
+    2. Indexes normalised names and aliases into flat coordinate arrays
+    3. Falls back to comma parts, phrases in free text, then fuzzy matching
+    4. Remembers recent resolutions in an LRU
+    """
+    def __init__(self, path: Path = GAZETTEER_PATH, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.names: List[str] = []
+        self.country_codes: List[str] = []
+        self.lngs = array('f')
+        self.lats = array('f')
+        self.index: Dict[str, int] = {}
+        self.countries: Dict[str, int] = {}  # ISO 3166 alpha-2 code -> position
+        self._keys: List[str] = []
+        self._loaded = False
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def load(self):
+        """Build the index from the bundled table"""
+        if self._loaded:
+            return
+        with open(self.path, newline='', encoding='utf-8') as f:
+            rows = csv.reader(line for line in f if line.strip() and not line.startswith('#'))
+            for kind, name, aliases, lat, lng, country_code in rows:
+                position = len(self.names)
+                self.names.append(name)
+                self.country_codes.append(country_code)
+                self.lats.append(float(lat))
+                self.lngs.append(float(lng))
+                if kind == 'country':
+                    self.countries.setdefault(country_code.upper(), position)
+                # First entry wins, so countries keep their names over same-named cities
+                for alias in [name] + aliases.split(';'):
+                    key = normalize(alias)
+                    if key:
+                        self.index.setdefault(key, position)
+        self._keys = list(self.index)
+        self._loaded = True
+        logger.info(f"Loaded {len(self.names)} gazetteer places")
+
+    def place(self, position: int) -> Place:
+        return Place(self.names[position], self.country_codes[position],
+                     round(self.lngs[position], 2), round(self.lats[position], 2))
+
+    def country(self, code: str) -> Optional[Place]:
+        """Country by ISO code, the form Zoom registration answers use"""
+        self.load()
+        position = self.countries.get((code or '').strip().upper())
+        return self.place(position) if position is not None else None
+
+    def _resolve(self, location: str) -> Optional[Place]:
+        """Resolve a free-form location string, or None if nothing matches"""
+        self.load()
+        if not location:
+            return None
+
+        key = normalize(location)
+        position = self.index.get(key)
+        if position is None:
+            position = self._lookup_parts(location)
+        return self.place(position) if position is not None else None
+
+    def _lookup_parts(self, location: str) -> Optional[int]:
+        # "Austin, TX, USA": the first recognised part is the most specific
+        parts = [normalize(part) for part in _SEPARATORS.split(location)]
+        for part in filter(None, parts):
+            position = self.index.get(part)
+            if position is None:
+                position = self._lookup_phrase(part)
+            if position is None:
+                position = self._lookup_fuzzy(part)
+            if position is not None:
+                return position
+        return None
+
+    def _lookup_phrase(self, part: str) -> Optional[int]:
+        """Longest known place name inside free text ("greetings from sao paulo")"""
+        words = [word for word in part.split() if word not in _FILLER]
+        for size in range(min(MAX_PHRASE_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                phrase = ' '.join(words[start:start + size])
+                # Single short words are too ambiguous ("us", "la") inside free text
+                if size == 1 and len(phrase) < 4 and len(words) > 1:
+                    continue
+                if phrase in self.index:
+                    return self.index[phrase]
+        return None
+
+    def _lookup_fuzzy(self, part: str) -> Optional[int]:
+        """Close spelling of a whole part ("barcelonna", "melborne")"""
+        if len(part) < 4:
+            return None
+        matches = difflib.get_close_matches(part, self._keys, n=1, cutoff=FUZZY_CUTOFF)
+        return self.index[matches[0]] if matches else None
+
+
+# Shared gazetteer so the index and LRU are built once per process
+gazetteer = Gazetteer()
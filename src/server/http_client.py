@@ -0,0 +1,58 @@
+import logging
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """
+    Application-scoped aiohttp session for outbound Zoom calls
+    1. Keeps TCP/TLS connections alive between requests
+    2. Limits connections overall and per host
+    3. Caches DNS lookups and applies default timeouts
+    4. Imports aiohttp and opens the pool on first use, keeping cold starts lean
+    """
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30, total_timeout: float = 10, connect_timeout: float = 5):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self._session: Optional['aiohttp.ClientSession'] = None
+
+    async def start(self) -> 'aiohttp.ClientSession':
+        """Create the pooled session ahead of the first request"""
+        session = self.session
+        logger.info("HTTP client session started")
+        return session
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        """Pooled session, created on first use"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            timeout = aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def close(self):
+        """Close pooled connections on shutdown"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client session closed")
+        self._session = None
+
+
+# Shared client for the application
+http_client = HTTPClient()
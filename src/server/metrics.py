@@ -0,0 +1,92 @@
+import logging
+import weakref
+from typing import Dict, Optional
+
+from ..subscription.database import SubscriptionDB
+from ..utils.cache import TTLCache
+from ..utils.metrics import MetricsRegistry, metrics
+from .overlay_tokens import overlay_tokens
+from .token_manager import TokenManager
+from .websocket.broker import broker
+
+logger = logging.getLogger(__name__)
+
+# Zoom realtime handlers add themselves; held weakly so discarded handlers drop out
+realtime_handlers: weakref.WeakSet = weakref.WeakSet()
+
+
+def _caches() -> Dict[str, TTLCache]:
+    """In-memory caches that exist in this process"""
+    caches = {'overlay_tokens': overlay_tokens._verified}
+    if SubscriptionDB._instance is not None:
+        caches['subscriptions'] = SubscriptionDB().cache
+    if TokenManager._instance is not None:
+        caches['zoom_tokens'] = TokenManager().store.cache
+    return caches
+
+
+def _hit_ratio(cache: TTLCache) -> Optional[float]:
+    lookups = cache.hits + cache.misses
+    return cache.hits / lookups if lookups else None
+
+
+def register_server_metrics(registry: MetricsRegistry = metrics):
+    """
+    Scrape-time gauges over state the server already keeps
+    Nothing here runs per event; the broker, realtime handlers and caches
+    are only walked when /metrics is requested
+    """
+    registry.collect(
+        'gauge', 'vsa_overlay_connections', 'Overlay WebSocket connections',
+        lambda: {(overlay,): count for overlay, count in broker.stats()['per_overlay'].items()},
+        ('overlay',)
+    )
+    registry.collect('gauge', 'vsa_overlay_rooms', 'Rooms with at least one overlay', lambda: len(broker.rooms))
+    registry.collect(
+        'gauge', 'vsa_overlay_queued_frames', 'Frames waiting in overlay send queues',
+        lambda: {(overlay,): count for overlay, count in broker.queue_stats()['queued'].items()},
+        ('overlay',)
+    )
+    registry.collect(
+        'counter', 'vsa_overlay_frames_dropped_total', 'Frames dropped by full overlay send queues',
+        lambda: {(overlay,): count for overlay, count in broker.queue_stats()['dropped'].items()},
+        ('overlay',)
+    )
+
+    registry.collect(
+        'gauge', 'vsa_realtime_queue_depth', 'Zoom realtime events waiting to be published',
+        lambda: {(handler.client_id,): len(handler.events) for handler in realtime_handlers},
+        ('client',)
+    )
+    registry.collect(
+        'counter', 'vsa_realtime_events_dropped_total', 'Zoom realtime events shed by a full queue',
+        lambda: {(handler.client_id,): handler.events.dropped for handler in realtime_handlers},
+        ('client',)
+    )
+    registry.collect(
+        'counter', 'vsa_realtime_reconnects_total', 'Zoom realtime reconnects',
+        lambda: {(handler.client_id,): handler.reconnects for handler in realtime_handlers},
+        ('client',)
+    )
+    registry.collect(
+        'gauge', 'vsa_realtime_heartbeat_rtt_seconds', 'Last Zoom realtime heartbeat round trip',
+        lambda: {(handler.client_id,): handler.heartbeat_rtt for handler in realtime_handlers},
+        ('client',)
+    )
+
+    registry.collect(
+        'counter', 'vsa_cache_hits_total', 'In-memory cache hits',
+        lambda: {(name,): cache.hits for name, cache in _caches().items()}, ('cache',)
+    )
+    registry.collect(
+        'counter', 'vsa_cache_misses_total', 'In-memory cache misses',
+        lambda: {(name,): cache.misses for name, cache in _caches().items()}, ('cache',)
+    )
+    registry.collect(
+        'gauge', 'vsa_cache_hit_ratio', 'Cache hits / lookups since start',
+        lambda: {(name,): _hit_ratio(cache) for name, cache in _caches().items()}, ('cache',)
+    )
+    registry.collect(
+        'gauge', 'vsa_cache_entries', 'Entries held by in-memory caches',
+        lambda: {(name,): len(cache) for name, cache in _caches().items()}, ('cache',)
+    )
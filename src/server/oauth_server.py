@@ -1,46 +1,43 @@
+import asyncio
 import sys
 import os
 import datetime
 import logging
-from pathlib import Path
-from dotenv import load_dotenv
-from fastapi import FastAPI, Response
+import re
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Add project root to Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.insert(0, project_root)
 
-# Import the main config loader
-from src.config.config_loader import get_environment_config
+from src.config.settings import CONFIG_PATH, Settings, settings
+from src.server.backplane import get_backplane
+from src.server.metrics import register_server_metrics
+from src.server.overlay_tokens import overlay_tokens
+from src.server.websocket.broker import broker
+from src.server.websocket.dispatcher import dispatcher
+from src.server.websocket.handler import realtime
+from src.server.websocket.moderation import chat_moderator, load_terms
+from src.server.websocket.routes import router as ws_router
+from src.server.webhooks.routes import router as webhook_router
+from src.server.webhooks.validator import webhook_validators
+from src.server.http_client import http_client
+from src.server.token_manager import TokenManager
+from src.server.zoom_api import ZoomAPI
+from src.subscription.database import SubscriptionDB
+from src.subscription.sweeper import SubscriptionSweeper
+from src.utils.logging import correlation, log_pipeline, setup_logging
+from src.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
 
-# Set up logging
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
-
-# Load environment variables
-env_path = os.path.join(project_root, '.env')
-load_dotenv(env_path)
-
-# Get environment-specific config
-config = get_environment_config()
-logger.info(f"Loaded config: {config}")
-
-# Print current directory
-print(f"Current working directory: {os.getcwd()}")
-print(f"Project root: {project_root}")
-print(f"Python path: {sys.path}")
 
-# Print all environment variables (excluding secrets)
-print("\nEnvironment Variables:")
-for key in os.environ:
-    if 'SECRET' not in key and 'KEY' not in key:
-        print(f"{key}: {os.environ[key]}")
-
-from src.server.websocket.routes import router as ws_router
+router = APIRouter()
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
@@ -51,24 +48,128 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
         return response
 
-app = FastAPI()
+class CorrelationMiddleware:
+    """Tag every log line of a request with its X-Request-ID (a new one if absent) and echo it back"""
+    _valid = re.compile(r'[\w.-]{1,64}')
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] not in ('http', 'websocket'):
+            await self.app(scope, receive, send)
+            return
+
+        supplied = dict(scope['headers']).get(b'x-request-id', b'').decode('latin-1')
+        request_id = supplied if self._valid.fullmatch(supplied) else uuid.uuid4().hex[:16]
+
+        async def send_with_id(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', []), (b'x-request-id', request_id.encode())]
+            await send(message)
+
+        with correlation(request=request_id):
+            await self.app(scope, receive, send_with_id)
+
+def apply_logging(current: Settings):
+    """Level, format and sampling from settings (also on reload)"""
+    log_pipeline.configure(
+        level=current.logging.level,
+        json_format=current.logging.format == 'json',
+        sample_rates=current.logging.sample
+    )
+
+def apply_tuning(current: Settings):
+    """Push reloadable knobs into running subsystems (cached entries keep their expiry)"""
+    tuning = current.tuning
+    broker.max_queue_size = tuning.subscriber_queue_size  # Applies to new subscribers
+    dispatcher.reactions.window = tuning.reaction_window
+    dispatcher.words.interval = tuning.word_cloud_interval
+    dispatcher.heat.interval = tuning.world_map_interval
+    SubscriptionDB().cache.ttl = tuning.subscription_cache_ttl
+    overlay_tokens.cache_ttl = tuning.overlay_token_cache_ttl
+    if TokenManager._instance is not None:
+        TokenManager().store.cache.ttl = tuning.token_cache_ttl
 
-# Add the security headers middleware first
-app.add_middleware(SecurityHeadersMiddleware)
+def apply_moderation(current: Settings):
+    """Chat moderation terms and limits (also on reload; the matcher is rebuilt only if terms changed)"""
+    moderation = current.moderation
+    terms_file = CONFIG_PATH.parent / moderation.blocklist_file if moderation.blocklist_file else None
+    chat_moderator.configure(
+        blocklist=[*moderation.blocklist, *load_terms(terms_file)],
+        allowlist=moderation.allowlist,
+        action=moderation.action,
+        max_length=moderation.max_length,
+        rate=moderation.rate,
+        burst=moderation.burst,
+        duplicate_window=moderation.duplicate_window,
+        enabled=moderation.enabled
+    )
 
-# Then add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown (nothing is opened at import time)"""
+    # Read .env/config.yaml once and fail fast on invalid settings
+    current = settings.load()
+    # Takes over the root logger and starts the writer thread; importing the app does neither
+    setup_logging(current.logging.level, current.logging.format == 'json', current.logging.sample)
+    apply_moderation(current)
+    apply_tuning(current)
+    settings.on_reload(apply_logging)
+    settings.on_reload(apply_moderation)
+    settings.on_reload(apply_tuning)
+    config_watcher = asyncio.create_task(settings.watch())
+    # Compile webhook validators once, before the first request
+    webhook_validators.load()
+    # Bulk subscription status updates and the in-memory active-until map
+    sweeper = SubscriptionSweeper()
+    await sweeper.start()
+    # Zoom events reach this worker's overlays through the backplane
+    backplane = get_backplane()
+    await backplane.start(dispatcher.dispatch)
+    # Accounts authorized before this start get their realtime connections back
+    await realtime.resume()
+    yield
+    config_watcher.cancel()
+    await realtime.stop()
+    await backplane.close()
+    await sweeper.stop()
+    if TokenManager._instance is not None:
+        await TokenManager().close()
+    await SubscriptionDB().close()
+    # The Zoom HTTP pool opens on the first OAuth/API call
+    await http_client.close()
+    # Last, so shutdown messages are written too
+    log_pipeline.stop()
 
-# Include routers
-app.include_router(ws_router, prefix="/ws")
+def create_app() -> FastAPI:
+    """Build the ASGI app; subsystems start in the lifespan"""
+    app = FastAPI(lifespan=lifespan)
+    register_server_metrics()
 
-@app.get('/')
+    # Add the security headers middleware first
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    # Then add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Request-ID"],
+    )
+
+    # Outermost, so every log line of a request carries its id
+    app.add_middleware(CorrelationMiddleware)
+
+    # Include routers
+    app.include_router(router)
+    app.include_router(ws_router, prefix="/ws")
+    app.include_router(webhook_router, prefix="/webhooks")
+    return app
+
+@router.get('/')
 async def root():
     """Root endpoint returning API information"""
     return {
@@ -77,12 +178,14 @@ async def root():
         'version': '1.0.0',
         'endpoints': {
             'health': '/health',
+            'metrics': '/metrics',
             'oauth': '/oauth',
-            'websocket': '/ws'
+            'websocket': '/ws',
+            'webhooks': '/webhooks/zoom'
         }
     }
 
-@app.get('/health')
+@router.get('/health')
 async def health_check():
     """Health check endpoint"""
     return {
@@ -90,63 +193,66 @@ async def health_check():
         'timestamp': datetime.datetime.now().isoformat()
     }
 
-@app.get('/oauth/start')
+@router.get('/metrics')
+async def metrics_endpoint():
+    """Prometheus scrape endpoint (per worker)"""
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+@router.get('/oauth/start')
 async def oauth_start():
     """Start the OAuth flow"""
     try:
-        env = os.getenv('ACTIVE_ENVIRONMENT', 'development')
-        prefix = 'PROD' if env == 'production' else 'DEV'
-        
-        client_id = os.getenv(f'{prefix}_CLIENT_ID')
-        redirect_uri = os.getenv(f'{prefix}_REDIRECT_URI')
-        
-        # Add debug logging
-        print(f"Environment: {env}")
-        print(f"Using redirect URI: {redirect_uri}")
-        
-        zoom_auth_url = f"https://zoom.us/oauth/authorize?response_type=code&client_id={client_id}&redirect_uri={redirect_uri}"
-        print(f"Full auth URL: {zoom_auth_url}")
-        
+        client_id = settings.zoom.client_id
+        redirect_uri = settings.zoom.redirect_uri
+
         if not client_id or not redirect_uri:
             raise ValueError("Missing required OAuth configuration")
-            
+
+        logger.debug(f"Redirecting to Zoom OAuth with redirect URI {redirect_uri}")
+        zoom_auth_url = f"https://zoom.us/oauth/authorize?response_type=code&client_id={client_id}&redirect_uri={redirect_uri}"
         return RedirectResponse(url=zoom_auth_url)
-        
+
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error(f"OAuth start failed: {e}")
         return JSONResponse(
             content={'error': str(e)},
             status_code=500
         )
 
-@app.get('/oauth/callback')
+@router.get('/oauth/callback')
 async def oauth_callback(code: str = None):
     """Handle the OAuth callback from Zoom"""
     if not code:
         return JSONResponse(content={'error': 'No code provided'}, status_code=400)
     
-    # Here you would handle the OAuth token exchange
+    token_manager = TokenManager()
+    tokens = await token_manager.get_tokens(code)
+    if not tokens:
+        return JSONResponse(content={'error': 'Token exchange failed'}, status_code=400)
+
+    # Tokens are stored per Zoom user so one server can serve many accounts
+    user = await ZoomAPI().get_user_info(tokens['access_token'])
+    if not user:
+        return JSONResponse(content={'error': 'Could not identify Zoom user'}, status_code=400)
+
+    await token_manager.start_refresh_scheduler(tokens, client_id=user['id'])
+    # Realtime Zoom events for this account flow in from now on
+    await realtime.start(user['id'])
     return {
         'status': 'success',
-        'message': 'Authorization successful'
+        'message': 'Authorization successful',
+        'client_id': user['id']
     }
 
-@app.get('/oauth/status')
+@router.get('/oauth/status')
 async def oauth_status():
     """Check OAuth configuration status"""
     try:
-        env = os.getenv('ACTIVE_ENVIRONMENT', 'development')
-        prefix = {
-            'development': 'DEV',
-            'preview': 'PREVIEW',
-            'production': 'PROD'
-        }.get(env, 'DEV')
-        
         return {
             'status': 'configured',
-            'environment': env,
-            'client_id_exists': bool(os.getenv(f'{prefix}_CLIENT_ID')),
-            'redirect_uri_exists': bool(os.getenv(f'{prefix}_REDIRECT_URI')),
+            'environment': settings.environment,
+            'client_id_exists': bool(settings.zoom.client_id),
+            'redirect_uri_exists': bool(settings.zoom.redirect_uri),
             'timestamp': datetime.datetime.now().isoformat()
         }
     except Exception as e:
@@ -155,12 +261,15 @@ async def oauth_status():
             status_code=500
         )
 
-@app.get('/favicon.ico')
+@router.get('/favicon.ico')
 async def favicon():
     """Serve favicon"""
     return Response(status_code=204)  # No content, but not 404
 
+# Module-level app for `uvicorn src.server.oauth_server:app` and Vercel
+app = create_app()
+
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000)
+    uvicorn.run(app, host="0.0.0.0", port=5000, log_config=None)  # Logs go through our pipeline
 
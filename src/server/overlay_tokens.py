@@ -0,0 +1,92 @@
+import hashlib
+import hmac
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ALL_OVERLAYS = '*'  # Overlay claim for combined browser sources
+COUNTDOWN_CONTROL = 'countdown:control'  # Starts/pauses/resets a meeting's countdown
+# Scopes that change state; a combined viewer token never grants them
+CONTROL_SCOPES = frozenset({COUNTDOWN_CONTROL})
+
+
+class OverlayTokenSigner:
+    """
+    Signed, stateless overlay access tokens
+    1. Tokens carry client_id, meeting id, overlay type and subscription expiry
+    2. Verification is signature + expiry checks, no database access
+    3. Recently verified tokens are cached until they expire
+    4. A token only opens the meeting it was minted for
+    5. Control scopes are separate tokens; viewer tokens in overlay URLs can't use them
+    """
+    algorithm = 'HS256'
+
+    def __init__(self, secret: Optional[str] = None, cache_size: int = 4096, cache_ttl: float = 300.0):
+        self._secret = secret
+        self.cache_ttl = cache_ttl
+        self._verified = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    @property
+    def secret(self) -> str:
+        if self._secret is None:
+            secret = settings.security.overlay_token_secret
+            if not secret:
+                # Derive a dedicated signing key rather than reusing the encryption key as-is
+                encryption_key = settings.security.token_encryption_key
+                if not encryption_key:
+                    raise ValueError("Missing required environment variable: OVERLAY_TOKEN_SECRET")
+                secret = hmac.new(encryption_key.encode(), b'overlay-access', hashlib.sha256).hexdigest()
+            self._secret = secret
+        return self._secret
+
+    def mint(self, client_id: str, overlay_type: str, expires_at: datetime, meeting_id: str) -> str:
+        """Create a token for one meeting, valid until the subscription expires"""
+        claims = {
+            'sub': client_id,
+            'mtg': str(meeting_id),
+            'ovl': overlay_type,
+            'iat': int(time.time()),
+            'exp': int(expires_at.timestamp())
+        }
+        from jose import jwt  # Deferred: pulls in the crypto backends
+        return jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def verify(self, token: str, overlay_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the token's access claims, or None if invalid for this overlay"""
+        if not token:
+            return None
+
+        claims = self._verified.get(token)
+        if claims is None:
+            from jose import JWTError, jwt
+            try:
+                claims = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+            except JWTError as e:
+                logger.info(f"Rejected overlay token: {e}")
+                return None
+            ttl = min(self.cache_ttl, claims['exp'] - time.time())
+            if ttl > 0:
+                self._verified.set(token, claims, ttl=ttl)
+        elif claims['exp'] <= time.time():
+            return None
+
+        if overlay_type and claims['ovl'] != overlay_type:
+            if claims['ovl'] != ALL_OVERLAYS or overlay_type in CONTROL_SCOPES:
+                return None
+
+        return {
+            'client_id': claims['sub'],
+            'meeting_id': claims.get('mtg'),
+            'overlay_type': claims['ovl'],
+            'expires_at': claims['exp']
+        }
+
+
+# Shared signer so verified tokens are cached process-wide
+overlay_tokens = OverlayTokenSigner()
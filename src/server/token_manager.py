@@ -2,17 +2,26 @@ import asyncio
 import base64
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
-import aiohttp
-
-from ..config.config_loader import get_environment_config
+from ..config.settings import settings
+from ..utils.metrics import metrics
+from .http_client import http_client
+from .token_store import TokenStore
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CLIENT = 'default'  # Client id used by single-account callers
+
+REFRESH_SECONDS = metrics.histogram(
+    'vsa_token_refresh_seconds', 'Zoom token refresh request latency',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+REFRESH_FAILURES = metrics.counter('vsa_token_refresh_failures_total', 'Failed Zoom token refreshes')
+
 class TokenManager:
+    token_url = 'https://zoom.us/oauth/token'
     _instance = None
-    _tokens = None
     _initialized = False
 
     def __new__(cls):
@@ -23,105 +32,192 @@ class TokenManager:
     def __init__(self):
         if not self._initialized:
             self.logger = logging.getLogger(__name__)
-            self.config = get_environment_config()
+            self.settings = settings
+            self.http = http_client
+            self.store = TokenStore(cache_ttl=settings.tuning.token_cache_ttl)
+            self.token_buffer = 300  # Refresh 5 minutes before expiry
+            self.max_refresh_attempts = 3
+            # Per-client refresh state
+            self.refresh_tasks: Dict[str, asyncio.Task] = {}
+            self.refresh_attempts: Dict[str, int] = {}
+            self._refresh_futures: Dict[str, asyncio.Future] = {}
+            self._tokens_changed: Dict[str, asyncio.Event] = {}
+            self._background: Set[asyncio.Task] = set()  # Held so early refreshes aren't garbage-collected
+            self._listeners: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
             self._initialized = True
             self.logger.info("TokenManager initialized")
 
     def setup_environment(self):
         """Setup environment-specific configurations"""
-        if not self.env:
-            raise ValueError("ACTIVE_ENVIRONMENT must be set")
-        
-        # Use the nested config structure
-        self.client_id = self.config['zoom']['client_id']
-        self.client_secret = self.config['zoom']['client_secret']
-        self.redirect_uri = self.config['zoom']['redirect_uri']
+        zoom = self.settings.zoom
+        self.client_id = zoom.client_id
+        self.client_secret = zoom.client_secret
+        self.redirect_uri = zoom.redirect_uri
 
     async def get_tokens(self, code: str) -> dict:
         """Exchange code for tokens"""
         try:
-            token_url = 'https://zoom.us/oauth/token'
             auth_str = base64.b64encode(
-                f"{self.config['zoom']['client_id']}:{self.config['zoom']['client_secret']}".encode()
+                f"{self.settings.zoom.client_id}:{self.settings.zoom.client_secret}".encode()
             ).decode()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    token_url,
-                    headers={
-                        'Authorization': f'Basic {auth_str}',
-                        'Content-Type': 'application/x-www-form-urlencoded'
-                    },
-                    data={
-                        'grant_type': 'authorization_code',
-                        'code': code,
-                        'redirect_uri': self.config['zoom']['redirect_uri']
-                    }
-                ) as response:
-                    if response.status == 200:
-                        tokens = await response.json()
-                        tokens['created_at'] = datetime.now().timestamp()
-                        return tokens
-                    else:
-                        self.logger.error(f"Token exchange failed: {await response.text()}")
-                        return None
+            async with self.http.session.post(
+                self.token_url,
+                headers={
+                    'Authorization': f'Basic {auth_str}',
+                    'Content-Type': 'application/x-www-form-urlencoded'
+                },
+                data={
+                    'grant_type': 'authorization_code',
+                    'code': code,
+                    'redirect_uri': self.settings.zoom.redirect_uri
+                }
+            ) as response:
+                if response.status == 200:
+                    tokens = await response.json()
+                    tokens['created_at'] = datetime.now().timestamp()
+                    return tokens
+                else:
+                    self.logger.error(f"Token exchange failed: {await response.text()}")
+                    return None
                         
         except Exception as e:
             self.logger.error(f"Error getting tokens: {e}")
             return None
 
-    async def save_tokens(self, tokens: dict):
-        """Save tokens to memory"""
+    async def save_tokens(self, tokens: dict, client_id: str = DEFAULT_CLIENT):
+        """Save a client's tokens to the encrypted store"""
         try:
             if not tokens or not isinstance(tokens, dict):
                 self.logger.error("Invalid tokens provided")
                 return False
                 
-            self._tokens = tokens
-            self.logger.info(f"Tokens saved successfully: {bool(tokens.get('access_token'))}")
-            self.logger.info(f"Current tokens: {bool(self._tokens)}")
+            await self.store.save(client_id, tokens)
+            # Let the refresh scheduler recalculate against the new expiry
+            self._changed_event(client_id).set()
+            self.logger.info(f"Tokens saved successfully for {client_id}: {bool(tokens.get('access_token'))}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error saving tokens: {e}")
             return False
 
-    async def get_token(self):
+    async def get_token(self, client_id: str = DEFAULT_CLIENT):
         """Get current access token"""
-        return self._tokens.get('access_token')
+        tokens = await self.store.load(client_id)
+        return tokens.get('access_token') if tokens else None
+
+    async def refresh_token(self, refresh_token: Optional[str] = None,
+                            client_id: str = DEFAULT_CLIENT) -> Optional[Dict[str, Any]]:
+        """
+        Refresh the access token
+        Concurrent callers for the same client share a single in-flight request,
+        and workers sharing the token database take turns through its refresh lock
+        """
+        future = self._refresh_futures.get(client_id)
+        if future is None:
+            # The refresh token this worker last saw; if the database has moved on, another worker refreshed
+            seen = refresh_token or (self.store.get_cached(client_id) or {}).get('refresh_token')
+            future = asyncio.ensure_future(self._refresh_locked(seen, client_id))
+            self._refresh_futures[client_id] = future
+            future.add_done_callback(lambda done: self._clear_refresh_future(client_id, done))
+        # Shield so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(future)
 
-    async def refresh_token(self):
-        """Refresh the access token"""
-        # Implementation here
-        pass
+    def _clear_refresh_future(self, client_id: str, future: asyncio.Future):
+        if self._refresh_futures.get(client_id) is future:
+            del self._refresh_futures[client_id]
 
-    async def get_valid_token(self):
-        """Get a valid access token"""
-        try:
-            self.logger.info(f"Checking tokens: {bool(self._tokens)}")
-            
-            if not self._tokens:
-                self.logger.error("No tokens stored")
+    async def _refresh_locked(self, seen: Optional[str], client_id: str) -> Optional[Dict[str, Any]]:
+        """Refresh under the cross-worker lock, from the tokens on disk rather than this worker's cache"""
+        async with self.store.refresh_lock(client_id):
+            stored = await self.store.load(client_id, fresh=True)
+            refresh_token = (stored or {}).get('refresh_token')
+            if not refresh_token:
+                self.logger.error(f"No refresh token available for {client_id}")
                 return None
+            if seen and refresh_token != seen:
+                # Rotated by another worker while ours sat in the cache; spending ours would fail
+                self.logger.info(f"Tokens for {client_id} were already refreshed by another worker")
+                self.refresh_attempts.pop(client_id, None)
+                self._changed_event(client_id).set()
+                return stored
+            return await self._request_refresh(refresh_token, client_id)
 
-            token = self._tokens.get('access_token')
-            self.logger.info(f"Token retrieval: exists={bool(token)}")
-            
-            if token:
-                self.logger.info("Found valid token")
-                return token
-                
-            self.logger.warning("No valid token found")
+    async def _request_refresh(self, refresh_token: str, client_id: str) -> Optional[Dict[str, Any]]:
+        """Exchange a refresh token for new tokens"""
+        started = asyncio.get_running_loop().time()
+        try:
+            async with self.http.session.post(
+                self.token_url,
+                headers=self._get_auth_headers(),
+                data={
+                    'grant_type': 'refresh_token',
+                    'refresh_token': refresh_token
+                }
+            ) as response:
+                if response.status != 200:
+                    REFRESH_FAILURES.inc()
+                    self.logger.error(f"Token refresh failed: {await response.text()}")
+                    return None
+                tokens = await response.json()
+            elapsed = asyncio.get_running_loop().time() - started
+            REFRESH_SECONDS.observe(elapsed)
+
+            tokens['created_at'] = datetime.now().timestamp()
+            await self.save_tokens(tokens, client_id)
+            self.refresh_attempts.pop(client_id, None)
+            self.logger.info(f"Token refreshed for {client_id} in {elapsed:.3f}s")
+            return tokens
+
+        except Exception as e:
+            REFRESH_FAILURES.inc()
+            self.logger.error(f"Error refreshing token: {e}")
             return None
+
+    async def get_valid_token(self, client_id: str = DEFAULT_CLIENT):
+        """
+        Get a valid access token for a client
+        Cached tokens are a memory lookup; tokens inside the refresh buffer
+        are returned immediately while a background refresh runs, and only
+        an already expired token waits
+        """
+        try:
+            tokens = self.store.get_cached(client_id)
+            if tokens is None:
+                tokens = await self.store.load(client_id)
+
+            if not tokens:
+                self.logger.error(f"No tokens stored for {client_id}")
+                return None
+
+            if self._is_past_expiry(tokens):
+                tokens = await self.refresh_token(tokens.get('refresh_token'), client_id)
+                return tokens.get('access_token') if tokens else None
+
+            if self._is_token_expired(tokens) and client_id not in self._refresh_futures:
+                # Still usable; renew without making this request wait
+                task = asyncio.create_task(self.refresh_token(tokens.get('refresh_token'), client_id))
+                self._background.add(task)
+                task.add_done_callback(self._background_done)
+
+            token = tokens.get('access_token')
+            if not token:
+                self.logger.warning(f"No access token stored for {client_id}")
+            return token or None
             
         except Exception as e:
             self.logger.error(f"Error getting valid token: {e}")
             return None
 
+    def _background_done(self, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error(f"Background token refresh failed: {task.exception()}")
+
     def _get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers"""
-        import base64
-        auth_str = f"{self.client_id}:{self.client_secret}"
+        auth_str = f"{self.settings.zoom.client_id}:{self.settings.zoom.client_secret}"
         auth_bytes = auth_str.encode('ascii')
         base64_auth = base64.b64encode(auth_bytes).decode('ascii')
         return {
@@ -151,7 +247,7 @@ class TokenManager:
             is_expired = now >= expiration_time
             
             if is_expired:
-                logger.info("Token requires refresh")
+                logger.debug("Token requires refresh")
             
             return is_expired
 
@@ -159,50 +255,75 @@ class TokenManager:
             logger.error(f"Error checking token expiration: {e}")
             return True  # Assume expired on error for safety
 
-    async def start_refresh_scheduler(self, initial_tokens: Dict[str, Any]):
-        """Start token refresh scheduling"""
-        self._tokens = initial_tokens
-        
-        # Cancel existing refresh task if any
-        if self.refresh_task:
-            self.refresh_task.cancel()
-            
-        # Calculate time until next refresh
-        refresh_in = self._get_refresh_time()
-        
-        # Schedule refresh
-        self.refresh_task = asyncio.create_task(
-            self._schedule_refresh(refresh_in)
-        )
-        logger.info(f"Token refresh scheduled in {refresh_in} seconds")
-
-    async def _schedule_refresh(self, delay: int):
-        """Schedule token refresh with delay"""
+    def _is_past_expiry(self, tokens: Dict[str, Any]) -> bool:
+        """Check if the token can no longer be used at all"""
+        created_at = tokens.get('created_at')
+        if not created_at:
+            return False
+        return datetime.now().timestamp() >= created_at + tokens.get('expires_in', 3600)
+
+    def _changed_event(self, client_id: str) -> asyncio.Event:
+        event = self._tokens_changed.get(client_id)
+        if event is None:
+            event = self._tokens_changed[client_id] = asyncio.Event()
+        return event
+
+    async def start_refresh_scheduler(self, initial_tokens: Dict[str, Any], client_id: str = DEFAULT_CLIENT):
+        """Start token refresh scheduling for a client"""
+        await self.save_tokens(initial_tokens, client_id)
+
+        # One long-lived task per client; it picks up new tokens via _tokens_changed
+        task = self.refresh_tasks.get(client_id)
+        if not task or task.done():
+            self.refresh_tasks[client_id] = asyncio.create_task(self._schedule_refresh(client_id))
+
+    async def _schedule_refresh(self, client_id: str):
+        """Refresh a client's tokens ahead of expiry for as long as they exist"""
+        changed = self._changed_event(client_id)
         try:
-            await asyncio.sleep(delay)
-            new_tokens = await self.refresh_token(self._tokens['refresh_token'])
-            
-            if new_tokens:
-                self._tokens = new_tokens
-                await self.save_tokens(new_tokens)
-                # Schedule next refresh
-                refresh_in = self._get_refresh_time()
-                self.refresh_task = asyncio.create_task(
-                    self._schedule_refresh(refresh_in)
-                )
-            else:
-                logger.error("Token refresh failed")
+            while True:
+                changed.clear()
+                tokens = await self.store.load(client_id)
+                if not tokens:
+                    return
+
+                # Calculate time until next refresh
+                refresh_in = self._get_refresh_time(tokens)
+                logger.info(f"Token refresh for {client_id} scheduled in {refresh_in} seconds")
+
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=refresh_in)
+                    continue  # Tokens were replaced; recalculate
+                except asyncio.TimeoutError:
+                    pass
+
+                new_tokens = await self.refresh_token(client_id=client_id)
+                if not new_tokens:
+                    logger.error(f"Token refresh failed for {client_id}")
+                    if not await self.handle_refresh_failure(client_id):
+                        return
                 
         except asyncio.CancelledError:
             logger.info("Token refresh task cancelled")
         except Exception as e:
             logger.error(f"Refresh scheduling error: {e}")
 
-    def _get_refresh_time(self) -> int:
+    async def stop_refresh_scheduler(self):
+        """Cancel background refresh on shutdown"""
+        for task in [*self.refresh_tasks.values(), *self._background]:
+            task.cancel()
+        self.refresh_tasks.clear()
+
+    async def close(self):
+        """Stop refreshing and release the token store"""
+        await self.stop_refresh_scheduler()
+        await self.store.close()
+
+    def _get_refresh_time(self, tokens: Dict[str, Any]) -> int:
         """Calculate time until next refresh needed"""
         now = datetime.now(timezone.utc).timestamp()
-        created_at = self._tokens.get('created_at', now)
-        expires_in = self._tokens.get('expires_in', 3600)
+        created_at = tokens.get('created_at', now)
+        expires_in = tokens.get('expires_in', 3600)
         
         # Refresh at buffer time before expiration
         refresh_at = created_at + expires_in - self.token_buffer
@@ -211,60 +332,70 @@ class TokenManager:
         delay = max(0, refresh_at - now)
         return int(delay)
 
-    async def handle_refresh_failure(self) -> bool:
+    async def handle_refresh_failure(self, client_id: str = DEFAULT_CLIENT) -> bool:
         """Handle token refresh failures with retry logic"""
         try:
-            self.refresh_attempt += 1
-            logger.warning(f"Token refresh attempt {self.refresh_attempt}/{self.max_refresh_attempts}")
+            while True:
+                attempt = self.refresh_attempts.get(client_id, 0) + 1
+                self.refresh_attempts[client_id] = attempt
+                logger.warning(f"Token refresh attempt {attempt}/{self.max_refresh_attempts} for {client_id}")
 
-            if self.refresh_attempt >= self.max_refresh_attempts:
-                logger.error("Max refresh attempts reached")
-                # Notify OAuthServer of refresh failure
-                await self._notify_refresh_failure()
-                return False
+                if attempt >= self.max_refresh_attempts:
+                    logger.error("Max refresh attempts reached")
+                    # A later re-authorization or retry starts with a fresh budget
+                    self.refresh_attempts.pop(client_id, None)
+                    # Notify OAuthServer of refresh failure
+                    await self._notify_refresh_failure(client_id)
+                    return False
 
-            # Exponential backoff between attempts
-            delay = 2 ** self.refresh_attempt
-            await asyncio.sleep(delay)
-            
-            # Attempt refresh again
-            tokens = await self.refresh_token(self._tokens['refresh_token'])
-            if tokens:
-                self.refresh_attempt = 0  # Reset counter on success
-                await self.save_tokens(tokens)
-                return True
-
-            return False
+                # Exponential backoff between attempts
+                delay = 2 ** attempt
+                await asyncio.sleep(delay)
+                
+                # Attempt refresh again (resets the counter on success)
+                if await self.refresh_token(client_id=client_id):
+                    return True
 
         except Exception as e:
             logger.error(f"Refresh failure handling error: {e}")
             return False
 
-    async def _notify_refresh_failure(self):
+    async def _notify_refresh_failure(self, client_id: str):
         """Notify OAuthServer that re-authorization is needed"""
         try:
             # Emit event for OAuthServer
             event = {
                 'type': 'token_refresh_failed',
+                'client_id': client_id,
                 'message': 'Token refresh failed, re-authorization required'
             }
             await self.emit_event(event)
         except Exception as e:
             logger.error(f"Failed to notify of refresh failure: {e}")
 
-    def needs_refresh(self):
+    def add_listener(self, callback: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Register an async callback for token events"""
+        self._listeners.append(callback)
+
+    async def emit_event(self, event: Dict[str, Any]):
+        """Deliver a token event to registered listeners"""
+        for callback in self._listeners:
+            await callback(event)
+
+    def needs_refresh(self, client_id: str = DEFAULT_CLIENT):
         """Check if token needs refresh"""
-        if not self._tokens:
+        tokens = self.store.get_cached(client_id)
+        if not tokens:
             return True
         
-        expires_in = self._tokens.get('expires_in', 0)
-        created_at = self._tokens.get('created_at', 0)
+        expires_in = tokens.get('expires_in', 0)
+        created_at = tokens.get('created_at', 0)
         
         if not expires_in or not created_at:
             return True
             
         now = datetime.now().timestamp()
-        return (created_at + expires_in - 300) < now  # Refresh 5 minutes early
+        return (created_at + expires_in - self.token_buffer) < now  # Refresh 5 minutes early
 
 def get_stored_token():
     """Get the most recently stored access token"""
@@ -273,10 +404,10 @@ def get_stored_token():
         if 'tokens' in globals() and globals()['tokens'].get('access_token'):
             return globals()['tokens']['access_token']
             
-        print("No token found in memory")
+        logger.debug("No token found in memory")
         return None
         
     except Exception as e:
-        print(f"Error getting token: {e}")
+        logger.error(f"Error getting token: {e}")
         return None
 
@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from ..config.settings import settings
+from ..utils.cache import TTLCache
+from ..utils.sqlite_pool import SQLitePool
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+MIGRATION_PATHS = (
+    MIGRATIONS_DIR / 'create_oauth_tokens.sql',
+    MIGRATIONS_DIR / 'create_token_leases.sql'
+)
+
+REFRESH_LOCK_TTL = 30.0     # Seconds a refresh lease is held at most
+REFRESH_LOCK_POLL = 0.1     # Seconds between attempts while another worker holds it
+
+
+def _fernet_from_secret(secret: str) -> Fernet:
+    """Derive a Fernet key from TOKEN_ENCRYPTION_KEY of any length"""
+    digest = hashlib.sha256(secret.encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+class TokenStore:
+    """
+    Per-client OAuth token storage
+    1. Tokens are encrypted at rest in SQLite (stand-in for Postgres)
+    2. Decrypted tokens are kept in an LRU/TTL cache for the hot path
+    3. Writes go through to disk and the cache together
+    4. Leases (expiring lock rows) coordinate worker processes, e.g. one refresh at a time
+    """
+    def __init__(self, db_path: Optional[str] = None, encryption_key: Optional[str] = None,
+                 cache_size: int = 1024, cache_ttl: float = 300.0):
+        self.db_path = db_path or settings.storage.database(settings.storage.token_db)
+        self._encryption_key = encryption_key
+        self._fernet: Optional[Fernet] = None
+        self.pool = SQLitePool(self.db_path)
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._migrated = False
+
+    @property
+    def fernet(self) -> Fernet:
+        if self._fernet is None:
+            secret = self._encryption_key or settings.security.token_encryption_key
+            if not secret:
+                raise ValueError("Missing required environment variable: TOKEN_ENCRYPTION_KEY")
+            self._fernet = _fernet_from_secret(secret)
+        return self._fernet
+
+    async def initialize(self):
+        """Apply the token table migrations once"""
+        if not self._migrated:
+            for path in MIGRATION_PATHS:
+                await self.pool.apply_migration(path.name, path.read_text())
+            self._migrated = True
+
+    def get_cached(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """Hot path: decrypted tokens from memory only"""
+        return self.cache.get(client_id)
+
+    async def load(self, client_id: str, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get tokens from cache, falling back to decrypting from disk (fresh: disk only)"""
+        tokens = None if fresh else self.cache.get(client_id)
+        if tokens is not None:
+            return tokens
+
+        await self.initialize()
+        rows = await self.pool.execute(
+            'SELECT token_data FROM oauth_tokens WHERE client_id = ?', (client_id,)
+        )
+        if not rows:
+            self.cache.pop(client_id)
+            return None
+
+        try:
+            tokens = json.loads(self.fernet.decrypt(rows[0]['token_data']))
+        except InvalidToken:
+            logger.error(f"Stored tokens for {client_id} could not be decrypted")
+            return None
+
+        self.cache.set(client_id, tokens)
+        return tokens
+
+    async def save(self, client_id: str, tokens: Dict[str, Any]):
+        """Encrypt and persist tokens, updating the cache"""
+        await self.initialize()
+        token_data = self.fernet.encrypt(json.dumps(tokens).encode())
+        expires_at = tokens.get('created_at', time.time()) + tokens.get('expires_in', 3600)
+        await self.pool.execute(
+            'INSERT INTO oauth_tokens (client_id, token_data, expires_at, updated_at) '
+            'VALUES (?, ?, ?, CURRENT_TIMESTAMP) '
+            'ON CONFLICT(client_id) DO UPDATE SET token_data = excluded.token_data, '
+            'expires_at = excluded.expires_at, updated_at = excluded.updated_at',
+            (client_id, token_data, expires_at)
+        )
+        self.cache.set(client_id, tokens)
+
+    async def delete(self, client_id: str):
+        """Forget a client's tokens"""
+        await self.initialize()
+        await self.pool.execute('DELETE FROM oauth_tokens WHERE client_id = ?', (client_id,))
+        self.cache.pop(client_id)
+
+    async def client_ids(self) -> List[str]:
+        """Every client with stored tokens"""
+        await self.initialize()
+        rows = await self.pool.execute('SELECT client_id FROM oauth_tokens ORDER BY client_id')
+        return [row['client_id'] for row in rows]
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a lease unless another owner holds an unexpired one"""
+        await self.initialize()
+        return await self.pool.run(self._try_lease, name, owner, ttl)
+
+    async def release_lease(self, name: str, owner: str):
+        await self.initialize()
+        await self.pool.execute('DELETE FROM token_leases WHERE name = ? AND owner = ?', (name, owner))
+
+    @staticmethod
+    def _try_lease(connection, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with connection:
+            connection.execute(
+                'INSERT INTO token_leases (name, owner, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                'WHERE token_leases.expires_at < ? OR token_leases.owner = excluded.owner',
+                (name, owner, now + ttl, now)
+            )
+            row = connection.execute('SELECT owner FROM token_leases WHERE name = ?', (name,)).fetchone()
+        return row is not None and row['owner'] == owner
+
+    @asynccontextmanager
+    async def refresh_lock(self, client_id: str) -> AsyncIterator[None]:
+        """
+        Hold a client's refresh lease, shared by every worker using this database
+        Zoom rotates the refresh token, so only one worker may spend it at a time
+        """
+        name, owner = f"refresh:{client_id}", uuid.uuid4().hex
+        while not await self.acquire_lease(name, owner, REFRESH_LOCK_TTL):
+            await asyncio.sleep(REFRESH_LOCK_POLL)
+        try:
+            yield
+        finally:
+            await self.release_lease(name, owner)
+
+    async def close(self):
+        await self.pool.close()
@@ -0,0 +1,3 @@
+from .validator import WebhookValidators, webhook_validators
+
+__all__ = ['WebhookValidators', 'webhook_validators']
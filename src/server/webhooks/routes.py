@@ -0,0 +1,108 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from ...config.settings import settings
+from ...utils.logging import meeting_id
+from ...utils.metrics import metrics
+from ..backplane import get_backplane
+from ..backplane.resp import RespError
+from ..websocket.moderation import moderate_event
+from .validator import webhook_validators
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+SIGNATURE_TOLERANCE = 300  # Seconds a signed request timestamp stays valid
+
+EVENTS_RECEIVED = metrics.counter('vsa_events_received_total', 'Zoom events received', ('source',))
+WEBHOOK_EVENTS = EVENTS_RECEIVED.labels('webhook')
+WEBHOOKS_REJECTED = metrics.counter('vsa_webhooks_rejected_total', 'Webhook requests rejected', ('reason',))
+
+
+def _sign(secret: str, message: str) -> str:
+    """HMAC-SHA256 hex digest used by Zoom webhook signatures"""
+    return hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def signature_headers(secret: str, body: bytes, timestamp: Optional[int] = None) -> Dict[str, str]:
+    """The headers Zoom sends with a signed webhook body (for load tests and local replay)"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    return {
+        'x-zm-request-timestamp': str(timestamp),
+        'x-zm-signature': 'v0=' + _sign(secret, f"v0:{timestamp}:{body.decode()}")
+    }
+
+
+def _verify_signature(secret: str, request: Request, body: bytes) -> bool:
+    """Verify the x-zm-signature header against the raw body"""
+    timestamp = request.headers.get('x-zm-request-timestamp', '')
+    signature = request.headers.get('x-zm-signature', '')
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > SIGNATURE_TOLERANCE:
+        return False
+    expected = 'v0=' + _sign(secret, f"v0:{timestamp}:{body.decode()}")
+    return hmac.compare_digest(expected, signature)
+
+
+@router.post("/zoom")
+async def zoom_webhook(request: Request):
+    """Receive Zoom webhook events and route them to overlays"""
+    body = await request.body()
+    secret = settings.security.secret_token
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        return JSONResponse(content={'error': 'Invalid JSON'}, status_code=400)
+    if not isinstance(event, dict):
+        return JSONResponse(content={'error': 'Invalid payload'}, status_code=400)
+
+    # Unsigned events are never accepted, so without a secret nothing is
+    if not secret:
+        WEBHOOKS_REJECTED.labels('unconfigured').inc()
+        logger.error("Webhook received but SECRET_TOKEN is not configured")
+        return JSONResponse(content={'error': 'Webhook secret not configured'}, status_code=503)
+
+    # Endpoint URL validation challenge from the Zoom Marketplace
+    if event.get('event') == 'endpoint.url_validation':
+        plain_token = event.get('payload', {}).get('plainToken', '')
+        return {
+            'plainToken': plain_token,
+            'encryptedToken': _sign(secret, plain_token)
+        }
+
+    if not _verify_signature(secret, request, body):
+        WEBHOOKS_REJECTED.labels('signature').inc()
+        return JSONResponse(content={'error': 'Invalid signature'}, status_code=401)
+
+    error = webhook_validators.validate(event)
+    if error:
+        WEBHOOKS_REJECTED.labels('invalid').inc()
+        logger.warning(f"Rejected webhook {event.get('event')}: {error}")
+        return JSONResponse(content={'error': error}, status_code=400)
+
+    WEBHOOK_EVENTS.inc()
+    payload = event.get('payload')
+    meeting = payload.get('object') if isinstance(payload, dict) else None
+    if isinstance(meeting, dict) and meeting.get('id'):
+        meeting_id.set(str(meeting['id']))  # Request-scoped: later log lines name the meeting
+
+    # Moderated here, once, so every worker dispatches the same chat
+    event = moderate_event(event)
+    if event is None:
+        return {'status': 'received', 'delivered': 0}
+
+    # Every worker dispatches the event to the overlays connected to it
+    try:
+        delivered = await get_backplane().publish(event)
+    except (ConnectionError, RespError) as e:
+        logger.error(f"Backplane unavailable: {e}")
+        return JSONResponse(content={'error': 'Temporarily unavailable'}, status_code=503)
+    return {'status': 'received', 'delivered': delivered}
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SPEC_PATH = Path(__file__).resolve().parent.parent / 'webhook_meetings.json'
+
+# Bump when the compact layout below changes so stale caches are ignored
+CACHE_FORMAT = 1
+
+# Compact node keys
+#   t: allowed types   r: required keys   p: properties
+#   i: array items     e: enum values     a: anyOf alternatives
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'null': lambda v: v is None
+}
+
+Validator = Callable[[Any, str], Optional[str]]
+
+
+def compact_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a JSON schema to the keywords the validators enforce"""
+    node: Dict[str, Any] = {}
+
+    schema_type = schema.get('type')
+    if schema_type:
+        node['t'] = schema_type if isinstance(schema_type, list) else [schema_type]
+    if schema.get('required'):
+        node['r'] = schema['required']
+    if schema.get('properties'):
+        node['p'] = {key: compact_schema(value) for key, value in schema['properties'].items()}
+    if isinstance(schema.get('items'), dict):
+        node['i'] = compact_schema(schema['items'])
+    if schema.get('enum'):
+        node['e'] = schema['enum']
+    if schema.get('anyOf'):
+        node['a'] = [compact_schema(option) for option in schema['anyOf']]
+
+    return node
+
+
+def _compact_spec(spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Extract one compact schema per webhook event"""
+    events = {}
+    for event_name, operation in spec.get('webhooks', {}).items():
+        schema = operation['post']['requestBody']['content']['application/json']['schema']
+        events[event_name] = compact_schema(schema)
+    return events
+
+
+def _cache_path(spec_path: Path, cache_dir: Optional[str]) -> Path:
+    """Cache file keyed by the spec's size and modification time"""
+    stat = spec_path.stat()
+    directory = Path(cache_dir or os.getenv('WEBHOOK_CACHE_DIR') or Path(tempfile.gettempdir()) / 'vsa_cache')
+    return directory / f"zoom_webhooks.v{CACHE_FORMAT}.{stat.st_size}.{stat.st_mtime_ns}.json"
+
+
+def load_compact_spec(spec_path: Path = SPEC_PATH, cache_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Load compact event schemas, rebuilding the disk cache when the spec changes"""
+    cache_file = _cache_path(spec_path, cache_dir)
+    try:
+        with open(cache_file, 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    with open(spec_path, 'r') as file:
+        events = _compact_spec(json.load(file))
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as file:
+            json.dump(events, file, separators=(',', ':'))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        # Read-only filesystems still work, just without the cache
+        logger.warning(f"Could not write webhook schema cache: {e}")
+
+    return events
+
+
+def compile_validator(node: Dict[str, Any]) -> Validator:
+    """Turn a compact schema node into a validation closure"""
+    checks: List[Validator] = []
+
+    if 't' in node:
+        type_checks = [_TYPE_CHECKS[t] for t in node['t'] if t in _TYPE_CHECKS]
+        type_names = '|'.join(node['t'])
+
+        def check_type(value, path):
+            for type_check in type_checks:
+                if type_check(value):
+                    return None
+            return f"{path}: expected {type_names}"
+        checks.append(check_type)
+
+    if 'e' in node:
+        allowed = node['e']
+
+        def check_enum(value, path):
+            if value not in allowed:
+                return f"{path}: {value!r} is not one of {allowed}"
+            return None
+        checks.append(check_enum)
+
+    if 'r' in node:
+        required = node['r']
+
+        def check_required(value, path):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        return f"{path}: missing required field '{key}'"
+            return None
+        checks.append(check_required)
+
+    if 'p' in node:
+        properties = [(key, compile_validator(child)) for key, child in node['p'].items()]
+
+        def check_properties(value, path):
+            if isinstance(value, dict):
+                for key, validate in properties:
+                    if key in value:
+                        error = validate(value[key], f"{path}.{key}")
+                        if error:
+                            return error
+            return None
+        checks.append(check_properties)
+
+    if 'i' in node:
+        validate_item = compile_validator(node['i'])
+
+        def check_items(value, path):
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    error = validate_item(item, f"{path}[{index}]")
+                    if error:
+                        return error
+            return None
+        checks.append(check_items)
+
+    if 'a' in node:
+        options = [compile_validator(option) for option in node['a']]
+
+        def check_any_of(value, path):
+            for validate in options:
+                if validate(value, path) is None:
+                    return None
+            return f"{path}: does not match any allowed schema"
+        checks.append(check_any_of)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value, path):
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+        return None
+    return validate
+
+
+class WebhookValidators:
+    """
+    Per-event validators compiled from the Zoom webhook OpenAPI spec
+    1. Loads compact schemas from the disk cache (or builds them once)
+    2. Compiles each event schema into a closure at startup
+    3. Validates incoming payloads without touching the spec again
+    """
+    def __init__(self, spec_path: Path = SPEC_PATH, cache_dir: Optional[str] = None):
+        self.spec_path = spec_path
+        self.cache_dir = cache_dir
+        self._validators: Dict[str, Validator] = {}
+        self.loaded = False
+
+    def load(self) -> int:
+        """Compile validators for every event in the spec"""
+        if not self.loaded:
+            events = load_compact_spec(self.spec_path, self.cache_dir)
+            self._validators = {name: compile_validator(node) for name, node in events.items()}
+            self.loaded = True
+            logger.info(f"Compiled {len(self._validators)} webhook validators")
+        return len(self._validators)
+
+    def __contains__(self, event_name: str) -> bool:
+        return event_name in self._validators
+
+    def validate(self, event: Dict[str, Any]) -> Optional[str]:
+        """Return an error message, or None when the payload is valid"""
+        if not self.loaded:
+            self.load()
+        validator = self._validators.get(event.get('event'))
+        if validator is None:
+            return f"Unsupported event: {event.get('event')}"
+        return validator(event, '$')
+
+
+# Shared validators, compiled during application startup
+webhook_validators = WebhookValidators()
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from .broker import OverlayBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.1      # Seconds per coalescing window
+DEFAULT_SAMPLE_SIZE = 10  # Sender names kept per window
+
+
+class _ReactionWindow:
+    """Pending reactions for one room"""
+    __slots__ = ('counts', 'names', 'named', 'total')
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.named = 0
+        self.total = 0
+
+
+class ReactionAggregator:
+    """
+    Coalesces reaction events into fixed windows per room
+    1. Counts reactions per emoji while a window is open
+    2. Keeps a uniform sample of sender names (reservoir sampling)
+    3. Publishes one reaction_batch frame when the window closes
+    """
+    def __init__(self, overlay_broker: OverlayBroker, window: float = DEFAULT_WINDOW,
+                 sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.broker = overlay_broker
+        self.window = window
+        self.sample_size = sample_size
+        self._pending: Dict[str, _ReactionWindow] = {}
+
+    def add(self, room: str, emoji: str, name: Optional[str] = None):
+        """Record a reaction; the first one in a room opens its window"""
+        pending = self._pending.get(room)
+        if pending is None:
+            pending = self._pending[room] = _ReactionWindow()
+            asyncio.get_running_loop().call_later(self.window, self.flush, room)
+
+        pending.counts[emoji] = pending.counts.get(emoji, 0) + 1
+        pending.total += 1
+
+        if name:
+            pending.named += 1
+            if len(pending.names) < self.sample_size:
+                pending.names.append(name)
+            else:
+                index = random.randrange(pending.named)
+                if index < self.sample_size:
+                    pending.names[index] = name
+
+    def flush(self, room: str) -> int:
+        """Publish and clear a room's window"""
+        pending = self._pending.pop(room, None)
+        if not pending:
+            return 0
+        return self.broker.publish(room, 'reactions', self._frame(pending))
+
+    def flush_all(self):
+        """Publish every open window immediately"""
+        for room in list(self._pending):
+            self.flush(room)
+
+    def _frame(self, pending: _ReactionWindow) -> Dict[str, Any]:
+        return {
+            'type': 'reaction_batch',
+            'window_ms': int(self.window * 1000),
+            'counts': pending.counts,
+            'names': pending.names,
+            'total': pending.total
+        }
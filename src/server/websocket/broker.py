@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from fastapi import WebSocket
+
+from ...utils.metrics import metrics
+from .encoding import JSON_CODEC, Frame, FrameCodec
+from .state import OverlayState
+
+logger = logging.getLogger(__name__)
+
+# Overlay topics a browser source can subscribe to
+OVERLAY_TYPES = frozenset({
+    'chat',
+    'reactions',
+    'participants',
+    'word_cloud',
+    'world_map',
+    'countdown'
+})
+
+DEFAULT_QUEUE_SIZE = 256
+
+EVENTS_PUBLISHED = metrics.counter('vsa_overlay_events_published_total', 'Overlay events published', ('overlay',))
+FRAMES_QUEUED = metrics.counter('vsa_overlay_frames_queued_total', 'Frames queued to overlay sockets', ('overlay',))
+
+
+class OverlaySubscriber:
+    """
+    A single overlay WebSocket with its own bounded send queue
+    1. Frames are queued without awaiting the socket
+    2. A dedicated sender task drains the queue
+    3. When the queue is full the oldest frame is dropped
+    """
+    def __init__(self, websocket: WebSocket, room: str, overlay_type: str,
+                 max_queue_size: int = DEFAULT_QUEUE_SIZE, codec: FrameCodec = JSON_CODEC):
+        self.websocket = websocket
+        self.room = room
+        self.overlay_type = overlay_type
+        self.codec = codec
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.closed = False
+        self._sender: Optional[asyncio.Task] = None
+
+    def start(self, on_error=None):
+        """Start the background sender task"""
+        self._sender = asyncio.create_task(self._send_loop(on_error))
+
+    def offer(self, frame: Frame) -> bool:
+        """Queue a frame for sending, dropping the oldest frame if full"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            # A slow OBS instance only loses its own backlog
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.queue.put_nowait(frame)
+            return False
+
+    async def _send_loop(self, on_error):
+        """Drain the queue to the socket until closed"""
+        try:
+            while True:
+                frame = await self.queue.get()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"Overlay send failed ({self.room}/{self.overlay_type}): {e}")
+            self.closed = True
+            if on_error:
+                await on_error(self)
+
+    async def close(self):
+        """Stop the sender task"""
+        self.closed = True
+        if self._sender and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+
+
+class OverlayBroker:
+    """
+    Fans out overlay events to subscribed browser sources
+    1. Topics are keyed by room (meeting/client) and overlay type
+    2. Each event is encoded once per wire format per broadcast
+    3. Delivery is decoupled from publishing through per-socket queues
+    4. Published events are sequenced and retained for late joiners
+    """
+    def __init__(self, max_queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self.rooms: Dict[str, Dict[str, Set[OverlaySubscriber]]] = {}
+        self.state = OverlayState()
+        self.retired_dropped: Dict[str, int] = {}  # Per overlay type, by subscribers that have since left
+
+    async def subscribe(self, websocket: WebSocket, room: str, overlay_type: str,
+                        last_seq: Optional[int] = None, epoch: Optional[str] = None,
+                        codec: FrameCodec = JSON_CODEC) -> OverlaySubscriber:
+        """Register an accepted overlay socket under a room/overlay topic"""
+        if overlay_type not in OVERLAY_TYPES:
+            raise ValueError(f"Unknown overlay type: {overlay_type}")
+
+        subscriber = OverlaySubscriber(websocket, room, overlay_type, self.max_queue_size, codec)
+        # The epoch tells the overlay which worker's sequence numbers follow; it is
+        # echoed back with last_seq on reconnect. Not sequenced or retained.
+        subscriber.offer(codec.encode({'type': 'epoch', 'epoch': self.state.epoch}))
+        # Catch-up frames are queued before the subscriber can see live events
+        for event in self.state.catch_up(room, overlay_type, last_seq, epoch):
+            subscriber.offer(codec.encode(event))
+        self.rooms.setdefault(room, {}).setdefault(overlay_type, set()).add(subscriber)
+        subscriber.start(on_error=self.unsubscribe)
+        logger.info(f"Overlay subscribed: {room}/{overlay_type}")
+        return subscriber
+
+    async def unsubscribe(self, subscriber: OverlaySubscriber):
+        """Remove a subscriber and stop its sender"""
+        topics = self.rooms.get(subscriber.room)
+        if topics:
+            subscribers = topics.get(subscriber.overlay_type)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del topics[subscriber.overlay_type]
+            if not topics:
+                del self.rooms[subscriber.room]
+        if subscriber.dropped:
+            # Zeroed so a second unsubscribe (send error, then disconnect) doesn't count twice
+            overlay_type = subscriber.overlay_type
+            self.retired_dropped[overlay_type] = self.retired_dropped.get(overlay_type, 0) + subscriber.dropped
+            subscriber.dropped = 0
+        await subscriber.close()
+
+    def publish(self, room: str, overlay_type: str, event: Dict[str, Any]) -> int:
+        """Encode an event once per wire format and queue it for every subscriber"""
+        self.state.record(room, overlay_type, event)
+        EVENTS_PUBLISHED.labels(overlay_type).inc()
+        subscribers = self.rooms.get(room, {}).get(overlay_type)
+        if not subscribers:
+            return 0
+        FRAMES_QUEUED.labels(overlay_type).inc(len(subscribers))
+        return self._fan_out(subscribers, event)
+
+    def _fan_out(self, subscribers: Set[OverlaySubscriber], event: Dict[str, Any]) -> int:
+        """Queue the shared encoded frames without awaiting any socket"""
+        frames: Dict[str, Frame] = {}
+        for subscriber in subscribers:
+            frame = frames.get(subscriber.codec.name)
+            if frame is None:
+                frame = frames[subscriber.codec.name] = subscriber.codec.encode(event)
+            subscriber.offer(frame)
+        return len(subscribers)
+
+    def has_subscribers(self, room: str, overlay_type: str) -> bool:
+        """Check whether anyone is listening on a topic"""
+        return bool(self.rooms.get(room, {}).get(overlay_type))
+
+    def connection_count(self) -> int:
+        """Total number of subscribed overlay sockets"""
+        return sum(
+            len(subscribers)
+            for topics in self.rooms.values()
+            for subscribers in topics.values()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection counts per overlay type"""
+        per_overlay: Dict[str, int] = {}
+        dropped = 0
+        for topics in self.rooms.values():
+            for overlay_type, subscribers in topics.items():
+                per_overlay[overlay_type] = per_overlay.get(overlay_type, 0) + len(subscribers)
+                dropped += sum(s.dropped for s in subscribers)
+        return {
+            'rooms': len(self.rooms),
+            'connections': sum(per_overlay.values()),
+            'per_overlay': per_overlay,
+            'dropped_frames': dropped
+        }
+
+    def queue_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per overlay type: frames waiting in send queues and frames dropped so far"""
+        queued: Dict[str, int] = {}
+        dropped = dict(self.retired_dropped)
+        for topics in self.rooms.values():
+            for overlay_type, subscribers in topics.items():
+                queued[overlay_type] = queued.get(overlay_type, 0) + sum(s.queue.qsize() for s in subscribers)
+                dropped[overlay_type] = dropped.get(overlay_type, 0) + sum(s.dropped for s in subscribers)
+        return {'queued': queued, 'dropped': dropped}
+
+    async def close(self):
+        """Disconnect all subscribers"""
+        for topics in list(self.rooms.values()):
+            for subscribers in list(topics.values()):
+                for subscriber in list(subscribers):
+                    await self.unsubscribe(subscriber)
+
+
+# Shared broker for the application
+broker = OverlayBroker()
@@ -0,0 +1,125 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .broker import OverlayBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATION = 300  # Seconds
+MIN_DURATION = 10
+MAX_DURATION = 5400
+ACTIONS = frozenset({'start', 'pause', 'reset'})
+
+
+def now_ms() -> int:
+    """Server wall clock in epoch milliseconds (what overlays sync their clocks to)"""
+    return int(time.time() * 1000)
+
+
+def clamp_duration(seconds: float) -> int:
+    """Duration in milliseconds, within the overlay's supported range"""
+    return int(min(max(seconds, MIN_DURATION), MAX_DURATION) * 1000)
+
+
+class Countdown:
+    """One meeting's timer: time left as of started_at, or frozen while paused"""
+    __slots__ = ('duration', 'remaining', 'started_at')
+
+    def __init__(self, duration: int):
+        self.duration = duration
+        self.remaining = duration
+        self.started_at: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None
+
+    def remaining_at(self, at: int) -> int:
+        if not self.running:
+            return self.remaining
+        return max(0, self.remaining - (at - self.started_at))
+
+    def frame(self) -> Dict[str, Any]:
+        return {
+            'type': 'countdown',
+            'status': 'running' if self.running else 'paused',
+            'duration': self.duration,
+            'remaining': self.remaining,
+            'started_at': self.started_at
+        }
+
+
+class CountdownService:
+    """
+    Server-authoritative countdown timers, one per meeting
+    1. start/pause/reset are applied at the timestamp carried by the command,
+       so every worker on the backplane arrives at the same state
+    2. Each state change is published once as start epoch + time left;
+       overlays compute the display locally against a synced clock
+    3. The latest frame is the initial state for late-joining overlays
+    """
+    def __init__(self, overlay_broker: OverlayBroker):
+        self.broker = overlay_broker
+        self.timers: Dict[str, Countdown] = {}
+
+    def command(self, action: str, duration: Optional[float] = None) -> Dict[str, Any]:
+        """Validated command stamped with the current server time"""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown countdown action: {action}")
+        command: Dict[str, Any] = {'action': action, 'at': now_ms()}
+        if duration is not None:
+            command['duration'] = clamp_duration(float(duration))
+        return command
+
+    def apply(self, room: str, command: Dict[str, Any]) -> int:
+        """Apply a start/pause/reset command and publish the new state"""
+        timer = self.timers.get(room)
+        if timer is None:
+            timer = self.timers[room] = Countdown(command.get('duration') or clamp_duration(DEFAULT_DURATION))
+        if not self._transition(timer, command):
+            return 0
+        return self.broker.publish(room, 'countdown', timer.frame())
+
+    def preview(self, room: str, command: Dict[str, Any]) -> Dict[str, Any]:
+        """State a command will produce, without applying it"""
+        current = self.timers.get(room)
+        timer = Countdown(command.get('duration') or (current.duration if current else clamp_duration(DEFAULT_DURATION)))
+        if current:
+            timer.duration, timer.remaining, timer.started_at = current.duration, current.remaining, current.started_at
+        self._transition(timer, command)
+        return timer.frame()
+
+    def _transition(self, timer: Countdown, command: Dict[str, Any]) -> bool:
+        """Update a timer in place; False if the command changes nothing"""
+        action, at = command['action'], command['at']
+        duration = command.get('duration')
+
+        if action == 'reset':
+            timer.duration = duration or timer.duration
+            timer.remaining = timer.duration
+            timer.started_at = None
+        elif action == 'start':
+            if duration:
+                timer.duration = timer.remaining = duration
+                timer.started_at = at
+            elif timer.running:
+                return False
+            else:
+                if timer.remaining <= 0:
+                    timer.remaining = timer.duration  # Starting a finished timer starts it over
+                timer.started_at = at
+        elif action == 'pause':
+            if not timer.running:
+                return False
+            timer.remaining = timer.remaining_at(at)
+            timer.started_at = None
+        return True
+
+    def state(self, room: str) -> Optional[Dict[str, Any]]:
+        timer = self.timers.get(room)
+        return timer.frame() if timer else None
+
+    def reset(self, room: str):
+        """Forget a room's timer (e.g. when the meeting ends)"""
+        self.timers.pop(room, None)
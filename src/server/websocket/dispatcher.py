@@ -0,0 +1,174 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from ...utils.logging import correlation
+from ..geo import Gazetteer, gazetteer
+from .aggregator import ReactionAggregator
+from .broker import OverlayBroker, broker
+from .countdown import CountdownService
+from .moderation import sanitize
+from .word_cloud import WordCloudAggregator
+from .world_map import HeatmapAggregator
+
+logger = logging.getLogger(__name__)
+
+# Countdown commands travel over the backplane like Zoom events, so every worker applies them in order
+COUNTDOWN_EVENT = 'vsa.countdown'
+
+
+# End-of-meeting survey answers shown on the reactions overlay
+FEEDBACK_EMOJI = {True: '\U0001F44D', False: '\U0001F44E'}
+
+
+def countdown_event(room: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    return {'event': COUNTDOWN_EVENT, 'payload': {'object': {'id': room, 'countdown': command}}}
+
+
+class EventDispatcher:
+    """
+    Routes Zoom events to overlay topics
+    1. Maps Zoom event names to overlay frames
+    2. Resolves the meeting room from the event payload
+    3. Publishes through the overlay broker
+    """
+    def __init__(self, overlay_broker: OverlayBroker, places: Gazetteer = gazetteer):
+        self.broker = overlay_broker
+        self.places = places
+        self.reactions = ReactionAggregator(overlay_broker)
+        self.words = WordCloudAggregator(overlay_broker)
+        self.heat = HeatmapAggregator(overlay_broker)
+        self.countdown = CountdownService(overlay_broker)
+        self.rosters: Dict[str, Dict[str, Dict[str, Any]]] = {}  # room -> participant id -> participant
+        overlay_broker.state.register('participants', self._roster_snapshot)
+        overlay_broker.state.register('word_cloud', lambda room: {'words': self.words.snapshot(room)})
+        overlay_broker.state.register('world_map', self.heat.snapshot)
+        self._handlers: Dict[str, Callable[[str, Dict[str, Any]], int]] = {
+            'meeting.chat_message_sent': self._on_chat_message,
+            'webinar.chat_message_sent': self._on_chat_message,
+            'meeting.participant_joined': self._on_participant_joined,
+            'webinar.participant_joined': self._on_participant_joined,
+            'meeting.participant_left': self._on_participant_left,
+            'webinar.participant_left': self._on_participant_left,
+            'meeting.registration_created': self._on_registration,
+            'webinar.registration_created': self._on_registration,
+            'meeting.participant_feedback': self._on_feedback,
+            'webinar.participant_feedback': self._on_feedback,
+            'meeting.ended': self._on_meeting_ended,
+            'webinar.ended': self._on_meeting_ended,
+            COUNTDOWN_EVENT: self._on_countdown
+        }
+
+    def dispatch(self, event: Dict[str, Any]) -> int:
+        """Publish a Zoom event to its overlays, returning the recipient count"""
+        handler = self._handlers.get(event.get('event'))
+        if not handler:
+            return 0
+
+        meeting = event.get('payload', {}).get('object', {})
+        room = self._room_for(meeting)
+        if not room:
+            logger.warning(f"Event {event.get('event')} has no meeting id")
+            return 0
+
+        with correlation(meeting=room):
+            return handler(room, meeting)
+
+    def add_reaction(self, room: str, emoji: str, name: Optional[str] = None):
+        """Reactions are coalesced into windowed batches rather than sent one by one"""
+        if self.broker.has_subscribers(room, 'reactions'):
+            self.reactions.add(room, emoji, name)
+
+    def add_location(self, room: str, location: Optional[str], country: Optional[str] = None) -> bool:
+        """Geocode once on the server and bin the result into the room's heat map"""
+        place = self.places.resolve(location.strip()) if location else None
+        if place is None and country:
+            place = self.places.country(country)
+        if place is None:
+            logger.debug(f"Unresolved location: {location} ({country})")
+            return False
+
+        # Binned even without subscribers so the snapshot is complete for late joiners
+        self.heat.add(room, place.lng, place.lat)
+        return True
+
+    def _room_for(self, meeting: Dict[str, Any]) -> Optional[str]:
+        """Overlay rooms are keyed by Zoom meeting id"""
+        meeting_id = meeting.get('id')
+        return str(meeting_id) if meeting_id else None
+
+    def _on_chat_message(self, room: str, meeting: Dict[str, Any]) -> int:
+        message = meeting.get('chat_message', {})
+        if message.get('recipient_type') != 'everyone':
+            return 0  # Direct and host-only messages never reach a public overlay
+
+        # Moderated once at ingest (moderate_event), so every worker publishes the same frame;
+        # sanitize is idempotent, so running it again keeps markup out even if an event skipped ingest
+        frame = {
+            'type': 'chat',
+            'sender': sanitize(message.get('sender_name'), 100),
+            'content': sanitize(message.get('message_content')),
+            'message_id': message.get('message_id'),
+            'timestamp': message.get('date_time')
+        }
+        if not frame['content']:
+            return 0
+
+        # Word cloud subscribers get throttled ranking diffs, not raw chat
+        self.words.add_message(room, frame['content'])
+        return self.broker.publish(room, 'chat', frame)
+
+    def _on_participant_joined(self, room: str, meeting: Dict[str, Any]) -> int:
+        participant = self._participant(meeting)
+        self.rosters.setdefault(room, {})[str(participant['id'])] = participant
+        return self.broker.publish(room, 'participants', {
+            'type': 'participant_joined',
+            'participant': participant
+        })
+
+    def _on_participant_left(self, room: str, meeting: Dict[str, Any]) -> int:
+        participant = self._participant(meeting)
+        self.rosters.get(room, {}).pop(str(participant['id']), None)
+        return self.broker.publish(room, 'participants', {
+            'type': 'participant_left',
+            'participant': participant
+        })
+
+    def _on_registration(self, room: str, meeting: Dict[str, Any]) -> int:
+        # Zoom never says where attendees join from; the registration form's city and
+        # country are the only location it sends, so the map fills in as people sign up
+        registrant = meeting.get('registrant', {})
+        self.add_location(room, registrant.get('city'), registrant.get('country'))
+        return 0
+
+    def _on_feedback(self, room: str, meeting: Dict[str, Any]) -> int:
+        # Zoom has no webhook for in-meeting emoji; end-of-meeting survey answers arrive
+        # as a burst when the show ends, so they go through the same coalescing
+        participant = meeting.get('participant', {})
+        satisfied = participant.get('feedback', {}).get('satisfied')
+        self.add_reaction(room, FEEDBACK_EMOJI[bool(satisfied)], sanitize(participant.get('user_name'), 100))
+        return 0
+
+    def _on_countdown(self, room: str, meeting: Dict[str, Any]) -> int:
+        return self.countdown.apply(room, meeting['countdown'])
+
+    def _on_meeting_ended(self, room: str, meeting: Dict[str, Any]) -> int:
+        self.countdown.reset(room)
+        self.words.reset(room)
+        self.heat.reset(room)
+        self.rosters.pop(room, None)
+        self.broker.state.reset(room)
+        return 0
+
+    def _roster_snapshot(self, room: str) -> Dict[str, Any]:
+        return {'participants': list(self.rosters.get(room, {}).values())}
+
+    def _participant(self, meeting: Dict[str, Any]) -> Dict[str, Any]:
+        participant = meeting.get('participant', {})
+        return {
+            'id': participant.get('user_id'),
+            'name': sanitize(participant.get('user_name'), 100)
+        }
+
+
+# Shared dispatcher for webhook and realtime events
+dispatcher = EventDispatcher(broker)
@@ -0,0 +1,83 @@
+import json
+import logging
+import zlib
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # Optional; overlays fall back to JSON
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[str, bytes]
+
+# Preset dictionary for the deflate encoding; the most common strings go last
+# because deflate prefers the closest match. Served to overlays at /ws/dictionary.
+DEFLATE_DICTIONARY = (
+    b'"participant":{"id":"name":},"participant_left""participant_joined"'
+    b'"type":"initial_state","overlay":"state":{"events":[],"words":[{"text":'
+    b'"type":"map_bins","cell":5.0,"bins":[[],"total":'
+    b'"type":"word_cloud_diff","set":[{"text":"weight":1.0}],"remove":[],"order":['
+    b'"type":"reaction_batch","window_ms":100,"counts":{"names":[],"total":'
+    b'{"type":"chat","sender":"content":"message_id":"timestamp":"seq":'
+)
+
+
+class FrameCodec:
+    """Encodes overlay events for one wire format"""
+    name = 'json'
+    subprotocol = 'vsa.json'
+    binary = False
+
+    def encode(self, event: Dict[str, Any]) -> Frame:
+        return json.dumps(event, separators=(',', ':'))
+
+
+class MessagePackCodec(FrameCodec):
+    name = 'msgpack'
+    subprotocol = 'vsa.msgpack'
+    binary = True
+
+    def encode(self, event: Dict[str, Any]) -> Frame:
+        return msgpack.packb(event)
+
+
+class DeflateCodec(FrameCodec):
+    """
+    Compact JSON compressed per frame with a shared preset dictionary
+    1. Each frame is compressed on its own (no context takeover), so one
+       encoding can be sent to every subscriber unlike permessage-deflate
+    2. The dictionary supplies the repeated keys small frames lack
+    """
+    name = 'deflate'
+    subprotocol = 'vsa.deflate'
+    binary = True
+
+    def __init__(self, dictionary: bytes = DEFLATE_DICTIONARY, level: int = 6):
+        self.dictionary = dictionary
+        self.level = level
+
+    def encode(self, event: Dict[str, Any]) -> Frame:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=self.dictionary)
+        data = json.dumps(event, separators=(',', ':')).encode()
+        return compressor.compress(data) + compressor.flush()
+
+
+JSON_CODEC = FrameCodec()
+
+# Subprotocol -> codec for every supported wire format; negotiate() follows the client's order
+CODECS: Dict[str, FrameCodec] = {
+    codec.subprotocol: codec
+    for codec in ([MessagePackCodec()] if msgpack else []) + [DeflateCodec(), JSON_CODEC]
+}
+
+
+def negotiate(requested: Iterable[str]) -> Optional[FrameCodec]:
+    """Pick the first subprotocol the client offered that we support"""
+    for subprotocol in requested:
+        codec = CODECS.get(subprotocol)
+        if codec:
+            return codec
+    return None
+
@@ -0,0 +1,90 @@
+import asyncio
+import itertools
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Tuple
+
+DEFAULT_MAX_SIZE = 1000
+
+# Zoom events that must reach overlays; everything else (reactions, etc.) may be shed
+CRITICAL_EVENTS = frozenset({
+    'meeting.chat_message_sent',
+    'webinar.chat_message_sent',
+    'meeting.participant_joined',
+    'webinar.participant_joined',
+    'meeting.participant_left',
+    'webinar.participant_left',
+    'meeting.ended',
+    'webinar.ended'
+})
+
+
+def is_critical_event(event: Dict[str, Any]) -> bool:
+    return event.get('event') in CRITICAL_EVENTS
+
+
+class OverflowPolicy(Enum):
+    """What a full queue does with a new event"""
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest non-critical event
+    DROP_NEWEST = "drop_newest"  # Refuse the incoming non-critical event
+    BLOCK = "block"              # Make the producer wait for space
+
+
+class EventQueue:
+    """
+    Bounded FIFO of upstream events with a shedding policy
+    1. Critical and non-critical events are kept in separate deques so
+       shedding is O(1); sequence numbers preserve arrival order
+    2. Non-critical events are dropped per the overflow policy
+    3. Critical events are never dropped; when only critical events are
+       queued the producer waits, pushing backpressure upstream
+    """
+    def __init__(self, maxsize: int = DEFAULT_MAX_SIZE, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 is_critical: Callable[[Dict[str, Any]], bool] = is_critical_event):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.is_critical = is_critical
+        self.dropped = 0
+        self._critical: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self._other: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self._order = itertools.count()
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._critical) + len(self._other)
+
+    async def put(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; returns False if it was shed"""
+        critical = self.is_critical(event)
+        async with self._changed:
+            while len(self) >= self.maxsize:
+                if self.policy is OverflowPolicy.BLOCK:
+                    await self._changed.wait()
+                elif self.policy is OverflowPolicy.DROP_NEWEST and not critical:
+                    self.dropped += 1
+                    return False
+                elif self._other:
+                    self._other.popleft()
+                    self.dropped += 1
+                elif not critical:
+                    self.dropped += 1
+                    return False
+                else:
+                    await self._changed.wait()
+
+            (self._critical if critical else self._other).append((next(self._order), event))
+            self._changed.notify_all()
+            return True
+
+    async def get(self) -> Dict[str, Any]:
+        """Oldest queued event, waiting if the queue is empty"""
+        async with self._changed:
+            while not len(self):
+                await self._changed.wait()
+
+            if not self._other or (self._critical and self._critical[0][0] < self._other[0][0]):
+                _, event = self._critical.popleft()
+            else:
+                _, event = self._other.popleft()
+            self._changed.notify_all()
+            return event
@@ -1,13 +1,39 @@
+import asyncio
+import json
 import logging
+import random
+import time
+import uuid
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from ...config.config_loader import get_environment_config
+import websockets
+
+from ...config.settings import settings
 from ...subscription.database import SubscriptionDB
-from ..token_manager import TokenManager
+from ...utils.metrics import metrics
+from ..backplane import get_backplane
+from ..metrics import realtime_handlers
+from ..token_manager import DEFAULT_CLIENT, TokenManager
+from ..token_store import TokenStore
+from .broker import broker
+from .event_queue import EventQueue, OverflowPolicy
+from .moderation import moderate_event
 
 logger = logging.getLogger(__name__)
 
+ZOOM_WS_URL = "wss://ws.zoom.us/ws"
+CLIENT_VERSION = "2.12.0"
+HEARTBEAT_INTERVAL = 20    # Seconds between heartbeats
+HEARTBEAT_TIMEOUT = 10     # Seconds to wait for a heartbeat reply
+RECONNECT_BASE = 1.0       # Backoff ceiling doubles from here...
+RECONNECT_MAX = 60.0       # ...up to this many seconds
+TOKEN_REJECTED = 4700      # Close code Zoom uses when it rejects the access token
+REALTIME_LEASE_TTL = 60.0  # Seconds an account stays claimed by a worker that stops renewing
+
+EVENTS_RECEIVED = metrics.counter('vsa_events_received_total', 'Zoom events received', ('source',))
+REALTIME_EVENTS = EVENTS_RECEIVED.labels('realtime')
+
 class ConnectionState(Enum):
     """Track WebSocket connection states"""
     DISCONNECTED = "disconnected"
@@ -19,17 +45,264 @@ class ConnectionState(Enum):
 class WebSocketHandler:
     """
     Handles WebSocket connections for overlays
-    1. Manages Zoom WebSocket connection
-    2. Handles overlay-specific events
+    1. Manages Zoom WebSocket connection (heartbeat, jittered reconnect, 4700 token refresh)
+    2. Handles overlay-specific events through a bounded event queue
     3. Maintains client connections
     """
-    def __init__(self):
-        self.config = get_environment_config()
+    def __init__(self, client_id: str = DEFAULT_CLIENT, queue_size: Optional[int] = None,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.settings = settings
         self.logger = logging.getLogger(__name__)
         self.token_manager = TokenManager()
-        self.overlay_connections = {}  # Store overlay WS connections
+        self.broker = broker
+        self.backplane = get_backplane()
+        self.overlay_connections = broker.rooms  # room -> overlay type -> subscribers
+        self.client_id = client_id
+        self.zoom_url = settings.zoom.websocket_url or ZOOM_WS_URL
         self.zoom_ws = None
+        self.state = ConnectionState.DISCONNECTED
+        self.events = EventQueue(queue_size or settings.tuning.event_queue_size, overflow_policy)
+        self.reconnects = 0
+        self.heartbeat_rtt: Optional[float] = None
+        self._heartbeat_sent: Optional[float] = None
+        self._tasks: list = []
         self._running = False
+        self._accepted = False  # The current connection has delivered a frame
         self.subscription_db = SubscriptionDB()
+        realtime_handlers.add(self)  # Queue depth, drops and RTT on /metrics
+
+    def broadcast(self, room: str, overlay_type: str, event: Dict[str, Any]) -> int:
+        """Send an overlay event to every subscribed browser source"""
+        return self.broker.publish(room, overlay_type, event)
+
+    async def start(self):
+        """Connect to Zoom and start draining events to overlays"""
+        if self._running:
+            return
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._run()),
+            asyncio.create_task(self._consume())
+        ]
+
+    async def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.zoom_ws:
+            await self.zoom_ws.close()
+        self.zoom_ws = None
+        self.state = ConnectionState.DISCONNECTED
+
+    async def _run(self):
+        """Keep one Zoom connection open, reconnecting with jittered backoff"""
+        attempt = 0
+        refreshed = False  # Refreshed after a 4700, and no connection has worked since
+        while self._running:
+            close_code = None
+            self._accepted = False
+            try:
+                token = await self.token_manager.get_valid_token(self.client_id)
+                if not token:
+                    raise ConnectionError(f"No Zoom access token for {self.client_id}")
+
+                self.state = ConnectionState.CONNECTING
+                self.zoom_ws = await websockets.connect(
+                    self.zoom_url,
+                    additional_headers={
+                        'Authorization': f"Bearer {token}",
+                        'Client-Version': CLIENT_VERSION
+                    },
+                    ping_interval=None  # Zoom expects application-level heartbeats
+                )
+                self.state = ConnectionState.CONNECTED
+                self.logger.info("Connected to Zoom WebSocket")
+                await self._receive()
+            except asyncio.CancelledError:
+                raise
+            except websockets.ConnectionClosed as e:
+                close_code = e.rcvd.code if e.rcvd else None
+                self.logger.warning(f"Zoom WebSocket closed: {e}")
+            except Exception as e:
+                self.state = ConnectionState.ERROR
+                self.logger.error(f"Zoom WebSocket error: {e}")
+            finally:
+                # Also reached when stop() cancels us mid-receive
+                ws, self.zoom_ws = self.zoom_ws, None
+                if ws:
+                    await ws.close()
+
+            if not self._running:
+                break
+            self.state = ConnectionState.RECONNECTING
+            self.reconnects += 1
+
+            if self._accepted:
+                # Zoom was sending us frames, so this is a fresh failure: start the backoff over
+                attempt = 0
+                refreshed = False
+
+            if close_code == TOKEN_REJECTED and not refreshed:
+                # Token rejected: refresh and reconnect straight away, whatever failed before
+                self.logger.warning("Zoom rejected the access token (4700); refreshing")
+                await self.token_manager.refresh_token(client_id=self.client_id)
+                refreshed = True
+                continue
+
+            # Full jitter so many instances don't reconnect in lockstep
+            delay = random.uniform(0, min(RECONNECT_MAX, RECONNECT_BASE * 2 ** attempt))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _receive(self):
+        """Read events into the queue and keep the heartbeat going"""
+        heartbeat = asyncio.create_task(self._heartbeat(self.zoom_ws))
+        try:
+            async for raw in self.zoom_ws:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    self.logger.warning(f"Skipping malformed Zoom frame: {str(raw)[:100]}")
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                self._accepted = True
+                module = message.get('module')
+                if module == 'heartbeat':
+                    if self._heartbeat_sent is not None:
+                        self.heartbeat_rtt = time.monotonic() - self._heartbeat_sent
+                        self._heartbeat_sent = None
+                    continue
+
+                content = message.get('content') if module == 'message' else message
+                try:
+                    event = json.loads(content) if isinstance(content, str) else content
+                except ValueError:
+                    self.logger.warning(f"Skipping malformed Zoom event: {content[:100]}")
+                    continue
+                if isinstance(event, dict) and event.get('event'):
+                    REALTIME_EVENTS.inc()
+                    # Waits only when the queue is full of events we must not drop
+                    await self.events.put(event)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, ws):
+        """Send heartbeats; close the socket if Zoom stops answering"""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL - HEARTBEAT_TIMEOUT)
+            self._heartbeat_sent = time.monotonic()
+            await ws.send(json.dumps({'module': 'heartbeat'}))
+            await asyncio.sleep(HEARTBEAT_TIMEOUT)
+            if self._heartbeat_sent is not None:
+                self.logger.warning("Zoom heartbeat timed out; reconnecting")
+                self._heartbeat_sent = None
+                await ws.close()
+                return
+
+    async def _consume(self):
+        """Drain queued events to the overlays on every worker"""
+        while True:
+            event = moderate_event(await self.events.get())
+            if event is None:
+                continue
+            try:
+                await self.backplane.publish(event)
+            except Exception as e:
+                self.logger.error(f"Failed to publish Zoom event {event.get('event')}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state.value,
+            'queue_depth': len(self.events),
+            'dropped_events': self.events.dropped,
+            'reconnects': self.reconnects,
+            'heartbeat_rtt': self.heartbeat_rtt
+        }
+
+
+class RealtimeConnections:
+    """
+    Zoom realtime connections, one per authorized account across all workers
+    1. Reopened at startup for every account in the token store, and started
+       by the OAuth callback for newly authorized accounts
+    2. Each account is leased to one worker through the token store; the
+       backplane delivers its events to every worker
+    3. Leases are renewed while running and released when the app stops
+    """
+    def __init__(self, store: Optional[TokenStore] = None):
+        self._store = store
+        self.owner = uuid.uuid4().hex  # This worker, as a lease holder
+        self.handlers: Dict[str, WebSocketHandler] = {}
+        self._renewer: Optional[asyncio.Task] = None
+
+    @property
+    def store(self) -> TokenStore:
+        return self._store or TokenManager().store
+
+    @staticmethod
+    def _lease(client_id: str) -> str:
+        return f"realtime:{client_id}"
+
+    async def start(self, client_id: str) -> Optional[WebSocketHandler]:
+        """Connect for an account unless another worker already does; re-authorizing keeps the connection"""
+        handler = self.handlers.get(client_id)
+        if handler is None:
+            if not await self.store.acquire_lease(self._lease(client_id), self.owner, REALTIME_LEASE_TTL):
+                logger.info(f"Realtime events for {client_id} are received by another worker")
+                return None
+            handler = self.handlers[client_id] = WebSocketHandler(client_id)
+        await handler.start()
+        if self._renewer is None or self._renewer.done():
+            self._renewer = asyncio.create_task(self._renew())
+        return handler
+
+    async def resume(self) -> int:
+        """Reconnect every account whose tokens survived a restart; returns how many this worker took"""
+        try:
+            client_ids = await self.store.client_ids()
+        except Exception as e:
+            logger.error(f"Could not list accounts to reconnect: {e}")
+            return 0
+        started = 0
+        for client_id in client_ids:
+            try:
+                if await self.start(client_id):
+                    started += 1
+            except Exception as e:
+                logger.error(f"Could not reconnect realtime events for {client_id}: {e}")
+        logger.info(f"Realtime connections resumed for {started}/{len(client_ids)} accounts")
+        return started
+
+    async def _renew(self):
+        """Keep this worker's leases; an account whose lease was lost is left to its new holder"""
+        while True:
+            await asyncio.sleep(REALTIME_LEASE_TTL / 3)
+            for client_id, handler in list(self.handlers.items()):
+                try:
+                    if await self.store.acquire_lease(self._lease(client_id), self.owner, REALTIME_LEASE_TTL):
+                        continue
+                except Exception as e:
+                    logger.error(f"Could not renew the realtime lease for {client_id}: {e}")
+                    continue
+                logger.warning(f"Realtime lease for {client_id} moved to another worker")
+                self.handlers.pop(client_id, None)
+                await handler.stop()
+
+    async def stop(self):
+        if self._renewer:
+            self._renewer.cancel()
+            self._renewer = None
+        handlers, self.handlers = dict(self.handlers), {}
+        await asyncio.gather(*(handler.stop() for handler in handlers.values()), return_exceptions=True)
+        for client_id in handlers:
+            try:
+                await self.store.release_lease(self._lease(client_id), self.owner)
+            except Exception as e:
+                logger.error(f"Could not release the realtime lease for {client_id}: {e}")
+
 
-    # ... (rest of the WebSocketHandler class methods) 
\ No newline at end of file
+# Shared registry so the OAuth callback and shutdown see the same connections
+realtime = RealtimeConnections()
@@ -0,0 +1,260 @@
+import logging
+import re
+import time
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ...utils.cache import TTLCache
+from ...utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_LENGTH = 500           # Characters kept per chat message
+MASK = '*'
+
+# Elements whose content is code, not text
+_CODE_ELEMENT = re.compile(r'<(script|style)\b[^>]*>.*?(?:</\1\s*>|$)', re.IGNORECASE | re.DOTALL)
+# Markup only: a '<' must open a tag name, comment or closing tag, so "<3" and "a < b" survive
+_TAG = re.compile(r'<[a-zA-Z/!?][^>]*>?')
+# Control characters, zero-width characters and bidi overrides that can disguise text
+_INVISIBLE = re.compile('[\x00-\x08\x0b-\x1f\x7f-\x9f\u200b-\u200f\u202a-\u202e\u2060-\u2064\u2066-\u2069\ufeff]')
+_SPACE = re.compile(r'\s+')
+
+OUTCOMES = ('passed', 'masked', 'blocked', 'rate_limited', 'duplicate')
+CHAT_EVENTS = frozenset({'meeting.chat_message_sent', 'webinar.chat_message_sent'})
+MODERATED = metrics.counter('vsa_chat_moderation_total', 'Chat messages by moderation outcome', ('outcome',))
+
+
+def sanitize(text: Any, max_length: int = MAX_LENGTH) -> str:
+    """Plain text for overlays: no markup, no invisible characters, bounded length (idempotent)"""
+    if not isinstance(text, str):
+        return ''
+    # Invisible characters go first so they can't split a tag name past the tag pattern
+    text = _INVISIBLE.sub('', text)
+    # Repeat until nothing is removed: stripping '<<b>img ...>' once leaves a live '<img ...>'
+    while True:
+        stripped = _TAG.sub('', _CODE_ELEMENT.sub('', text))
+        if stripped == text:
+            break
+        text = stripped
+    return _SPACE.sub(' ', text).strip()[:max_length].rstrip()
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    """Lowercase without accents, always one character so match offsets map back to the text"""
+    base = unicodedata.normalize('NFKD', ch)[:1] or ch
+    folded = base.lower()
+    return folded if len(folded) == 1 else ch
+
+
+def fold(text: str) -> str:
+    return ''.join(map(_fold_char, text))
+
+
+def load_terms(path: Optional[Union[str, Path]]) -> List[str]:
+    """One term per line; blank lines and # comments are skipped"""
+    if not path:
+        return []
+    try:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    except OSError as e:
+        logger.error(f"Could not read moderation terms from {path}: {e}")
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith('#')]
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over blocked and allowed terms
+    1. Built once per term list; matching is a single pass over the message,
+       so its cost follows message length, not the number of terms
+    2. Case and accents are folded, and terms only match whole words
+    3. A blocked hit inside an allowed term (e.g. a place name) is ignored
+    """
+    def __init__(self, blocklist: Iterable[str] = (), allowlist: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[int, bool], ...]] = [()]
+        self.terms = 0
+        for term in blocklist:
+            self._add(term, allowed=False)
+        for term in allowlist:
+            self._add(term, allowed=True)
+        self._link()
+
+    def _add(self, term: str, allowed: bool):
+        term = fold(_SPACE.sub(' ', term).strip())
+        if not term:
+            return
+        state = 0
+        for ch in term:
+            following = self._goto[state].get(ch)
+            if following is None:
+                following = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = following
+        self._out[state] += ((len(term), allowed),)
+        self.terms += 1
+
+    def _link(self):
+        """Failure links breadth-first; each state also reports its suffixes' terms"""
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, following in self._goto[state].items():
+                pending.append(following)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(ch, 0)
+                self._out[following] += self._out[self._fail[following]]
+
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) spans of blocked terms in text"""
+        if not self.terms:
+            return []
+        folded = fold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        blocked: List[Tuple[int, int]] = []
+        allowed: List[Tuple[int, int]] = []
+        state = 0
+        for index, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, is_allowed in out[state]:
+                start, end = index - length + 1, index + 1
+                if (start == 0 or not folded[start - 1].isalnum()) and (end == len(folded) or not folded[end].isalnum()):
+                    (allowed if is_allowed else blocked).append((start, end))
+        return [
+            (start, end) for start, end in blocked
+            if not any(a_start <= start and end <= a_end for a_start, a_end in allowed)
+        ]
+
+
+def mask(text: str, spans: List[Tuple[int, int]]) -> str:
+    chars = list(text)
+    for start, end in spans:
+        chars[start:end] = MASK * (end - start)
+    return ''.join(chars)
+
+
+class ChatModerator:
+    """
+    Server-side chat stage ahead of the overlay broadcast
+    1. Sanitizes sender and content once; overlays render plain text
+    2. Masks (or drops) blocklisted terms with a compiled TermMatcher
+    3. Token bucket per sender: `burst` messages, refilled at `rate` per second
+    4. Drops a sender's repeat of the same text within `duplicate_window`
+    """
+    def __init__(self, blocklist: Iterable[str] = (), allowlist: Iterable[str] = (), action: str = 'mask',
+                 max_length: int = MAX_LENGTH, rate: float = 1.0, burst: int = 5, duplicate_window: float = 30.0,
+                 enabled: bool = True):
+        self.matcher = TermMatcher()
+        self._terms: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        self.buckets = TTLCache(maxsize=10000)  # (room, sender) -> (tokens, last update)
+        self.recent = TTLCache(maxsize=10000)   # (room, sender, folded text) of recent messages
+        self.configure(blocklist, allowlist, action, max_length, rate, burst, duplicate_window, enabled)
+        self._outcomes = {outcome: MODERATED.labels(outcome) for outcome in OUTCOMES}
+
+    def configure(self, blocklist: Iterable[str] = (), allowlist: Iterable[str] = (), action: str = 'mask',
+                  max_length: int = MAX_LENGTH, rate: float = 1.0, burst: int = 5, duplicate_window: float = 30.0,
+                  enabled: bool = True):
+        """Apply settings; the automaton is only rebuilt when the term lists change"""
+        self.enabled = enabled
+        terms = (tuple(blocklist), tuple(allowlist))
+        if terms != self._terms:
+            self.matcher = TermMatcher(*terms)
+            self._terms = terms
+            logger.info(f"Chat moderation compiled {self.matcher.terms} terms")
+        self.action = action
+        self.max_length = max_length
+        self.rate = rate
+        self.burst = burst
+        # An idle sender's bucket is full again after burst / rate seconds, so it can expire then
+        self.buckets.ttl = burst / rate
+        self.duplicate_window = duplicate_window
+        self.recent.ttl = duplicate_window or 1.0
+
+    def review(self, room: str, sender_id: str, frame: Dict[str, Any],
+               now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Moderated chat frame, or None if the message should not be shown"""
+        if not self.enabled:
+            # Sanitizing is not optional: overlays rely on it
+            frame['content'] = sanitize(frame.get('content'), self.max_length)
+            frame['sender'] = sanitize(frame.get('sender'), 100)
+            return frame
+
+        if not self._allow(room, sender_id, time.monotonic() if now is None else now):
+            return self._outcome('rate_limited')
+
+        content = sanitize(frame.get('content'), self.max_length)
+        if not content:
+            return self._outcome('blocked')
+
+        if self.duplicate_window:
+            key = (room, sender_id, fold(content))
+            if key in self.recent:
+                return self._outcome('duplicate')
+            self.recent.set(key, True)
+
+        sender = sanitize(frame.get('sender'), 100)
+        hits = self.matcher.find(content)
+        sender_hits = self.matcher.find(sender)
+        if hits and self.action == 'drop':
+            return self._outcome('blocked')
+
+        frame['content'] = mask(content, hits) if hits else content
+        frame['sender'] = mask(sender, sender_hits) if sender_hits else sender
+        self._outcome('masked' if hits or sender_hits else 'passed')
+        return frame
+
+    def _allow(self, room: str, sender_id: str, now: float) -> bool:
+        key = (room, sender_id)
+        tokens, stamp = self.buckets.get(key) or (float(self.burst), now)
+        tokens = min(float(self.burst), tokens + (now - stamp) * self.rate)
+        if tokens < 1:
+            self.buckets.set(key, (tokens, now))
+            return False
+        self.buckets.set(key, (tokens - 1, now))
+        return True
+
+    def _outcome(self, outcome: str) -> None:
+        self._outcomes[outcome].inc()
+
+
+# Shared moderator for the events this worker ingests (webhooks and realtime)
+chat_moderator = ChatModerator()
+
+
+def moderate_event(event: Dict[str, Any], moderator: ChatModerator = chat_moderator) -> Optional[Dict[str, Any]]:
+    """
+    Moderate a Zoom chat event once, where it enters, before the backplane fans it out
+    Rate limits and duplicate windows depend on arrival time and per-process state, so
+    workers dispatching the same event must not each judge it again. Returns the event
+    with sender and content rewritten, or None if it must not be published.
+    """
+    if event.get('event') not in CHAT_EVENTS:
+        return event
+    payload = event.get('payload')
+    meeting = payload.get('object') if isinstance(payload, dict) else None
+    message = meeting.get('chat_message') if isinstance(meeting, dict) else None
+    if not isinstance(message, dict) or message.get('recipient_type') != 'everyone':
+        return event  # Private messages never reach an overlay, so they don't use up a sender's rate
+
+    sender_id = message.get('sender_session_id') or message.get('sender_email') or message.get('sender_name') or ''
+    frame = moderator.review(str(meeting.get('id') or ''), str(sender_id), {
+        'sender': message.get('sender_name'),
+        'content': message.get('message_content')
+    })
+    if frame is None:
+        return None
+    message['sender_name'] = frame['sender']
+    message['message_content'] = frame['content']
+    return event
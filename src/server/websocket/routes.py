@@ -1,8 +1,45 @@
-from fastapi import APIRouter, WebSocket
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from ...utils.logging import meeting_id as log_meeting_id
+from ..backplane import get_backplane
+from ..backplane.resp import RespError
+from ..overlay_tokens import COUNTDOWN_CONTROL, overlay_tokens
+from .broker import OVERLAY_TYPES, OverlaySubscriber, broker
+from .countdown import ACTIONS, now_ms
+from .dispatcher import countdown_event, dispatcher
+from .encoding import DEFLATE_DICTIONARY, JSON_CODEC, negotiate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+AUTH_TIMEOUT = 10  # Seconds an overlay has to send its auth frame
+MAX_CLIENT_FRAME = 256  # Bytes; overlays only send auth and clock probes
+
+
+class CountdownRequest(BaseModel):
+    duration: Optional[float] = None  # Seconds; start/reset only
+
+
+def _clock_reply(subscriber: OverlaySubscriber, message: str):
+    """Answer {"type": "clock", "t0": <client ms>} so the overlay can estimate its clock offset"""
+    if len(message) > MAX_CLIENT_FRAME:
+        return
+    try:
+        probe = json.loads(message)
+    except ValueError:
+        return
+    if isinstance(probe, dict) and probe.get('type') == 'clock':
+        # Not sequenced or retained; only this socket gets it
+        subscriber.offer(subscriber.codec.encode({'type': 'clock', 't0': probe.get('t0'), 'server_time': now_ms()}))
+
 @router.websocket("/")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -10,14 +47,128 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             data = await websocket.receive_text()
             await websocket.send_text(f"Message received: {data}")
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.error(f"WebSocket error: {e}")
     finally:
         await websocket.close()
 
+@router.websocket("/overlay/{overlay_type}")
+async def overlay_endpoint(websocket: WebSocket, overlay_type: str):
+    """Subscribe an OBS browser source to a room/overlay topic"""
+    # Wire format is negotiated via Sec-WebSocket-Protocol; no subprotocol means JSON
+    codec = negotiate(websocket.scope.get('subprotocols', []))
+    await websocket.accept(subprotocol=codec.subprotocol if codec else None)
+    if overlay_type not in OVERLAY_TYPES:
+        await websocket.close(code=1008)
+        return
+
+    subscriber = None
+    try:
+        # First frame identifies the overlay:
+        # {"type": "auth", "token": ..., "meeting_id": ...,
+        #  "last_seq": <optional, on reconnect>, "epoch": <from the previous connection's epoch frame>}
+        auth = await asyncio.wait_for(websocket.receive_json(), timeout=AUTH_TIMEOUT)
+        room = str(auth.get('meeting_id') or websocket.query_params.get('meeting') or '')
+        if auth.get('type') != 'auth' or not room:
+            await websocket.close(code=1008)
+            return
+        log_meeting_id.set(room)  # Scoped to this connection's task
+
+        # Signed token check only; no subscription lookup per connection
+        try:
+            access = overlay_tokens.verify(auth.get('token'), overlay_type)
+        except ValueError as e:
+            logger.error(f"Overlay tokens unavailable: {e}")
+            await websocket.close(code=1011)
+            return
+        if not access:
+            await websocket.close(code=4401)
+            return
+        if access['meeting_id'] != room:
+            # Valid token, but for another meeting
+            logger.warning(f"Overlay token for {access['meeting_id']} used for {room} by {access['client_id']}")
+            await websocket.close(code=4403)
+            return
+
+        last_seq, epoch = auth.get('last_seq'), auth.get('epoch')
+        subscriber = await broker.subscribe(
+            websocket, room, overlay_type,
+            last_seq=last_seq if isinstance(last_seq, int) else None,
+            epoch=epoch if isinstance(epoch, str) else None,
+            codec=codec or JSON_CODEC
+        )
+
+        # Overlays only listen (apart from clock probes); keep reading so disconnects are noticed
+        while True:
+            _clock_reply(subscriber, await websocket.receive_text())
+
+    except (WebSocketDisconnect, asyncio.TimeoutError):
+        pass
+    except Exception as e:
+        logger.error(f"Overlay WebSocket error: {e}")
+    finally:
+        if subscriber:
+            await broker.unsubscribe(subscriber)
+
+def _control_denied(authorization: str, meeting_id: str) -> Optional[JSONResponse]:
+    """Error response unless the bearer token controls this meeting's countdown"""
+    try:
+        access = overlay_tokens.verify(authorization.removeprefix('Bearer ').strip(), COUNTDOWN_CONTROL)
+    except ValueError as e:
+        logger.error(f"Overlay tokens unavailable: {e}")
+        return JSONResponse(content={'error': 'Temporarily unavailable'}, status_code=503)
+    if not access:
+        return JSONResponse(content={'error': 'Invalid or expired token'}, status_code=401)
+    if access['meeting_id'] != meeting_id:
+        logger.warning(f"Countdown control token for {access['meeting_id']} used for {meeting_id}")
+        return JSONResponse(content={'error': 'Token is for another meeting'}, status_code=403)
+    return None
+
+@router.post("/countdown/{meeting_id}/{action}")
+async def countdown_control(meeting_id: str, action: str, request: Optional[CountdownRequest] = None,
+                            authorization: str = Header(default='')):
+    """Start, pause or reset a meeting's countdown (e.g. from a Stream Deck)"""
+    denied = _control_denied(authorization, meeting_id)
+    if denied:
+        return denied
+    if action not in ACTIONS:
+        return JSONResponse(content={'error': f"Unknown action: {action}"}, status_code=404)
+
+    command = dispatcher.countdown.command(action, request.duration if request else None)
+    # The backplane applies the command in every worker, including this one
+    try:
+        await get_backplane().publish(countdown_event(meeting_id, command))
+    except (ConnectionError, RespError) as e:
+        logger.error(f"Backplane unavailable: {e}")
+        return JSONResponse(content={'error': 'Temporarily unavailable'}, status_code=503)
+    return {**dispatcher.countdown.preview(meeting_id, command), 'server_time': command['at']}
+
+@router.get("/countdown/{meeting_id}")
+async def countdown_state(meeting_id: str, authorization: str = Header(default='')):
+    """Current countdown state for a meeting"""
+    denied = _control_denied(authorization, meeting_id)
+    if denied:
+        return denied
+    state = dispatcher.countdown.state(meeting_id)
+    if state is None:
+        return JSONResponse(content={'error': 'No countdown for this meeting'}, status_code=404)
+    return {**state, 'server_time': now_ms()}
+
+@router.get("/dictionary")
+async def deflate_dictionary():
+    """Preset dictionary overlays need to inflate vsa.deflate frames"""
+    return Response(
+        content=DEFLATE_DICTIONARY,
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
+
 @router.get("/status")
 async def websocket_status():
     return JSONResponse({
         "status": "online",
-        "service": "WebSocket Server"
+        "service": "WebSocket Server",
+        "overlays": broker.stats()
     })
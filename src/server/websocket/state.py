@@ -0,0 +1,100 @@
+import logging
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Overlays whose recent frames are replayed as-is, with how many are kept per room
+REPLAY_SIZES = {
+    'chat': 50
+}
+# Overlays where only the most recent frame matters
+LATEST_ONLY = frozenset({'countdown'})
+# Anything else (participants, word_cloud, world_map) is rebuilt from a registered snapshot provider
+
+SnapshotProvider = Callable[[str], Dict[str, Any]]
+
+
+class _Topic:
+    """Sequence counter and retained frames for one room/overlay"""
+    __slots__ = ('seq', 'frames', 'latest')
+
+    def __init__(self, replay_size: int = 0):
+        self.seq = 0
+        self.frames: Optional[Deque[Dict[str, Any]]] = deque(maxlen=replay_size) if replay_size else None
+        self.latest: Optional[Dict[str, Any]] = None
+
+
+class OverlayState:
+    """
+    Bounded per-room overlay state for late joiners and reconnects
+    1. Stamps every published frame with a per-topic sequence number
+    2. Keeps a ring buffer of recent frames for list-like overlays
+    3. Builds one initial_state frame, or only the missed frames on reconnect
+    4. Sequence numbers only mean something within one epoch (this worker's
+       state since it started); a last_seq from another epoch gets initial_state
+    """
+    def __init__(self, replay_sizes: Optional[Dict[str, int]] = None):
+        self.epoch = uuid.uuid4().hex[:16]
+        self.replay_sizes = REPLAY_SIZES if replay_sizes is None else replay_sizes
+        self.topics: Dict[Tuple[str, str], _Topic] = {}
+        self.providers: Dict[str, SnapshotProvider] = {}
+
+    def register(self, overlay_type: str, provider: SnapshotProvider):
+        """Use provider(room) as the initial state of an aggregated overlay"""
+        self.providers[overlay_type] = provider
+
+    def _topic(self, room: str, overlay_type: str) -> _Topic:
+        topic = self.topics.get((room, overlay_type))
+        if topic is None:
+            topic = self.topics[(room, overlay_type)] = _Topic(self.replay_sizes.get(overlay_type, 0))
+        return topic
+
+    def record(self, room: str, overlay_type: str, event: Dict[str, Any]) -> int:
+        """Assign the event its sequence number and retain it if replayable"""
+        topic = self._topic(room, overlay_type)
+        topic.seq += 1
+        event['seq'] = topic.seq
+        if topic.frames is not None:
+            topic.frames.append(event)
+        elif overlay_type in LATEST_ONLY:
+            topic.latest = event
+        return topic.seq
+
+    def catch_up(self, room: str, overlay_type: str, last_seq: Optional[int] = None,
+                 epoch: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Frames a (re)connecting overlay needs before live events"""
+        topic = self.topics.get((room, overlay_type))
+        seq = topic.seq if topic else 0
+
+        # Each worker (and each restart) counts from its own start, so another epoch's
+        # last_seq says nothing about what the overlay has seen here
+        if epoch != self.epoch:
+            last_seq = None
+
+        if last_seq is not None and last_seq == seq:
+            return []
+
+        # Reconnect within the replay window: send only what was missed
+        frames = topic.frames if topic else None
+        if last_seq is not None and frames and 0 < last_seq < seq and frames[0]['seq'] <= last_seq + 1:
+            return [event for event in frames if event['seq'] > last_seq]
+
+        state = self._initial_state(room, overlay_type, topic)
+        if state is None:
+            return []
+        return [{'type': 'initial_state', 'overlay': overlay_type, 'seq': seq, 'state': state}]
+
+    def _initial_state(self, room: str, overlay_type: str, topic: Optional[_Topic]) -> Optional[Dict[str, Any]]:
+        if overlay_type in self.replay_sizes:
+            return {'events': list(topic.frames) if topic else []}
+        if overlay_type in LATEST_ONLY:
+            return {'event': topic.latest} if topic and topic.latest else None
+        provider = self.providers.get(overlay_type)
+        return provider(room) if provider else None
+
+    def reset(self, room: str):
+        """Forget a room's retained state (e.g. when the meeting ends)"""
+        for key in [key for key in self.topics if key[0] == room]:
+            del self.topics[key]
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from .broker import OverlayBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 50
+DEFAULT_INTERVAL = 0.5     # Seconds between word cloud pushes per room
+DEFAULT_HALF_LIFE = 300.0  # Seconds for a word's weight to halve
+MAX_TRACKED_WORDS = 5000   # Distinct words kept per room before pruning
+MIN_WORD_LENGTH = 4
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+STOPWORDS = frozenset("""
+    about above after again against also always another anyone anything around
+    because been before being below between both cannot could didnt does doesnt
+    doing done dont down during each either else even ever every from further
+    gonna good have having hello here hers herself himself into itself just
+    know like little made make many maybe more most much must myself need never
+    next okay only other ought ours ourselves over really same says should since
+    some something still such sure than thank thanks that thats their theirs
+    them themselves then there these they thing things think this those though
+    through thru today together very want wanna well were what whats when where
+    which while whom whose will with without would yeah your yours yourself
+    yourselves
+""".split())
+
+
+def tokenize(message: str) -> List[str]:
+    """Lowercase, strip punctuation, drop short words and stopwords"""
+    words = _PUNCTUATION.sub('', message.lower()).split()
+    return [word for word in words if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS]
+
+
+class WordFrequency:
+    """
+    Decaying word counts with an incrementally maintained top-K
+    1. Forward decay: new counts are scaled up instead of old ones decaying,
+       so an increment touches one entry and rankings stay comparable
+    2. The top-K set is updated per increment; only evictions rescan it
+    3. Low-weight words are pruned to bound memory
+    """
+    def __init__(self, top_k: int = DEFAULT_TOP_K, half_life: float = DEFAULT_HALF_LIFE,
+                 max_words: int = MAX_TRACKED_WORDS):
+        self.top_k = top_k
+        self.decay_rate = math.log(2) / half_life
+        self.max_words = max_words
+        self.counts: Dict[str, float] = {}
+        self.top: Dict[str, float] = {}
+        self._min_word: Optional[str] = None
+        self._landmark = time.monotonic()
+
+    def _increment(self) -> float:
+        """Weight of an event now, relative to the landmark"""
+        weight = math.exp(self.decay_rate * (time.monotonic() - self._landmark))
+        if weight > 1e6:
+            self._rescale(weight)
+            weight = 1.0
+        return weight
+
+    def _rescale(self, factor: float):
+        """Move the landmark forward; uniform scaling keeps rankings intact"""
+        self.counts = {word: count / factor for word, count in self.counts.items() if count / factor > 1e-3}
+        self.top = {word: self.counts[word] for word in self.top if word in self.counts}
+        self._landmark = time.monotonic()
+        self._refresh_min()
+
+    def _refresh_min(self):
+        self._min_word = min(self.top, key=self.top.get) if self.top else None
+
+    def add(self, words: List[str]):
+        """Count a message's words and update the top-K"""
+        weight = self._increment()
+        for word in words:
+            count = self.counts.get(word, 0.0) + weight
+            self.counts[word] = count
+
+            if word in self.top:
+                self.top[word] = count
+                if word == self._min_word:
+                    self._refresh_min()
+            elif len(self.top) < self.top_k:
+                self.top[word] = count
+                if self._min_word is None or count < self.top[self._min_word]:
+                    self._min_word = word
+            elif count > self.top[self._min_word]:
+                del self.top[self._min_word]
+                self.top[word] = count
+                self._refresh_min()
+
+        if len(self.counts) > self.max_words:
+            self._prune()
+
+    def _prune(self):
+        """Drop the lower-weighted half of words outside the top-K"""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        keep = ranked[:self.max_words // 2]
+        self.counts = dict(keep)
+        for word in self.top:
+            self.counts.setdefault(word, self.top[word])
+
+    def ranking(self) -> List[Dict[str, Any]]:
+        """Top words by weight, normalised to the heaviest word"""
+        ranked = sorted(self.top.items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return []
+        heaviest = ranked[0][1]
+        return [{'text': word, 'weight': round(count / heaviest, 2)} for word, count in ranked]
+
+
+class _RoomCloud:
+    __slots__ = ('frequency', 'sent', 'pending')
+
+    def __init__(self, frequency: WordFrequency):
+        self.frequency = frequency
+        self.sent: List[Dict[str, Any]] = []
+        self.pending = False
+
+
+class WordCloudAggregator:
+    """
+    Streaming word cloud state per room
+    1. Tokenizes chat messages once on the server
+    2. Keeps a decaying top-K per room
+    3. Pushes throttled diffs only when the ranking changes
+    """
+    def __init__(self, overlay_broker: OverlayBroker, interval: float = DEFAULT_INTERVAL,
+                 top_k: int = DEFAULT_TOP_K, half_life: float = DEFAULT_HALF_LIFE):
+        self.broker = overlay_broker
+        self.interval = interval
+        self.top_k = top_k
+        self.half_life = half_life
+        self.rooms: Dict[str, _RoomCloud] = {}
+
+    def add_message(self, room: str, message: str):
+        """Count a chat message and schedule a push"""
+        words = tokenize(message or '')
+        if not words:
+            return
+
+        cloud = self.rooms.get(room)
+        if cloud is None:
+            cloud = self.rooms[room] = _RoomCloud(WordFrequency(self.top_k, self.half_life))
+        cloud.frequency.add(words)
+
+        if not cloud.pending:
+            cloud.pending = True
+            asyncio.get_running_loop().call_later(self.interval, self.flush, room)
+
+    def flush(self, room: str) -> int:
+        """Publish the ranking diff for a room if the order changed"""
+        cloud = self.rooms.get(room)
+        if not cloud:
+            return 0
+        cloud.pending = False
+
+        ranking = cloud.frequency.ranking()
+        if [entry['text'] for entry in ranking] == [entry['text'] for entry in cloud.sent]:
+            return 0
+
+        previous = {entry['text']: entry['weight'] for entry in cloud.sent}
+        current = {entry['text'] for entry in ranking}
+        cloud.sent = ranking
+        return self.broker.publish(room, 'word_cloud', {
+            'type': 'word_cloud_diff',
+            'set': [entry for entry in ranking if previous.get(entry['text']) != entry['weight']],
+            'remove': [word for word in previous if word not in current],
+            'order': [entry['text'] for entry in ranking]
+        })
+
+    def snapshot(self, room: str) -> List[Dict[str, Any]]:
+        """Last ranking pushed for a room, so later diffs apply on top of it"""
+        cloud = self.rooms.get(room)
+        return list(cloud.sent) if cloud else []
+
+    def reset(self, room: str):
+        """Forget a room's words (e.g. when the meeting ends)"""
+        self.rooms.pop(room, None)
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from array import array
+from typing import Any, Dict, List, Set
+
+from .broker import OverlayBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CELL_SIZE = 5.0   # Degrees per grid cell (72 x 36 bins)
+DEFAULT_INTERVAL = 0.25   # Seconds between map pushes per room
+
+
+class HeatGrid:
+    """
+    Fixed-size lat/lng histogram for one room
+    1. One unsigned counter per grid cell, allocated once
+    2. Tracks which cells changed since the last push
+    """
+    __slots__ = ('cell_size', 'cols', 'rows', 'bins', 'changed', 'total', 'pending')
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = int(360 // cell_size)
+        self.rows = int(180 // cell_size)
+        self.bins = array('I', [0]) * (self.cols * self.rows)
+        self.changed: Set[int] = set()
+        self.total = 0
+        self.pending = False
+
+    def index(self, lng: float, lat: float) -> int:
+        """Row-major cell index, rows running north to south"""
+        col = min(max(int((lng + 180.0) // self.cell_size), 0), self.cols - 1)
+        row = min(max(int((90.0 - lat) // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def add(self, lng: float, lat: float, count: int = 1):
+        cell = self.index(lng, lat)
+        self.bins[cell] += count
+        self.changed.add(cell)
+        self.total += count
+
+    def take_changes(self) -> List[List[int]]:
+        """[cell, count] pairs changed since the last call"""
+        changes = [[cell, self.bins[cell]] for cell in sorted(self.changed)]
+        self.changed.clear()
+        return changes
+
+    def occupied(self) -> List[List[int]]:
+        """[cell, count] pairs for every non-empty cell"""
+        return [[cell, count] for cell, count in enumerate(self.bins) if count]
+
+
+class HeatmapAggregator:
+    """
+    Server-side world map heat per room
+    1. Bins resolved locations into a fixed lat/lng grid
+    2. Pushes only the changed cells, at most once per interval
+    3. Serves the occupied cells as a snapshot for late joiners
+    """
+    def __init__(self, overlay_broker: OverlayBroker, interval: float = DEFAULT_INTERVAL,
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        self.broker = overlay_broker
+        self.interval = interval
+        self.cell_size = cell_size
+        self.rooms: Dict[str, HeatGrid] = {}
+
+    def add(self, room: str, lng: float, lat: float):
+        """Count a location and schedule a push"""
+        grid = self.rooms.get(room)
+        if grid is None:
+            grid = self.rooms[room] = HeatGrid(self.cell_size)
+        grid.add(lng, lat)
+
+        if not grid.pending:
+            grid.pending = True
+            asyncio.get_running_loop().call_later(self.interval, self.flush, room)
+
+    def flush(self, room: str) -> int:
+        """Publish the cells that changed since the last push"""
+        grid = self.rooms.get(room)
+        if not grid:
+            return 0
+        grid.pending = False
+
+        changes = grid.take_changes()
+        if not changes:
+            return 0
+        return self.broker.publish(room, 'world_map', self._frame(grid, changes))
+
+    def snapshot(self, room: str) -> Dict[str, Any]:
+        """Every occupied cell, in the same frame shape as a push"""
+        grid = self.rooms.get(room) or HeatGrid(self.cell_size)
+        return self._frame(grid, grid.occupied())
+
+    def reset(self, room: str):
+        """Forget a room's map (e.g. when the meeting ends)"""
+        self.rooms.pop(room, None)
+
+    def _frame(self, grid: HeatGrid, bins: List[List[int]]) -> Dict[str, Any]:
+        return {
+            'type': 'map_bins',
+            'cell': grid.cell_size,
+            'bins': bins,
+            'total': grid.total
+        }
@@ -1,23 +1,43 @@
 import logging
 from typing import Any, Dict, Optional
 
-import aiohttp
+from .http_client import HTTPClient, http_client
 
 logger = logging.getLogger(__name__)
 
 class ZoomAPI:
     """Handles Zoom API interactions"""
+    base_url = "https://api.zoom.us/v2"
+
+    def __init__(self, client: HTTPClient = http_client):
+        self.http = client
+
     async def get_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Get user info from Zoom"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.zoom.us/v2/users/me",
+            async with self.http.session.get(
+                f"{self.base_url}/users/me",
+                headers={"Authorization": f"Bearer {access_token}"}
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                return None
+        except Exception as e:
+            logger.error(f"Failed to get user info: {e}")
+            return None 
+    async def get_meeting(self, access_token: str, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """Get a meeting, or a webinar with that id, from Zoom"""
+        for kind in ('meetings', 'webinars'):
+            try:
+                async with self.http.session.get(
+                    f"{self.base_url}/{kind}/{meeting_id}",
                     headers={"Authorization": f"Bearer {access_token}"}
                 ) as response:
                     if response.status == 200:
                         return await response.json()
-                    return None
-        except Exception as e:
-            logger.error(f"Failed to get user info: {e}")
-            return None 
\ No newline at end of file
+                    if response.status != 404:
+                        return None
+            except Exception as e:
+                logger.error(f"Failed to get meeting {meeting_id}: {e}")
+                return None
+        return None
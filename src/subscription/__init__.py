@@ -1,4 +1,5 @@
 from .database import SubscriptionDB
 from .manager import SubscriptionManager
+from .sweeper import SubscriptionSweeper
 
-__all__ = ['SubscriptionManager', 'SubscriptionDB']
+__all__ = ['SubscriptionManager', 'SubscriptionDB', 'SubscriptionSweeper']
@@ -1,29 +1,153 @@
 import logging
+import time
 from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ..config.settings import settings
+from ..utils.cache import TTLCache
+from ..utils.sqlite_pool import SQLitePool
+
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+
+SUBSCRIPTION_FIELDS = (
+    'plan_type', 'status', 'start_date', 'expiry_date', 'grace_period_end',
+    'last_payment_date', 'next_payment_date', 'amount', 'currency',
+    'stripe_subscription_id'
+)
+DATE_FIELDS = (
+    'start_date', 'expiry_date', 'grace_period_end', 'last_payment_date',
+    'next_payment_date', 'created_at', 'updated_at'
+)
+
+_MISSING = object()  # Cached "no subscription" marker
+
 class SubscriptionDB:
-    """Handles subscription data and validation"""
-    
+    """
+    Handles subscription data and validation
+    1. Persists the subscriptions table from migrations/ (SQLite locally)
+    2. Shares one pooled connection set per process
+    3. Serves reads through a TTL cache
+    4. Keeps an "active until" timestamp per user for one-comparison checks
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        # One instance so managers and handlers share the pool and cache
+        if cls._instance is None:
+            cls._instance = super(SubscriptionDB, cls).__new__(cls)
+        return cls._instance
+
     def __init__(self):
-        # For now, use in-memory storage
-        self._subscriptions = {}
-        
+        if not self._initialized:
+            self.db_path = settings.storage.database(settings.storage.subscription_db)
+            self.pool = SQLitePool(self.db_path)
+            self.cache = TTLCache(maxsize=10000, ttl=60.0)
+            # user_id -> expiry epoch for active subscriptions (built by the sweeper)
+            self.active_until: Dict[str, float] = {}
+            self.active_until_loaded = False
+            self._migrated = False
+            self._initialized = True
+
+    async def initialize(self):
+        """Apply pending migrations"""
+        if not self._migrated:
+            for migration in sorted(MIGRATIONS_DIR.glob('*.sql')):
+                await self.pool.apply_migration(migration.name, migration.read_text())
+            self._migrated = True
+
     async def get_subscription(self, client_id: str) -> Optional[Dict[str, Any]]:
         """Get subscription data for client"""
         try:
-            return self._subscriptions.get(client_id)
+            cached = self.cache.get(client_id, None)
+            if cached is not None:
+                return None if cached is _MISSING else cached
+
+            await self.initialize()
+            rows = await self.pool.execute(
+                'SELECT * FROM subscriptions WHERE user_id = ?', (client_id,)
+            )
+            subscription = self._to_subscription(rows[0]) if rows else None
+            self.cache.set(client_id, _MISSING if subscription is None else subscription)
+            return subscription
         except Exception as e:
             logger.error(f"Error getting subscription: {e}")
             return None
-            
+
     async def set_subscription(self, client_id: str, subscription_data: Dict[str, Any]) -> bool:
         """Set subscription data for client"""
         try:
-            self._subscriptions[client_id] = subscription_data
+            await self.initialize()
+            fields = [field for field in SUBSCRIPTION_FIELDS if field in subscription_data]
+            values = [self._to_column(subscription_data[field]) for field in fields]
+            await self.pool.run(self._upsert, client_id, fields, values)
+            self.cache.pop(client_id)
+            self._update_active_until(client_id, subscription_data)
             return True
         except Exception as e:
             logger.error(f"Error setting subscription: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def is_active(self, client_id: str) -> Optional[bool]:
+        """Check the precomputed expiry; None until the sweeper has loaded it"""
+        if not self.active_until_loaded:
+            return None
+        return self.active_until.get(client_id, 0.0) >= time.time()
+
+    def load_active_until(self, rows):
+        """Replace the active-until map from (user_id, expiry_date) rows"""
+        self.active_until = {
+            user_id: datetime.fromisoformat(expiry_date).timestamp()
+            for user_id, expiry_date in rows
+        }
+        self.active_until_loaded = True
+
+    def _update_active_until(self, client_id: str, subscription_data: Dict[str, Any]):
+        expiry_date = subscription_data.get('expiry_date')
+        if subscription_data.get('status', 'active') != 'active':
+            self.active_until.pop(client_id, None)
+        elif isinstance(expiry_date, datetime):
+            self.active_until[client_id] = expiry_date.timestamp()
+
+    def invalidate(self, client_id: Optional[str] = None):
+        """Drop cached subscriptions after out-of-band updates"""
+        if client_id is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(client_id)
+
+    async def close(self):
+        await self.pool.close()
+
+    def _upsert(self, connection, client_id: str, fields, values):
+        """Update the given fields, inserting a new row if there is none"""
+        with connection:
+            updated = connection.execute(
+                f"UPDATE subscriptions SET {''.join(f'{field} = ?, ' for field in fields)}"
+                "updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+                values + [client_id]
+            ).rowcount
+            if not updated:
+                connection.execute(
+                    f"INSERT INTO subscriptions ({', '.join(['user_id'] + fields)}) "
+                    f"VALUES ({', '.join('?' * (len(fields) + 1))})",
+                    [client_id] + values
+                )
+
+    def _to_column(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ')
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def _to_subscription(self, row) -> Dict[str, Any]:
+        subscription = dict(row)
+        for field in DATE_FIELDS:
+            if subscription.get(field):
+                subscription[field] = datetime.fromisoformat(subscription[field])
+        return subscription
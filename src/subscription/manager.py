@@ -1,9 +1,8 @@
-import datetime
 import logging
+from datetime import datetime
 from typing import Any, Dict
 
-from ..config.config_loader import get_environment_config
-from ..utils import handle_error
+from ..config.settings import settings
 from .database import SubscriptionDB
 
 logger = logging.getLogger(__name__)
@@ -16,12 +15,16 @@ class SubscriptionManager:
     3. Grace period handling
     """
     def __init__(self):
-        self.config = get_environment_config()
+        self.settings = settings
         self.subscription_db = SubscriptionDB()
 
     async def validate_access(self, user_id: str) -> Dict[str, Any]:
         """Validate user's subscription status"""
         try:
+            # Fast path: precomputed expiry from the sweeper
+            if self.subscription_db.is_active(user_id):
+                return {'status': 'active'}
+
             subscription = await self.subscription_db.get_subscription(user_id)
             
             if not subscription:
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from .database import SubscriptionDB
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60  # Seconds between sweeps
+
+# Set-based status transitions; each filters on the indexed status column first
+_TRANSITIONS = {
+    'renewed': (
+        "UPDATE subscriptions SET status = 'active', updated_at = CURRENT_TIMESTAMP "
+        "WHERE status IN ('grace_period', 'expired') AND expiry_date >= :now"
+    ),
+    'grace_period': (
+        "UPDATE subscriptions SET status = 'grace_period', updated_at = CURRENT_TIMESTAMP "
+        "WHERE status = 'active' AND expiry_date < :now AND grace_period_end >= :now"
+    ),
+    'expired': (
+        "UPDATE subscriptions SET status = 'expired', updated_at = CURRENT_TIMESTAMP "
+        "WHERE status IN ('active', 'grace_period') AND grace_period_end < :now"
+    )
+}
+
+
+class SubscriptionSweeper:
+    """
+    Periodic bulk subscription status maintenance
+    1. Moves subscriptions between active / grace_period / expired in bulk
+    2. Rebuilds the in-memory "active until" map used by access checks
+    3. Clears cached subscription rows whose status may have changed
+    """
+    def __init__(self, subscription_db: Optional[SubscriptionDB] = None, interval: float = DEFAULT_INTERVAL):
+        self.subscription_db = subscription_db or SubscriptionDB()
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> Dict[str, int]:
+        """Run all status transitions and refresh the active-until map"""
+        db = self.subscription_db
+        await db.initialize()
+        now = datetime.now().isoformat(sep=' ')
+
+        def _sweep(connection):
+            counts = {}
+            with connection:
+                for status, sql in _TRANSITIONS.items():
+                    counts[status] = connection.execute(sql, {'now': now}).rowcount
+            rows = connection.execute(
+                "SELECT user_id, expiry_date FROM subscriptions WHERE status = 'active'"
+            ).fetchall()
+            return counts, rows
+
+        counts, rows = await db.pool.run(_sweep)
+        db.load_active_until(rows)
+        if any(counts.values()):
+            db.invalidate()
+            logger.info(f"Subscription sweep: {counts}")
+        return counts
+
+    async def start(self):
+        """Sweep now, then keep sweeping in the background"""
+        await self.sweep()
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.sweep()
+                except Exception as e:
+                    logger.error(f"Subscription sweep failed: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
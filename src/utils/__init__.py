@@ -1,3 +1,5 @@
+from .cache import TTLCache
 from .error_handler import handle_error
+from .sqlite_pool import SQLitePool
 
-__all__ = ['handle_error']
+__all__ = ['handle_error', 'TTLCache', 'SQLitePool']
@@ -1,23 +1,214 @@
+import atexit
+import json
 import logging
-from typing import Optional
+import logging.handlers
+import queue
+import re
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, TextIO
 
-from flask import Flask
+# Correlation ids of the request/task that is logging (set by middleware and routes)
+request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+meeting_id: ContextVar[Optional[str]] = ContextVar('meeting_id', default=None)
 
+REDACTED = '[REDACTED]'
+# `extra=` fields whose values are never written
+_SECRET_KEY = re.compile(r"(?i)(token|secret|password|authorization|_key)$")
+# key=value / "key": "value" pairs, OAuth codes in URLs, bearer/basic credentials and bare JWTs
+_SECRET_PATTERNS = (
+    (re.compile(r"(?i)(\b(?:[\w-]*token|[\w-]*secret|[\w-]*_key|password|authorization)['\"]?\s*[:=]\s*['\"]?)"
+                r"(?:(?:Bearer|Basic)\s+)?[^\s'\",&}]+"), rf"\1{REDACTED}"),
+    (re.compile(r"([?&]code=)[^&\s'\"]+"), rf"\1{REDACTED}"),
+    (re.compile(r"(?i)\b(Bearer|Basic)\s+[\w.~+/=-]+"), rf"\1 {REDACTED}"),
+    (re.compile(r"\beyJ[\w-]+\.[\w-]+\.[\w-]+"), REDACTED)
+)
 
-def setup_logging(app: Optional[Flask] = None, level: str = 'INFO') -> None:
+# Attributes every LogRecord has (plus uvicorn's ANSI copy of the message); anything else came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'color_message'}
+
+
+def redact(text: str) -> str:
+    """Mask credentials in a log message"""
+    for pattern, replacement in _SECRET_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+@contextmanager
+def correlation(request: Optional[str] = None, meeting: Optional[str] = None) -> Iterator[None]:
+    """Tag every record logged inside the block (and tasks it starts) with these ids"""
+    tokens = []
+    if request is not None:
+        tokens.append((request_id, request_id.set(request)))
+    if meeting is not None:
+        tokens.append((meeting_id, meeting_id.set(str(meeting))))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class CorrelationFilter(logging.Filter):
+    """Copy the current correlation ids onto the record before it leaves the task"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        record.meeting_id = meeting_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps 1 in N DEBUG/INFO records for configured high-frequency loggers
+    Warnings and errors are never sampled; a logger's rate also applies
+    to its children unless they have their own
+    """
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.rates: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self._resolved: Dict[str, int] = {}
+        self.configure(rates or {})
+
+    def configure(self, rates: Dict[str, int]):
+        self.rates = {name: int(rate) for name, rate in rates.items() if int(rate) > 1}
+        self._resolved = {}
+
+    def _rate(self, name: str) -> int:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, prefix = 1, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate == 1:
+            return True
+        count = self._counts.get(record.name, 0)
+        self._counts[record.name] = count + 1
+        if count % rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, correlation ids and extras"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': redact(record.getMessage())
+        }
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRS or value is None:
+                continue
+            if _SECRET_KEY.search(key):
+                value = REDACTED
+            elif isinstance(value, str):
+                value = redact(value)
+            entry[key] = value
+        if record.exc_info:
+            entry['exc'] = redact(self.formatException(record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development, redacted like the JSON output"""
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s', '%Y-%m-%d %H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = redact(super().format(record))
+        ids = ' '.join(f"{key}={getattr(record, key)}" for key in ('request_id', 'meeting_id')
+                       if getattr(record, key, None))
+        return f"{text} [{ids}]" if ids else text
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting (and tracebacks) to the listener thread"""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            # Bind lazy %-args now; the objects may change before the listener runs
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
+class LogPipeline:
+    """
+    Structured logging that keeps I/O off the event loop
+    1. Loggers only enqueue records; a QueueListener thread formats and writes them
+    2. Records carry the request/meeting correlation ids of the task that logged them
+    3. High-frequency loggers can be sampled; warnings and errors are always kept
+    4. Credentials are redacted before anything is written
+    """
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.sampler = SamplingFilter()
+        self.handler: Optional[logging.Handler] = None
+        self.output: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self, level: str = 'INFO', json_format: bool = True,
+              sample_rates: Optional[Dict[str, int]] = None, stream: Optional[TextIO] = None):
+        """Route the root logger through the queue (replacing any existing handlers)"""
+        self.stop()
+        self.output = logging.StreamHandler(stream or sys.stderr)
+        self.output.setFormatter(JSONFormatter() if json_format else TextFormatter())
+
+        self.handler = _EnqueueHandler(self.queue)
+        self.handler.addFilter(self.sampler)
+        self.handler.addFilter(CorrelationFilter())
+        self.sampler.configure(sample_rates or {})
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level)
+
+        self.listener = logging.handlers.QueueListener(self.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def configure(self, level: Optional[str] = None, json_format: Optional[bool] = None,
+                  sample_rates: Optional[Dict[str, int]] = None):
+        """Change the level, format or sampling of a running pipeline (e.g. on settings reload)"""
+        if level:
+            logging.getLogger().setLevel(level)
+        if json_format is not None and self.output:
+            self.output.setFormatter(JSONFormatter() if json_format else TextFormatter())
+        if sample_rates is not None:
+            self.sampler.configure(sample_rates)
+
+    def stop(self):
+        """Flush queued records and detach from the root logger"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        if self.handler:
+            logging.getLogger().removeHandler(self.handler)
+            self.handler = None
+
+
+# Shared pipeline for the process
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.stop)
+
+
+def setup_logging(level: str = 'INFO', json_format: bool = True,
+                  sample_rates: Optional[Dict[str, int]] = None, stream: Optional[TextIO] = None) -> LogPipeline:
     """Configure logging for the application"""
-    # Set up basic configuration
-    logging.basicConfig(
-        level=getattr(logging, level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
-    if app:
-        # Add Flask handlers if app is provided
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter(
-            '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-        ))
-        app.logger.addHandler(handler)
-        app.logger.setLevel(getattr(logging, level))
+    log_pipeline.start(level, json_format, sample_rates, stream)
+    return log_pipeline
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import re
+import sqlite3
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Postgres-only syntax used by the .sql migrations, and its SQLite form
+_DIALECT = [
+    (re.compile(r'\bSERIAL\s+PRIMARY\s+KEY\b', re.IGNORECASE), 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    (re.compile(r'\bDOUBLE\s+PRECISION\b', re.IGNORECASE), 'REAL')
+]
+
+
+def to_sqlite(script: str) -> str:
+    """Translate a Postgres migration to SQLite"""
+    for pattern, replacement in _DIALECT:
+        script = pattern.sub(replacement, script)
+    return script
+
+
+class SQLitePool:
+    """
+    Small pool of SQLite connections used from async code
+    1. Each query runs on a worker thread so the event loop never blocks
+    2. A connection is only used by one thread at a time
+    3. WAL mode lets readers run alongside a writer
+    """
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        # Every ':memory:' connection is a separate database
+        self.size = 1 if path == ':memory:' else size
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    async def _acquire(self) -> sqlite3.Connection:
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(self.size):
+                connection = await asyncio.to_thread(self._connect)
+                self._connections.append(connection)
+                self._pool.put_nowait(connection)
+        return await self._pool.get()
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run func(connection, *args) on a worker thread"""
+        connection = await self._acquire()
+        try:
+            return await asyncio.to_thread(func, connection, *args)
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def execute(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        """Execute one statement, commit, and return any rows"""
+        def _execute(connection):
+            with connection:
+                return connection.execute(sql, tuple(params)).fetchall()
+        return await self.run(_execute)
+
+    async def executemany(self, sql: str, rows: Iterable[Iterable]) -> int:
+        """Execute a statement for many parameter rows in one transaction"""
+        def _executemany(connection):
+            with connection:
+                return connection.executemany(sql, rows).rowcount
+        return await self.run(_executemany)
+
+    async def executescript(self, script: str):
+        """Run a multi-statement script such as a migration"""
+        def _executescript(connection):
+            connection.executescript(script)
+            connection.commit()
+        await self.run(_executescript)
+
+    async def apply_migration(self, name: str, script: str) -> bool:
+        """Apply a migration once, recording it in schema_migrations"""
+        def _apply(connection):
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS schema_migrations ('
+                    'name TEXT PRIMARY KEY, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
+                )
+                applied = connection.execute(
+                    'SELECT 1 FROM schema_migrations WHERE name = ?', (name,)
+                ).fetchone()
+            if applied:
+                return False
+            connection.executescript(to_sqlite(script))
+            with connection:
+                connection.execute('INSERT INTO schema_migrations (name) VALUES (?)', (name,))
+            return True
+
+        applied = await self.run(_apply)
+        if applied:
+            logger.info(f"Applied migration {name} to {self.path}")
+        return applied
+
+    async def close(self):
+        """Close every pooled connection"""
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._pool = None
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import Settings, settings  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def configure():
+    """Replace the shared settings for one test: configure(security={'secret_token': 's'})"""
+    previous = settings._settings
+
+    def apply(**sections) -> Settings:
+        settings._settings = Settings(**sections)
+        return settings._settings
+
+    yield apply
+    settings._settings = previous
+
+
+@pytest.fixture
+async def stub_server():
+    """Serve aiohttp apps on localhost for one test: base_url = await stub_server(app)"""
+    runners = []
+
+    async def start(app: web.Application) -> str:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.fixture
+async def subscription_db(tmp_path, configure):
+    """A fresh SubscriptionDB singleton on an empty database in tmp_path"""
+    from src.subscription.database import SubscriptionDB
+
+    configure(storage={'data_dir': str(tmp_path)})
+    SubscriptionDB._instance = None
+    db = SubscriptionDB()
+    yield db
+    await db.close()
+    SubscriptionDB._instance = None
@@ -0,0 +1,24 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from src.server.oauth_server import create_app
+from src.utils.logging import log_pipeline
+
+
+def test_logging_starts_with_the_lifespan_not_at_import(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+
+    app = create_app()
+    assert log_pipeline.listener is None
+    assert root.handlers == handlers
+
+    with TestClient(app) as client:
+        assert log_pipeline.listener is not None
+        assert log_pipeline.handler in root.handlers
+        assert client.get('/health').status_code == 200
+
+    assert log_pipeline.listener is None
+    assert log_pipeline.handler is None
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.server.backplane import Backplane, InProcessBackplane, RespBackplane, RespHub
+from src.server.backplane import resp as resp_module
+from src.server.backplane.resp import RespError, encode_command, read_reply
+
+
+async def parse(data: bytes):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await read_reply(reader)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('data, value', [
+    (b'+OK\r\n', 'OK'),
+    (b':42\r\n', 42),
+    (b'$5\r\nhe\r\no\r\n', b'he\r\no'),
+    (b'$-1\r\n', None),
+    (b'*-1\r\n', None),
+    (b'*3\r\n$7\r\nmessage\r\n$1\r\nc\r\n*1\r\n:-1\r\n', [b'message', b'c', [-1]]),
+])
+async def test_read_reply(data, value):
+    assert await parse(data) == value
+
+
+@pytest.mark.anyio
+async def test_read_reply_errors():
+    with pytest.raises(RespError, match='ERR readonly'):
+        await parse(b'-ERR readonly\r\n')
+    with pytest.raises(RespError):
+        await parse(b'?what\r\n')
+    with pytest.raises(ConnectionError):
+        await parse(b'')
+    with pytest.raises(asyncio.IncompleteReadError):
+        await parse(b'$10\r\nshort\r\n')
+
+
+@pytest.mark.anyio
+async def test_commands_round_trip():
+    assert await parse(encode_command('PUBLISH', 'vsa', b'{"a":1}')) == [b'PUBLISH', b'vsa', b'{"a":1}']
+
+
+def test_backplanes_must_implement_publish():
+    class Incomplete(Backplane):
+        pass
+
+    with pytest.raises(TypeError):
+        Backplane()
+    with pytest.raises(TypeError):
+        Incomplete()
+    InProcessBackplane()
+
+
+@pytest.fixture
+async def hub():
+    hub = RespHub(port=0)
+    await hub.start()
+    hub.url = f"redis://127.0.0.1:{hub._server.sockets[0].getsockname()[1]}"
+    yield hub
+    await hub.close()
+
+
+@pytest.mark.anyio
+async def test_every_worker_sees_one_order(hub):
+    received = {0: [], 1: []}
+    workers = [RespBackplane(hub.url), RespBackplane(hub.url)]
+    for index, worker in enumerate(workers):
+        await worker.start(lambda event, index=index: received[index].append(event['n']))
+
+    counts = await asyncio.gather(*[workers[n % 2].publish({'n': n}) for n in range(200)])
+    for _ in range(100):
+        if len(received[0]) == len(received[1]) == 200:
+            break
+        await asyncio.sleep(0.01)
+
+    assert set(counts) == {2}
+    assert received[0] == received[1]
+    assert sorted(received[0]) == list(range(200))
+    for worker in workers:
+        await worker.close()
+
+
+@pytest.mark.anyio
+async def test_stalled_subscriber_is_dropped(hub, monkeypatch):
+    monkeypatch.setattr(resp_module, 'DRAIN_TIMEOUT', 0.2)
+    # Subscribes, then never reads again
+    host, port = hub._server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_command('SUBSCRIBE', resp_module.CHANNEL))
+    await read_reply(reader)
+
+    publisher = RespBackplane(hub.url)
+    payload = {'blob': 'x' * 100_000}
+    counts = await asyncio.wait_for(asyncio.gather(*[publisher.publish(payload) for _ in range(300)]), timeout=5)
+
+    assert counts[0] == 1
+    assert counts[-1] == 0
+    assert hub.channels[resp_module.CHANNEL.encode()] == set()
+    await publisher.close()
+    writer.close()
@@ -0,0 +1,111 @@
+import pytest
+
+from src.server.websocket import countdown
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.countdown import DEFAULT_DURATION, MAX_DURATION, MIN_DURATION, CountdownService
+
+ROOM = '434343'
+
+
+@pytest.fixture
+def service():
+    return CountdownService(OverlayBroker())
+
+
+def cmd(action, at, duration=None):
+    command = {'action': action, 'at': at}
+    if duration is not None:
+        command['duration'] = duration * 1000
+    return command
+
+
+def published(service):
+    """Latest countdown frame the broker holds for late joiners"""
+    frames = service.broker.state.catch_up(ROOM, 'countdown')
+    return frames[0]['state']['event'] if frames else None
+
+
+def test_start_uses_the_default_duration(service):
+    service.apply(ROOM, cmd('start', 1000))
+    assert service.state(ROOM) == {
+        'type': 'countdown', 'status': 'running', 'duration': DEFAULT_DURATION * 1000,
+        'remaining': DEFAULT_DURATION * 1000, 'started_at': 1000
+    }
+    assert published(service)['status'] == 'running'
+
+
+def test_pause_freezes_and_start_resumes(service):
+    service.apply(ROOM, cmd('start', 0, 60))
+    service.apply(ROOM, cmd('pause', 15_000))
+    assert (service.state(ROOM)['status'], service.state(ROOM)['remaining']) == ('paused', 45_000)
+
+    service.apply(ROOM, cmd('start', 100_000))
+    assert service.state(ROOM)['remaining'] == 45_000
+    assert service.state(ROOM)['started_at'] == 100_000
+
+
+def test_commands_that_change_nothing_are_not_published(service):
+    assert service.apply(ROOM, cmd('pause', 0)) == 0
+    service.apply(ROOM, cmd('start', 0, 60))
+    seq = published(service)['seq']
+
+    service.apply(ROOM, cmd('start', 5000))   # Already running
+    service.apply(ROOM, cmd('pause', 6000))
+    service.apply(ROOM, cmd('pause', 7000))   # Already paused
+    assert published(service)['seq'] == seq + 1
+
+
+def test_start_with_a_duration_restarts_a_running_timer(service):
+    service.apply(ROOM, cmd('start', 0, 60))
+    service.apply(ROOM, cmd('start', 10_000, 120))
+    assert service.state(ROOM)['remaining'] == 120_000
+    assert service.state(ROOM)['started_at'] == 10_000
+
+
+def test_reset_with_and_without_a_duration(service):
+    service.apply(ROOM, cmd('start', 0, 60))
+    service.apply(ROOM, cmd('reset', 30_000))
+    state = service.state(ROOM)
+    assert (state['status'], state['duration'], state['remaining']) == ('paused', 60_000, 60_000)
+
+    service.apply(ROOM, cmd('reset', 31_000, 90))
+    state = service.state(ROOM)
+    assert (state['duration'], state['remaining']) == (90_000, 90_000)
+
+
+def test_an_expired_timer_starts_over(service):
+    service.apply(ROOM, cmd('start', 0, 60))
+    service.apply(ROOM, cmd('pause', 75_000))  # Paused after it ran out
+    assert service.state(ROOM)['remaining'] == 0
+
+    service.apply(ROOM, cmd('start', 80_000))
+    assert (service.state(ROOM)['remaining'], service.state(ROOM)['started_at']) == (60_000, 80_000)
+
+
+def test_commands_are_validated_and_clamped(service, monkeypatch):
+    monkeypatch.setattr(countdown, 'now_ms', lambda: 42)
+    assert service.command('start', 1) == {'action': 'start', 'at': 42, 'duration': MIN_DURATION * 1000}
+    assert service.command('reset', 10 ** 6)['duration'] == MAX_DURATION * 1000
+    assert service.command('pause') == {'action': 'pause', 'at': 42}
+    with pytest.raises(ValueError):
+        service.command('explode')
+
+
+def test_preview_does_not_change_the_timer(service):
+    assert service.preview(ROOM, cmd('start', 0))['duration'] == DEFAULT_DURATION * 1000
+    assert service.state(ROOM) is None
+
+    service.apply(ROOM, cmd('start', 0, 60))
+    preview = service.preview(ROOM, cmd('pause', 20_000))
+    assert (preview['status'], preview['remaining']) == ('paused', 40_000)
+    assert service.state(ROOM)['status'] == 'running'
+    assert service.preview(ROOM, cmd('reset', 20_000, 30))['remaining'] == 30_000
+    assert service.state(ROOM)['duration'] == 60_000
+
+
+def test_rooms_are_independent(service):
+    service.apply(ROOM, cmd('start', 0, 60))
+    service.apply('other', cmd('start', 0, 120))
+    service.reset(ROOM)
+    assert service.state(ROOM) is None
+    assert service.state('other')['duration'] == 120_000
@@ -0,0 +1,60 @@
+import pytest
+
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.dispatcher import EventDispatcher
+
+ROOM = '434343'
+
+
+@pytest.fixture
+def dispatcher():
+    return EventDispatcher(OverlayBroker())
+
+
+def chat(content, recipient_type='everyone', sender='session-1'):
+    return {
+        'event': 'meeting.chat_message_sent',
+        'payload': {'object': {'id': int(ROOM), 'chat_message': {
+            'sender_session_id': sender,
+            'sender_name': 'Ada',
+            'recipient_type': recipient_type,
+            'message_id': content,
+            'message_content': content
+        }}}
+    }
+
+
+def participant(event, user_id, name='Ada'):
+    return {
+        'event': f"meeting.participant_{event}",
+        'payload': {'object': {'id': int(ROOM), 'participant': {'user_id': user_id, 'user_name': name}}}
+    }
+
+
+def replayed(dispatcher, overlay_type):
+    (frame,) = dispatcher.broker.state.catch_up(ROOM, overlay_type)
+    return frame['state']
+
+
+@pytest.mark.anyio
+async def test_only_chat_to_everyone_is_published(dispatcher):
+    dispatcher.dispatch(chat('hello all'))
+    for recipient_type in ('host', 'guest', 'group', None):
+        dispatcher.dispatch(chat('private', recipient_type))
+
+    assert [frame['content'] for frame in replayed(dispatcher, 'chat')['events']] == ['hello all']
+
+
+def test_participants_snapshot_tracks_the_roster(dispatcher):
+    dispatcher.dispatch(participant('joined', '1', 'Ada'))
+    dispatcher.dispatch(participant('joined', '2', '<b>Grace</b>'))
+    dispatcher.dispatch(participant('left', '1'))
+
+    assert replayed(dispatcher, 'participants') == {'participants': [{'id': '2', 'name': 'Grace'}]}
+
+
+def test_meeting_end_clears_the_roster(dispatcher):
+    dispatcher.dispatch(participant('joined', '1'))
+    dispatcher.dispatch({'event': 'meeting.ended', 'payload': {'object': {'id': int(ROOM)}}})
+
+    assert replayed(dispatcher, 'participants') == {'participants': []}
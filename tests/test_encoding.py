@@ -0,0 +1,63 @@
+import json
+import shutil
+import subprocess
+import zlib
+from pathlib import Path
+
+import pytest
+
+from src.server.websocket.encoding import CODECS, DEFLATE_DICTIONARY, JSON_CODEC, DeflateCodec, negotiate
+
+DECODERS = Path(__file__).resolve().parent.parent / 'src' / 'frontend' / 'overlays' / 'shared' / 'decoders.js'
+
+FRAMES = [
+    {'type': 'chat', 'sender': 'Ada', 'content': 'héllo 👋 ' * 40, 'message_id': 'm1', 'timestamp': None, 'seq': 7},
+    {'type': 'participant_joined', 'participant': {'id': '12', 'name': 'Grace'}, 'seq': 2 ** 33},
+    {'type': 'map_bins', 'cell': 5.0, 'bins': [[i, -i, i * 0.5] for i in range(300)], 'total': -1},
+    {'type': 'word_cloud_diff', 'set': [], 'remove': ['x' * 70000], 'order': [True, False]},
+    {'type': 'reaction_batch', 'window_ms': 100, 'counts': {str(i): i for i in range(20)}, 'total': 65536},
+]
+
+# Decodes each hex-encoded frame with decoders.js and prints the results as JSON
+NODE_SCRIPT = """
+const decoders = require(process.argv[1]);
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const bytes = (hex) => Uint8Array.from(Buffer.from(hex, 'hex'));
+const dictionary = bytes(input.dictionary);
+console.log(JSON.stringify({
+    msgpack: input.msgpack.map((hex) => decoders.msgpack(bytes(hex))),
+    deflate: input.deflate.map((hex) => JSON.parse(decoders.inflateText(bytes(hex), dictionary)))
+}));
+"""
+
+
+def test_negotiate_prefers_client_order():
+    assert negotiate(['vsa.deflate', 'vsa.json']).name == 'deflate'
+    assert negotiate(['unknown', 'vsa.json']) is JSON_CODEC
+    assert negotiate(['unknown']) is None
+
+
+def test_deflate_round_trip_needs_the_dictionary():
+    frame = DeflateCodec().encode(FRAMES[0])
+    inflater = zlib.decompressobj(-15, zdict=DEFLATE_DICTIONARY)
+    assert json.loads(inflater.decompress(frame) + inflater.flush()) == FRAMES[0]
+    with pytest.raises(zlib.error):
+        zlib.decompress(DeflateCodec().encode(FRAMES[1]), -15)
+
+
+@pytest.mark.skipif(not shutil.which('node') or 'vsa.msgpack' not in CODECS, reason='needs node and msgpack')
+def test_browser_decoders_read_server_frames():
+    # Stored, fixed and dynamic deflate blocks all occur across these levels and frames
+    deflate = [DeflateCodec(level=level).encode(frame) for level in (0, 1, 9) for frame in FRAMES]
+    payload = {
+        'dictionary': DEFLATE_DICTIONARY.hex(),
+        'msgpack': [CODECS['vsa.msgpack'].encode(frame).hex() for frame in FRAMES],
+        'deflate': [frame.hex() for frame in deflate]
+    }
+    result = subprocess.run(
+        ['node', '-e', NODE_SCRIPT, str(DECODERS)],
+        input=json.dumps(payload), capture_output=True, text=True, check=True
+    )
+    decoded = json.loads(result.stdout)
+    assert decoded['msgpack'] == FRAMES
+    assert decoded['deflate'] == FRAMES * 3
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.server.http_client import HTTPClient
+from src.server.zoom_api import ZoomAPI
+
+
+def users_api(peers):
+    """Stub of GET /users/me that records which client connection each request came on"""
+    async def me(request):
+        peers.append(request.transport.get_extra_info('peername'))
+        return web.json_response({'id': 'user-1'})
+
+    app = web.Application()
+    app.router.add_get('/users/me', me)
+    return app
+
+
+@pytest.mark.anyio
+async def test_sequential_calls_reuse_one_connection(stub_server):
+    peers = []
+    client = HTTPClient()
+    api = ZoomAPI(client)
+    api.base_url = await stub_server(users_api(peers))
+
+    for _ in range(10):
+        assert await api.get_user_info('token') == {'id': 'user-1'}
+    await client.close()
+
+    assert len(peers) == 10
+    assert len(set(peers)) == 1
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_are_capped_per_host(stub_server):
+    peers = []
+    client = HTTPClient(limit_per_host=3)
+    api = ZoomAPI(client)
+    api.base_url = await stub_server(users_api(peers))
+
+    await asyncio.gather(*[api.get_user_info('token') for _ in range(30)])
+    await client.close()
+
+    assert len(peers) == 30
+    assert len(set(peers)) <= 3
+
+
+@pytest.mark.anyio
+async def test_session_is_recreated_after_close():
+    client = HTTPClient()
+    first = client.session
+    await client.close()
+    assert first.closed
+    assert client.session is not first
+    await client.close()
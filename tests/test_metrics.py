@@ -0,0 +1,62 @@
+import pytest
+
+from src.utils.metrics import MetricsRegistry, _Metric
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_metric_families_must_define_children():
+    class Incomplete(_Metric):
+        kind = 'gauge'
+
+    with pytest.raises(TypeError):
+        Incomplete('vsa_incomplete', 'Never constructed')
+
+
+def test_counters_and_gauges_render(registry):
+    registry.counter('vsa_events_total', 'Events', ('source',)).labels('web"hook').inc(3)
+    gauge = registry.gauge('vsa_depth', 'Depth')
+    gauge.set(5)
+    gauge.dec(0.5)
+
+    assert registry.render().splitlines() == [
+        '# HELP vsa_events_total Events',
+        '# TYPE vsa_events_total counter',
+        'vsa_events_total{source="web\\"hook"} 3',
+        '# HELP vsa_depth Depth',
+        '# TYPE vsa_depth gauge',
+        'vsa_depth 4.5',
+    ]
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram('vsa_seconds', 'Latency', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert registry.render().splitlines()[2:] == [
+        'vsa_seconds_bucket{le="0.1"} 1',
+        'vsa_seconds_bucket{le="1"} 3',
+        'vsa_seconds_bucket{le="+Inf"} 4',
+        'vsa_seconds_sum 4.05',
+        'vsa_seconds_count 4',
+    ]
+
+
+def test_registration_is_get_or_create(registry):
+    counter = registry.counter('vsa_total', 'Total', ('op',))
+    assert registry.counter('vsa_total', 'Total', ('op',)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge('vsa_total', 'Total')
+    with pytest.raises(ValueError):
+        counter.labels('a', 'b')
+
+
+def test_broken_callbacks_do_not_break_the_scrape(registry):
+    registry.collect('gauge', 'vsa_broken', 'Broken', lambda: 1 / 0)
+    registry.collect('gauge', 'vsa_rooms', 'Rooms', lambda: {('chat',): 2}, ('overlay',))
+
+    assert registry.render().splitlines()[-1] == 'vsa_rooms{overlay="chat"} 2'
@@ -0,0 +1,122 @@
+import pytest
+
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.dispatcher import EventDispatcher
+from src.server.websocket.moderation import ChatModerator, TermMatcher, mask, moderate_event, sanitize
+
+ROOM = '434343'
+
+
+def chat(content, sender='session-1', recipient_type='everyone', name='Ada'):
+    return {
+        'event': 'meeting.chat_message_sent',
+        'payload': {'object': {'id': int(ROOM), 'chat_message': {
+            'sender_session_id': sender,
+            'sender_name': name,
+            'recipient_type': recipient_type,
+            'message_id': content,
+            'message_content': content
+        }}}
+    }
+
+
+def content(event):
+    return event['payload']['object']['chat_message']['message_content']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('<b>hi</b> there', 'hi there'),
+    ('<script>alert(1)</script>hello', 'hello'),
+    ('I <3 this, a < b', 'I <3 this, a < b'),
+    ('zero​width ‮gnirts', 'zerowidth gnirts'),
+    (None, ''),
+    # Nested markup must not reassemble into a live tag once the inner tag is stripped
+    ('<<b>img src=x onerror=alert(1)>', ''),
+    ('<<<b>b>img src=x onerror=alert(1)>hi', 'hi'),
+    ('<scr<script>x</script>ipt>alert(1)</script>ok', 'alert(1)ok'),  # Left as inert text
+    ('<\u200bimg src=x onerror=alert(1)>', ''),
+    # Unterminated tags are removed to the end of the text
+    ('hello <img src=x onerror=alert(1)', 'hello'),
+    ('hi <<b>img src=x', 'hi'),
+])
+def test_sanitize(text, expected):
+    assert sanitize(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    '<<<b>b>img src=x>', '<\u200b<b>img>', 'a  <i>b</i>\n\tc', 'I <3 this', '<scr<script>ipt>', '  x  ' * 200,
+])
+def test_sanitize_is_idempotent(text):
+    assert sanitize(sanitize(text)) == sanitize(text)
+    assert sanitize(sanitize(text, 20), 20) == sanitize(text, 20)
+
+
+def test_sanitize_bounds_length():
+    assert sanitize('x' * 1000, 10) == 'x' * 10
+
+
+def test_matcher_folds_case_and_accents_and_respects_allowlist():
+    matcher = TermMatcher(['darn', 'bad word'], ['darnley'])
+    text = 'DÁRN it, bad   word? Lord Darnley is fine; darned too'
+    hits = matcher.find(sanitize(text))
+    assert mask(sanitize(text), hits) == '**** it, ********? Lord Darnley is fine; darned too'
+
+
+def test_rate_limit_and_duplicates():
+    moderator = ChatModerator(rate=1.0, burst=2, duplicate_window=30)
+    review = lambda text, now: moderator.review(ROOM, 'ada', {'sender': 'Ada', 'content': text}, now=now)
+    assert review('one', now=0.0)
+    assert review('two', now=0.0)
+    assert review('three', now=0.0) is None   # Bucket empty
+    assert review('three', now=1.0)            # One token back after a second
+    assert review('THREE', now=5.0) is None   # Same text (folded) within the window
+
+
+def test_drop_action_hides_the_message():
+    moderator = ChatModerator(['darn'], action='drop')
+    assert moderator.review(ROOM, 'ada', {'sender': 'Ada', 'content': 'darn'}) is None
+
+
+def test_moderate_event_rewrites_chat_once_at_ingest():
+    moderator = ChatModerator(['darn'])
+    event = moderate_event(chat('<i>darn</i> it', name='<b>Ada</b>'), moderator)
+    message = event['payload']['object']['chat_message']
+    assert (message['sender_name'], message['message_content']) == ('Ada', '**** it')
+
+
+@pytest.mark.anyio
+async def test_nested_markup_never_reaches_the_chat_frame():
+    event = moderate_event(chat('<<<b>b>img src=x onerror=alert(1)>hi', name='<<b>img src=x onerror=alert(1)>Ada'),
+                           ChatModerator())
+    dispatcher = EventDispatcher(OverlayBroker())
+    dispatcher.dispatch(event)
+
+    (frame,) = dispatcher.broker.state.catch_up(ROOM, 'chat')[0]['state']['events']
+    assert (frame['sender'], frame['content']) == ('Ada', 'hi')
+
+
+def test_moderate_event_leaves_other_events_alone():
+    moderator = ChatModerator(['darn'], action='drop', burst=1)
+    private = chat('darn', recipient_type='host')
+    assert moderate_event(private, moderator) is private
+    assert content(private) == 'darn'
+    # Private messages don't spend the sender's rate limit
+    assert moderate_event(chat('hello'), moderator) is not None
+    joined = {'event': 'meeting.participant_joined', 'payload': {'object': {'id': 1}}}
+    assert moderate_event(joined, moderator) is joined
+
+
+@pytest.mark.anyio
+async def test_workers_dispatch_moderated_events_identically():
+    # Moderation already happened at ingest; dispatch has no clock- or history-dependent step
+    moderator = ChatModerator(burst=1)
+    events = [moderate_event(chat('same words', sender='ada'), moderator) for _ in range(3)]
+    events = [event for event in events if event]
+    workers = [EventDispatcher(OverlayBroker()) for _ in range(2)]
+    for worker in workers:
+        for event in events + [chat('repeat'), chat('repeat')]:
+            worker.dispatch(event)
+
+    frames = [worker.broker.state.catch_up(ROOM, 'chat')[0]['state']['events'] for worker in workers]
+    assert frames[0] == frames[1]
+    assert [frame['content'] for frame in frames[0]] == ['same words', 'repeat', 'repeat']
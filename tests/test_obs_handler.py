@@ -0,0 +1,137 @@
+import asyncio
+import base64
+import hashlib
+import json
+
+import pytest
+from aiohttp import WSMsgType, web
+
+from src.frontend.overlays.shared import obs_handler as obs_handler_module
+from src.frontend.overlays.shared.obs_handler import OBSHandler, OpCode
+
+PASSWORD = 'obs-test-password'
+
+
+class FakeOBS:
+    """obs-websocket v5: Hello/Identify with auth, then answers Request and RequestBatch"""
+    def __init__(self, password=PASSWORD):
+        self.password = password
+        self.requests = []
+        self.batches = []
+        self.identified = 0
+        self.drop_next = False      # Close the socket instead of answering the next request
+        self.received = asyncio.Event()
+        self.release = asyncio.Event()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/', self.socket)
+        return app
+
+    async def socket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        salt, challenge = 'salt', 'challenge'
+        await ws.send_json({'op': OpCode.HELLO, 'd': {
+            'rpcVersion': 1, 'authentication': {'salt': salt, 'challenge': challenge}
+        }})
+        identify = (await ws.receive_json())['d']
+        secret = base64.b64encode(hashlib.sha256((self.password + salt).encode()).digest())
+        expected = base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+        if identify.get('authentication') != expected:
+            await ws.close(code=4009)
+            return ws
+        self.identified += 1
+        await ws.send_json({'op': OpCode.IDENTIFIED, 'd': {'negotiatedRpcVersion': 1}})
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                break
+            message = json.loads(message.data)
+            data = message['d']
+            if self.drop_next:
+                self.drop_next = False
+                self.received.set()
+                await self.release.wait()
+                await ws.close()
+                break
+            if message['op'] == OpCode.REQUEST:
+                self.requests.append(data)
+                await ws.send_json({'op': OpCode.REQUEST_RESPONSE, 'd': {
+                    'requestType': data['requestType'], 'requestId': data['requestId'],
+                    'requestStatus': {'result': True, 'code': 100}
+                }})
+            elif message['op'] == OpCode.REQUEST_BATCH:
+                self.batches.append(data['requests'])
+                await ws.send_json({'op': OpCode.REQUEST_BATCH_RESPONSE, 'd': {
+                    'requestId': data['requestId'],
+                    'results': [
+                        {'requestType': item['requestType'], 'requestStatus': {'result': True, 'code': 100}}
+                        for item in data['requests']
+                    ]
+                }})
+        return ws
+
+
+def texts(requests):
+    return {item['requestData']['inputName']: item['requestData']['inputSettings']['text'] for item in requests}
+
+
+async def settled(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('condition not reached')
+
+
+@pytest.fixture
+async def obs(stub_server, monkeypatch):
+    monkeypatch.setattr(obs_handler_module, 'RECONNECT_DELAY', 0.01)
+    server = FakeOBS()
+    url = (await stub_server(server.app())).replace('http', 'ws', 1)
+    handler = OBSHandler(url, PASSWORD, request_timeout=2.0, update_rate=50)
+    assert await handler.connect()
+    yield handler, server
+    await handler.close()
+
+
+@pytest.mark.anyio
+async def test_several_sources_go_in_one_request_batch(obs):
+    handler, server = obs
+    results = await handler.update_sources({'ChatOverlay': 'hi', 'ReactionOverlay': 'wow'})
+
+    assert len(results) == 2
+    assert server.requests == []
+    assert [texts(batch) for batch in server.batches] == [{'ChatOverlay': 'hi', 'ReactionOverlay': 'wow'}]
+
+
+@pytest.mark.anyio
+async def test_scheduled_updates_coalesce_into_one_flush(obs):
+    handler, server = obs
+    for i in range(20):
+        handler.schedule_update('ChatOverlay', {'text': f"message {i}"})
+    handler.schedule_update('ReactionOverlay', {'text': 'wow'})
+    await settled(lambda: handler.update_stats()['sent'] == 2)
+
+    assert [texts(batch) for batch in server.batches] == [{'ChatOverlay': 'message 19', 'ReactionOverlay': 'wow'}]
+    assert handler.update_stats() == {'pending': 0, 'sent': 2, 'dropped': 19}
+
+
+@pytest.mark.anyio
+async def test_failed_flush_is_requeued_unless_superseded(obs):
+    handler, server = obs
+    server.drop_next = True
+    handler.schedule_update('ChatOverlay', {'text': 'old'})
+    handler.schedule_update('ReactionOverlay', {'text': 'wow'})
+
+    # While the doomed batch is in flight a newer chat line arrives
+    await server.received.wait()
+    handler.schedule_update('ChatOverlay', {'text': 'new'})
+    server.release.set()
+    await settled(lambda: server.batches)
+
+    assert server.identified == 2
+    assert [texts(batch) for batch in server.batches] == [{'ChatOverlay': 'new', 'ReactionOverlay': 'wow'}]
+    await settled(lambda: handler.update_stats()['sent'] == 2)
+    assert handler.update_stats()['dropped'] == 1
@@ -0,0 +1,78 @@
+from src.server.websocket.state import OverlayState
+
+ROOM = '434343'
+
+
+def publish(state, overlay_type, count, room=ROOM):
+    for index in range(count):
+        state.record(room, overlay_type, {'type': overlay_type, 'index': index})
+
+
+def test_sequence_numbers_are_per_room_and_overlay():
+    state = OverlayState()
+    publish(state, 'chat', 3)
+    publish(state, 'countdown', 1)
+    publish(state, 'chat', 1, room='other')
+
+    assert [frame['seq'] for frame in state.catch_up(ROOM, 'chat')[0]['state']['events']] == [1, 2, 3]
+    assert state.catch_up(ROOM, 'countdown')[0]['seq'] == 1
+    assert state.catch_up('other', 'chat')[0]['seq'] == 1
+
+
+def test_late_joiner_gets_one_initial_state():
+    state = OverlayState({'chat': 2})
+    publish(state, 'chat', 3)
+
+    (frame,) = state.catch_up(ROOM, 'chat')
+    assert frame['type'] == 'initial_state' and frame['seq'] == 3
+    assert [event['index'] for event in frame['state']['events']] == [1, 2]  # Bounded ring buffer
+
+
+def test_reconnect_replays_only_missed_frames():
+    state = OverlayState({'chat': 5})
+    publish(state, 'chat', 4)
+
+    assert [frame['seq'] for frame in state.catch_up(ROOM, 'chat', 2, state.epoch)] == [3, 4]
+    assert state.catch_up(ROOM, 'chat', 4, state.epoch) == []
+
+
+def test_reconnect_past_the_window_falls_back_to_initial_state():
+    state = OverlayState({'chat': 2})
+    publish(state, 'chat', 5)
+
+    (frame,) = state.catch_up(ROOM, 'chat', 1, state.epoch)
+    assert frame['type'] == 'initial_state'
+
+
+def test_last_seq_from_another_worker_gets_initial_state():
+    worker_a, worker_b = OverlayState(), OverlayState()
+    publish(worker_a, 'chat', 2)
+    publish(worker_b, 'chat', 5)  # Started earlier, so its numbers run ahead
+
+    assert worker_a.epoch != worker_b.epoch
+    for last_seq in (2, 5):
+        (frame,) = worker_b.catch_up(ROOM, 'chat', last_seq, worker_a.epoch)
+        assert frame['type'] == 'initial_state' and frame['seq'] == 5
+    (frame,) = worker_b.catch_up(ROOM, 'chat', 3)  # No epoch at all
+    assert frame['type'] == 'initial_state'
+
+
+def test_latest_only_and_provider_overlays():
+    state = OverlayState()
+    assert state.catch_up(ROOM, 'countdown') == []
+    publish(state, 'countdown', 3)
+    assert state.catch_up(ROOM, 'countdown')[0]['state'] == {'event': {'type': 'countdown', 'index': 2, 'seq': 3}}
+
+    state.register('participants', lambda room: {'room': room})
+    assert state.catch_up(ROOM, 'participants')[0]['state'] == {'room': ROOM}
+    assert state.catch_up(ROOM, 'unknown') == []
+
+
+def test_reset_forgets_only_that_room():
+    state = OverlayState()
+    publish(state, 'chat', 2)
+    publish(state, 'chat', 2, room='other')
+    state.reset(ROOM)
+
+    assert state.catch_up(ROOM, 'chat')[0]['state'] == {'events': []}
+    assert state.catch_up('other', 'chat')[0]['seq'] == 2
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.server.backplane import get_backplane
+from src.server.overlay_tokens import ALL_OVERLAYS, COUNTDOWN_CONTROL, OverlayTokenSigner, overlay_tokens
+from src.server.websocket.routes import router
+
+MEETING = '434343'
+OTHER_MEETING = '999999'
+
+
+def in_hours(hours: float) -> datetime:
+    return datetime.now() + timedelta(hours=hours)
+
+
+@pytest.fixture
+def signer():
+    return OverlayTokenSigner(secret='test-secret')
+
+
+def test_verified_claims(signer):
+    token = signer.mint('client-1', 'chat', in_hours(1), MEETING)
+    access = signer.verify(token, 'chat')
+    assert access['client_id'] == 'client-1'
+    assert access['meeting_id'] == MEETING
+    assert access['overlay_type'] == 'chat'
+
+
+def test_rejected_tokens(signer):
+    assert signer.verify(signer.mint('client-1', 'chat', in_hours(1), MEETING), 'reactions') is None
+    assert signer.verify(signer.mint('client-1', 'chat', in_hours(-1), MEETING), 'chat') is None
+    assert signer.verify(OverlayTokenSigner(secret='other').mint('c', 'chat', in_hours(1), MEETING)) is None
+    assert signer.verify('not-a-token') is None
+
+
+def test_combined_token_opens_every_overlay(signer):
+    token = signer.mint('client-1', ALL_OVERLAYS, in_hours(1), MEETING)
+    assert signer.verify(token, 'word_cloud')['meeting_id'] == MEETING
+
+
+def test_control_scope_needs_its_own_token(signer):
+    assert signer.verify(signer.mint('client-1', ALL_OVERLAYS, in_hours(1), MEETING), COUNTDOWN_CONTROL) is None
+    assert signer.verify(signer.mint('client-1', 'countdown', in_hours(1), MEETING), COUNTDOWN_CONTROL) is None
+    control = signer.mint('client-1', COUNTDOWN_CONTROL, in_hours(1), MEETING)
+    assert signer.verify(control, COUNTDOWN_CONTROL)['meeting_id'] == MEETING
+    assert signer.verify(control, 'countdown') is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(overlay_tokens, '_secret', 'test-secret')
+    app = FastAPI()
+    app.include_router(router, prefix='/ws')
+    return TestClient(app)
+
+
+def connect(client, token, meeting):
+    with client.websocket_connect('/ws/overlay/chat') as ws:
+        ws.send_json({'type': 'auth', 'token': token, 'meeting_id': meeting})
+        assert ws.receive_json()['type'] == 'epoch'
+        return ws.receive_json()
+
+
+def test_overlay_joins_its_own_meeting(client):
+    token = overlay_tokens.mint('client-1', 'chat', in_hours(1), MEETING)
+    assert connect(client, token, MEETING)['type'] == 'initial_state'
+
+
+def test_overlay_token_for_another_meeting_is_refused(client):
+    token = overlay_tokens.mint('client-1', 'chat', in_hours(1), MEETING)
+    with pytest.raises(WebSocketDisconnect) as closed:
+        connect(client, token, OTHER_MEETING)
+    assert closed.value.code == 4403
+
+
+def test_invalid_overlay_token_is_refused(client):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        connect(client, 'forged', MEETING)
+    assert closed.value.code == 4401
+
+
+def bearer(overlay_type, meeting=MEETING):
+    return {'Authorization': f"Bearer {overlay_tokens.mint('client-1', overlay_type, in_hours(1), meeting)}"}
+
+
+def test_countdown_control_needs_the_meetings_control_token(client, monkeypatch):
+    published = []
+
+    async def publish(event):
+        published.append(event)
+        return 1
+
+    monkeypatch.setattr(get_backplane(), 'publish', publish)
+    url = f"/ws/countdown/{MEETING}/start"
+    assert client.post(url, headers=bearer('countdown')).status_code == 401
+    assert client.post(url, headers=bearer(ALL_OVERLAYS)).status_code == 401
+    assert client.post(url, headers=bearer(COUNTDOWN_CONTROL, OTHER_MEETING)).status_code == 403
+    assert client.get(f"/ws/countdown/{MEETING}", headers=bearer('countdown')).status_code == 401
+    assert published == []
+
+    response = client.post(url, json={'duration': 60}, headers=bearer(COUNTDOWN_CONTROL))
+    assert response.status_code == 200
+    assert [event['payload']['object']['id'] for event in published] == [MEETING]
+
+
+def test_countdown_without_a_signing_secret_is_503(configure, monkeypatch):
+    configure()
+    monkeypatch.setattr(overlay_tokens, '_secret', None)
+    app = FastAPI()
+    app.include_router(router, prefix='/ws')
+    client = TestClient(app)
+    assert client.post(f"/ws/countdown/{MEETING}/start", headers={'Authorization': 'Bearer x'}).status_code == 503
+    assert client.get(f"/ws/countdown/{MEETING}", headers={'Authorization': 'Bearer x'}).status_code == 503
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from src.server.websocket.aggregator import ReactionAggregator
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.dispatcher import EventDispatcher
+
+ROOM = '434343'
+
+
+class FakeSocket:
+    """Collects the frames an overlay would receive"""
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+def feedback(satisfied, name):
+    return {
+        'event': 'meeting.participant_feedback',
+        'payload': {'object': {'id': ROOM, 'participant': {
+            'participant_uuid': name, 'participant_user_id': name, 'user_name': name,
+            'feedback': {'satisfied': satisfied}
+        }}}
+    }
+
+
+@pytest.mark.anyio
+async def test_feedback_storm_becomes_one_batch():
+    broker = OverlayBroker()
+    dispatcher = EventDispatcher(broker)
+    dispatcher.reactions.window = 0.05
+    socket = FakeSocket()
+    await broker.subscribe(socket, ROOM, 'reactions')
+
+    for index in range(500):
+        dispatcher.dispatch(feedback(index % 5 != 0, f"Attendee {index}"))
+    await asyncio.sleep(0.1)
+
+    (batch,) = [frame for frame in socket.frames if frame['type'] == 'reaction_batch']
+    assert batch['counts'] == {'\U0001F44D': 400, '\U0001F44E': 100}
+    assert batch['total'] == 500
+    assert len(batch['names']) == 10
+    await broker.close()
+
+
+@pytest.mark.anyio
+async def test_reactions_without_subscribers_are_not_buffered():
+    dispatcher = EventDispatcher(OverlayBroker())
+    dispatcher.dispatch(feedback(True, 'Ada'))
+    assert dispatcher.reactions._pending == {}
+
+
+@pytest.mark.anyio
+async def test_windows_are_per_room():
+    broker = OverlayBroker()
+    aggregator = ReactionAggregator(broker, window=60)
+    aggregator.add('a', 'x')
+    aggregator.add('b', 'y')
+    aggregator.add('a', 'x', 'Ada')
+
+    assert aggregator.flush('a') == 0  # Nobody subscribed, but the window is consumed
+    assert set(aggregator._pending) == {'b'}
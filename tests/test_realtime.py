@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from fastapi.testclient import TestClient
+
+from src.server import oauth_server
+from src.server.token_store import TokenStore
+from src.server.websocket import handler as handler_module
+from src.server.websocket.handler import TOKEN_REJECTED, RealtimeConnections, WebSocketHandler
+
+EVENT = {'event': 'meeting.chat_message_sent', 'payload': {'object': {'id': 1}}}
+
+
+class FakeZoom:
+    """Zoom's realtime socket: each connection follows the next scripted action, then 'serve'"""
+    def __init__(self, actions=()):
+        self.actions = list(actions)
+        self.authorizations = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/ws', self.socket)
+        return app
+
+    async def socket(self, request):
+        self.authorizations.append(request.headers.get('Authorization'))
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        action = self.actions.pop(0) if self.actions else 'serve'
+        if action == 'reject':
+            await ws.close(code=TOKEN_REJECTED)
+        elif action == 'error':
+            await ws.close(code=1011)
+        else:
+            await ws.send_str('not json')
+            await ws.send_json({'module': 'message', 'content': '{"event": '})
+            await ws.send_json({'module': 'message', 'content': json.dumps(EVENT)})
+            await ws.receive()  # Hold the connection until the client leaves
+        return ws
+
+
+class FakeTokens:
+    """Token manager stand-in: every refresh issues the next access token"""
+    def __init__(self):
+        self.refreshes = 0
+
+    async def get_valid_token(self, client_id):
+        return f"access-{self.refreshes}"
+
+    async def refresh_token(self, client_id):
+        self.refreshes += 1
+        return {'access_token': f"access-{self.refreshes}"}
+
+
+class FakeBackplane:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, event):
+        self.published.append(event)
+        return 1
+
+
+@pytest.fixture
+async def connect(tmp_path, configure, stub_server, monkeypatch):
+    """connect(zoom) -> a running handler on the fake Zoom, with fake tokens and backplane"""
+    monkeypatch.setattr(handler_module, 'RECONNECT_BASE', 0.01)
+    handlers = []
+
+    async def start(zoom: FakeZoom) -> WebSocketHandler:
+        url = (await stub_server(zoom.app())).replace('http', 'ws', 1)
+        configure(zoom={'websocket_url': f"{url}/ws"}, storage={'data_dir': str(tmp_path)})
+        handler = WebSocketHandler('zoom-user-1')
+        handler.token_manager = FakeTokens()
+        handler.backplane = FakeBackplane()
+        handlers.append(handler)
+        await handler.start()
+        return handler
+
+    yield start
+    for handler in handlers:
+        await handler.stop()
+
+
+async def settled(condition, timeout=3.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('condition not reached')
+
+
+@pytest.mark.anyio
+async def test_malformed_frames_are_skipped(connect):
+    zoom = FakeZoom()
+    handler = await connect(zoom)
+    await settled(lambda: handler.backplane.published)
+
+    assert handler.backplane.published == [EVENT]
+    assert zoom.authorizations == ['Bearer access-0']
+    assert handler.stats()['state'] == 'connected'
+
+
+@pytest.mark.anyio
+async def test_token_rejection_refreshes_even_after_other_failures(connect):
+    # A server error first, so the 4700 arrives on a later reconnect attempt
+    zoom = FakeZoom(['error', 'reject'])
+    handler = await connect(zoom)
+    await settled(lambda: handler.backplane.published)
+
+    assert handler.token_manager.refreshes == 1
+    assert zoom.authorizations == ['Bearer access-0', 'Bearer access-0', 'Bearer access-1']
+
+
+@pytest.mark.anyio
+async def test_repeated_rejections_back_off_after_one_refresh(connect):
+    zoom = FakeZoom(['reject'] * 5)
+    handler = await connect(zoom)
+    await settled(lambda: handler.backplane.published)
+
+    assert handler.token_manager.refreshes == 1
+    assert len(zoom.authorizations) == 6
+
+
+@pytest.mark.anyio
+async def test_connections_are_kept_per_account(tmp_path, configure, monkeypatch, token_store):
+    configure(storage={'data_dir': str(tmp_path)})
+    started = []
+
+    async def start(self):
+        started.append(self.client_id)
+
+    monkeypatch.setattr(WebSocketHandler, 'start', start)
+    connections = RealtimeConnections(token_store)
+    first = await connections.start('zoom-user-1')
+    assert await connections.start('zoom-user-1') is first
+    await connections.start('zoom-user-2')
+
+    assert started == ['zoom-user-1', 'zoom-user-1', 'zoom-user-2']
+    await connections.stop()
+    assert connections.handlers == {}
+
+
+@pytest.fixture
+async def token_store(tmp_path):
+    """Token database shared by every 'worker' in a test"""
+    store = TokenStore(db_path=str(tmp_path / 'tokens.db'), encryption_key='test-key')
+    for client_id in ('zoom-user-1', 'zoom-user-2'):
+        await store.save(client_id, {'access_token': 'a', 'refresh_token': 'r', 'expires_in': 3600})
+    yield store
+    await store.close()
+
+
+@pytest.mark.anyio
+async def test_stored_accounts_reconnect_once_across_workers(tmp_path, configure, monkeypatch, token_store):
+    configure(storage={'data_dir': str(tmp_path)})
+    started = []
+
+    async def start(self):
+        started.append(self.client_id)
+
+    async def stop(self):
+        pass
+
+    monkeypatch.setattr(WebSocketHandler, 'start', start)
+    monkeypatch.setattr(WebSocketHandler, 'stop', stop)
+    first, second = RealtimeConnections(token_store), RealtimeConnections(token_store)
+
+    assert await first.resume() == 2
+    assert await second.resume() == 0  # Same database: the first worker already has both accounts
+    assert sorted(started) == ['zoom-user-1', 'zoom-user-2']
+
+    await first.stop()
+    assert await second.resume() == 2  # Released on shutdown, so a restarted worker takes over
+    await second.stop()
+
+
+def test_lifespan_resumes_realtime_connections(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    calls = []
+
+    async def resume():
+        calls.append('resume')
+        return 0
+
+    monkeypatch.setattr(oauth_server.realtime, 'resume', resume)
+    with TestClient(oauth_server.create_app()):
+        assert calls == ['resume']
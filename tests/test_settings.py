@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import PROJECT_ROOT, ConfigStore, Settings
+
+
+def test_databases_default_to_the_project_data_dir(monkeypatch):
+    monkeypatch.delenv('VERCEL', raising=False)
+    assert Settings().storage.data_path == PROJECT_ROOT / 'data'
+
+
+def test_databases_use_the_temp_dir_on_vercel(monkeypatch, tmp_path):
+    monkeypatch.setenv('VERCEL', '1')
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+    path = Path(Settings().storage.database('tokens.db'))
+    assert path == tmp_path / 'vsa' / 'tokens.db'
+    assert path.parent.is_dir()
+
+
+def test_absolute_database_names_are_kept(tmp_path):
+    storage = Settings(storage={'data_dir': str(tmp_path / 'data')}).storage
+    assert storage.database('tokens.db') == str(tmp_path / 'data' / 'tokens.db')
+    assert storage.database(str(tmp_path / 'other.db')) == str(tmp_path / 'other.db')
+
+
+def test_webhook_secret_is_required_outside_development():
+    Settings(environment='development')
+    with pytest.raises(ValueError, match='secret_token'):
+        Settings(environment='preview')
+    Settings(environment='preview', security={'secret_token': 'secret'})
+
+
+def test_subscription_database_follows_settings(configure, tmp_path):
+    from src.subscription.database import SubscriptionDB
+
+    configure(storage={'data_dir': str(tmp_path)})
+    SubscriptionDB._instance = None
+    try:
+        assert SubscriptionDB().db_path == str(tmp_path / 'subscriptions.db')
+    finally:
+        SubscriptionDB._instance = None
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """write(text) -> a ConfigStore reading that config.yaml"""
+    monkeypatch.delenv('ACTIVE_ENVIRONMENT', raising=False)
+    path = tmp_path / 'config.yaml'
+    store = ConfigStore(path)
+
+    def write(text: str, mtime: float = 1000.0) -> ConfigStore:
+        path.write_text(text)
+        os.utime(path, (mtime, mtime))
+        return store
+
+    return write
+
+
+def test_reload_applies_valid_changes_and_notifies(config_file):
+    store = config_file('tuning:\n  event_queue_size: 100\n')
+    assert store.reload()
+    seen = []
+    store.on_reload(lambda current: seen.append(current.tuning.event_queue_size))
+
+    config_file('tuning:\n  event_queue_size: 250\n', mtime=2000.0)
+    assert store.reload()
+    assert store.tuning.event_queue_size == 250  # Holders of the store see the new value
+    assert seen == [250]
+
+
+def test_invalid_reload_keeps_the_previous_settings(config_file):
+    store = config_file('tuning:\n  event_queue_size: 100\n')
+    store.reload()
+    previous = store.current
+    seen = []
+    store.on_reload(seen.append)
+
+    config_file('tuning:\n  event_queue_size: -5\n', mtime=2000.0)
+    assert not store.reload()
+    config_file('tuning: [not, a, mapping\n', mtime=3000.0)
+    assert not store.reload()
+
+    assert store.current is previous
+    assert seen == []
+
+
+def test_a_failing_listener_does_not_stop_the_others(config_file):
+    store = config_file('tuning:\n  event_queue_size: 100\n')
+    seen = []
+    store.on_reload(lambda current: 1 / 0)
+    store.on_reload(lambda current: seen.append(current.tuning.event_queue_size))
+
+    assert store.reload()
+    assert seen == [100]
+
+
+def test_reload_if_changed_follows_the_file(config_file):
+    store = config_file('tuning:\n  event_queue_size: 100\n')
+    assert not store.reload_if_changed()  # Nothing loaded yet
+    store.reload()
+    assert not store.reload_if_changed()
+
+    config_file('tuning:\n  event_queue_size: 300\n', mtime=2000.0)
+    assert store.reload_if_changed()
+    assert store.tuning.event_queue_size == 300
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import cache as cache_module
+
+EXPIRY = datetime(2030, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Cache clock only; patching time.monotonic itself would also move the event loop's"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def subscription(**changes):
+    return {
+        'plan_type': 'monthly', 'status': 'active', 'start_date': EXPIRY - timedelta(days=30),
+        'expiry_date': EXPIRY, 'grace_period_end': EXPIRY + timedelta(days=7),
+        'amount': Decimal('9.99'), 'currency': 'USD', **changes
+    }
+
+
+def count_reads(db, monkeypatch):
+    reads = []
+    execute = db.pool.execute
+
+    async def counted(sql, params=()):
+        reads.append(params)
+        return await execute(sql, params)
+
+    monkeypatch.setattr(db.pool, 'execute', counted)
+    return reads
+
+
+@pytest.mark.anyio
+async def test_reads_are_cached_within_the_ttl(subscription_db, clock, monkeypatch):
+    await subscription_db.set_subscription('user-1', subscription())
+    reads = count_reads(subscription_db, monkeypatch)
+
+    first = await subscription_db.get_subscription('user-1')
+    assert (first['status'], first['expiry_date']) == ('active', EXPIRY)
+    clock.value += subscription_db.cache.ttl - 1
+    assert await subscription_db.get_subscription('user-1') == first
+    assert len(reads) == 1
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_read_again(subscription_db, clock):
+    await subscription_db.set_subscription('user-1', subscription())
+    await subscription_db.get_subscription('user-1')
+    await subscription_db.pool.execute("UPDATE subscriptions SET plan_type = 'yearly'")  # Out-of-band change
+    assert (await subscription_db.get_subscription('user-1'))['plan_type'] == 'monthly'
+
+    clock.value += subscription_db.cache.ttl + 1
+    assert (await subscription_db.get_subscription('user-1'))['plan_type'] == 'yearly'
+
+
+@pytest.mark.anyio
+async def test_missing_subscriptions_are_cached_too(subscription_db, monkeypatch):
+    reads = count_reads(subscription_db, monkeypatch)
+    assert await subscription_db.get_subscription('nobody') is None
+    assert await subscription_db.get_subscription('nobody') is None
+    assert len(reads) == 1
+
+
+@pytest.mark.anyio
+async def test_writes_invalidate_the_cached_row(subscription_db):
+    assert await subscription_db.get_subscription('user-1') is None  # Cached as missing
+    await subscription_db.set_subscription('user-1', subscription())
+    assert (await subscription_db.get_subscription('user-1'))['plan_type'] == 'monthly'
+
+    await subscription_db.set_subscription('user-1', {'plan_type': 'yearly'})
+    updated = await subscription_db.get_subscription('user-1')
+    assert (updated['plan_type'], updated['currency']) == ('yearly', 'USD')  # Other fields kept
+
+
+@pytest.mark.anyio
+async def test_invalidate_drops_one_or_all_entries(subscription_db):
+    for user_id in ('user-1', 'user-2'):
+        await subscription_db.set_subscription(user_id, subscription())
+        await subscription_db.get_subscription(user_id)
+
+    subscription_db.invalidate('user-1')
+    assert 'user-1' not in subscription_db.cache and 'user-2' in subscription_db.cache
+    subscription_db.invalidate()
+    assert len(subscription_db.cache) == 0
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from src.subscription import database as database_module
+from src.subscription import sweeper as sweeper_module
+from src.subscription.sweeper import SubscriptionSweeper
+
+NOW = datetime(2030, 6, 1, 12, 0)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def fixed_clock(monkeypatch):
+    monkeypatch.setattr(sweeper_module, 'datetime', FixedDatetime)
+    monkeypatch.setattr(database_module, 'time', SimpleNamespace(time=NOW.timestamp))
+
+
+def subscription(status, expires_in_days, grace_days=7):
+    expiry = NOW + timedelta(days=expires_in_days)
+    return {
+        'plan_type': 'monthly', 'status': status, 'start_date': expiry - timedelta(days=30),
+        'expiry_date': expiry, 'grace_period_end': expiry + timedelta(days=grace_days),
+        'amount': Decimal('9.99'), 'currency': 'USD'
+    }
+
+
+async def statuses(db):
+    rows = await db.pool.execute('SELECT user_id, status FROM subscriptions ORDER BY user_id')
+    return {row['user_id']: row['status'] for row in rows}
+
+
+@pytest.mark.anyio
+async def test_sweep_moves_subscriptions_between_states(subscription_db, fixed_clock):
+    await subscription_db.set_subscription('current', subscription('active', 10))
+    await subscription_db.set_subscription('lapsed', subscription('active', -2))
+    await subscription_db.set_subscription('long-lapsed', subscription('active', -30))
+    await subscription_db.set_subscription('grace-over', subscription('grace_period', -10))
+    await subscription_db.set_subscription('renewed', subscription('expired', 20))
+
+    counts = await SubscriptionSweeper(subscription_db).sweep()
+
+    assert counts == {'renewed': 1, 'grace_period': 1, 'expired': 2}
+    assert await statuses(subscription_db) == {
+        'current': 'active', 'lapsed': 'grace_period', 'long-lapsed': 'expired',
+        'grace-over': 'expired', 'renewed': 'active'
+    }
+    # A second sweep at the same time finds nothing to move
+    assert await SubscriptionSweeper(subscription_db).sweep() == {'renewed': 0, 'grace_period': 0, 'expired': 0}
+
+
+@pytest.mark.anyio
+async def test_sweep_rebuilds_the_active_until_map(subscription_db, fixed_clock):
+    await subscription_db.set_subscription('current', subscription('active', 10))
+    await subscription_db.set_subscription('lapsed', subscription('active', -2))
+    assert subscription_db.is_active('current') is None  # Not loaded before the first sweep
+
+    await SubscriptionSweeper(subscription_db).sweep()
+
+    assert subscription_db.active_until == {'current': (NOW + timedelta(days=10)).timestamp()}
+    assert subscription_db.is_active('current')
+    assert not subscription_db.is_active('lapsed')
+    assert not subscription_db.is_active('unknown')
+
+
+@pytest.mark.anyio
+async def test_sweep_clears_cached_rows_it_changed(subscription_db, fixed_clock):
+    await subscription_db.set_subscription('lapsed', subscription('active', -2))
+    assert (await subscription_db.get_subscription('lapsed'))['status'] == 'active'
+
+    await SubscriptionSweeper(subscription_db).sweep()
+    assert (await subscription_db.get_subscription('lapsed'))['status'] == 'grace_period'
+
+
+@pytest.mark.anyio
+async def test_writes_keep_the_map_current_between_sweeps(subscription_db, fixed_clock):
+    await SubscriptionSweeper(subscription_db).sweep()
+    await subscription_db.set_subscription('new', subscription('active', 5))
+    assert subscription_db.is_active('new')
+
+    await subscription_db.set_subscription('new', {'status': 'expired'})
+    assert not subscription_db.is_active('new')
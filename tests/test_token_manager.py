@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from src.server import token_manager as token_manager_module
+from src.server import token_store as token_store_module
+from src.server.http_client import HTTPClient
+from src.server.token_manager import TokenManager
+from src.server.token_store import TokenStore
+
+CLIENT = 'zoom-user-1'
+
+
+class FakeTokenEndpoint:
+    """Zoom's /oauth/token: answers with the scripted statuses in turn, then 200"""
+    def __init__(self, statuses=(), delay=0.05):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.requests = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post('/oauth/token', self.token)
+        return app
+
+    async def token(self, request):
+        self.requests.append(dict(await request.post()))
+        await asyncio.sleep(self.delay)  # Long enough for concurrent callers to overlap
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return web.json_response({'reason': 'Invalid Token!'}, status=status)
+        return web.json_response({
+            'access_token': f"access-{len(self.requests)}",
+            'refresh_token': f"refresh-{len(self.requests)}",
+            'expires_in': 3600
+        })
+
+
+@pytest.fixture
+async def manager(tmp_path, configure, stub_server):
+    configure(zoom={'client_id': 'id', 'client_secret': 'secret'},
+              security={'token_encryption_key': 'test-key'},
+              storage={'data_dir': str(tmp_path)})
+    TokenManager._instance = None
+    manager = TokenManager()
+    manager.http = HTTPClient()
+
+    async def serve(endpoint: FakeTokenEndpoint):
+        manager.token_url = f"{await stub_server(endpoint.app())}/oauth/token"
+        return endpoint
+
+    manager.serve = serve
+    yield manager
+    await manager.close()
+    await manager.http.close()
+    TokenManager._instance = None
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(token_manager_module.asyncio, 'sleep', lambda delay: sleep(0))
+
+
+async def store_tokens(manager, age: float = 0):
+    await manager.store.save(CLIENT, {
+        'access_token': 'access-0',
+        'refresh_token': 'refresh-0',
+        'expires_in': 3600,
+        'created_at': time.time() - age
+    })
+
+
+@pytest.mark.anyio
+async def test_concurrent_refreshes_share_one_request(manager):
+    endpoint = await manager.serve(FakeTokenEndpoint())
+    await store_tokens(manager)
+
+    results = await asyncio.gather(*[manager.refresh_token(client_id=CLIENT) for _ in range(10)])
+
+    assert len(endpoint.requests) == 1
+    assert endpoint.requests[0] == {'grant_type': 'refresh_token', 'refresh_token': 'refresh-0'}
+    assert {tokens['access_token'] for tokens in results} == {'access-1'}
+    assert (await manager.store.load(CLIENT))['refresh_token'] == 'refresh-1'
+
+
+@pytest.mark.anyio
+async def test_failed_refresh_is_retried(manager, no_backoff):
+    endpoint = await manager.serve(FakeTokenEndpoint(statuses=[500, 500]))
+    await store_tokens(manager)
+
+    assert await manager.refresh_token(client_id=CLIENT) is None
+    assert await manager.handle_refresh_failure(CLIENT)
+
+    assert len(endpoint.requests) == 3
+    assert await manager.get_token(CLIENT) == 'access-3'
+    assert CLIENT not in manager.refresh_attempts
+
+
+@pytest.mark.anyio
+async def test_giving_up_notifies_and_resets_attempts(manager, no_backoff):
+    await manager.serve(FakeTokenEndpoint(statuses=[401] * 10))
+    await store_tokens(manager)
+    events = []
+
+    async def listener(event):
+        events.append(event)
+
+    manager.add_listener(listener)
+
+    assert not await manager.handle_refresh_failure(CLIENT)
+    assert [event['type'] for event in events] == ['token_refresh_failed']
+    assert CLIENT not in manager.refresh_attempts
+
+
+@pytest.mark.anyio
+async def test_token_near_expiry_is_served_while_refreshing(manager):
+    endpoint = await manager.serve(FakeTokenEndpoint())
+    await store_tokens(manager, age=3500)  # Inside the 300 s refresh buffer, still valid
+
+    assert await manager.get_valid_token(CLIENT) == 'access-0'
+    (task,) = manager._background
+    await task
+
+    assert len(endpoint.requests) == 1
+    assert manager._background == set()
+    assert await manager.get_valid_token(CLIENT) == 'access-1'
+
+
+@pytest.mark.anyio
+async def test_expired_token_waits_for_refresh(manager):
+    await manager.serve(FakeTokenEndpoint())
+    await store_tokens(manager, age=4000)
+
+    assert await manager.get_valid_token(CLIENT) == 'access-1'
+
+
+@pytest.fixture
+async def other_worker(manager):
+    """Another process's store on the same token database, with its own cache"""
+    store = TokenStore(db_path=manager.store.db_path, encryption_key='test-key')
+    yield store
+    await store.close()
+
+
+@pytest.mark.anyio
+async def test_refresh_already_done_by_another_worker_is_adopted(manager, other_worker):
+    endpoint = await manager.serve(FakeTokenEndpoint(statuses=[401]))  # refresh-0 is no longer valid
+    await store_tokens(manager)
+    assert manager.store.get_cached(CLIENT)['refresh_token'] == 'refresh-0'
+
+    rotated = {'access_token': 'access-9', 'refresh_token': 'refresh-9', 'expires_in': 3600, 'created_at': time.time()}
+    await other_worker.save(CLIENT, rotated)
+
+    assert await manager.refresh_token(client_id=CLIENT) == rotated
+    assert endpoint.requests == []
+    assert await manager.get_token(CLIENT) == 'access-9'
+
+
+@pytest.mark.anyio
+async def test_workers_take_turns_refreshing(manager, other_worker):
+    endpoint = await manager.serve(FakeTokenEndpoint())
+    await store_tokens(manager)
+
+    async with other_worker.refresh_lock(CLIENT):
+        refresh = asyncio.create_task(manager.refresh_token(client_id=CLIENT))
+        await asyncio.sleep(0.3)
+        assert not refresh.done() and endpoint.requests == []  # Waits for the other worker's lease
+        await other_worker.save(CLIENT, {'access_token': 'access-9', 'refresh_token': 'refresh-9',
+                                         'expires_in': 3600, 'created_at': time.time()})
+
+    assert (await refresh)['access_token'] == 'access-9'
+    assert endpoint.requests == []
+
+
+@pytest.mark.anyio
+async def test_expired_refresh_lease_is_taken_over(manager, other_worker, monkeypatch):
+    await manager.serve(FakeTokenEndpoint())
+    await store_tokens(manager)
+    monkeypatch.setattr(token_store_module, 'REFRESH_LOCK_TTL', -1.0)  # Leases expire as soon as taken
+
+    async with other_worker.refresh_lock(CLIENT):
+        # The holder crashed mid-refresh as far as anyone else can tell
+        assert (await asyncio.wait_for(manager.refresh_token(client_id=CLIENT), 5))['access_token'] == 'access-1'
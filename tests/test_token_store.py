@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.server.token_store import TokenStore
+from src.utils import cache as cache_module
+
+TOKENS = {'access_token': 'access-1', 'refresh_token': 'refresh-1', 'expires_in': 3600, 'created_at': 1.0}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Cache clock only; patching time.monotonic itself would also move the event loop's"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+async def make_store(tmp_path):
+    """make_store(key=...) -> a store on the shared test database (another worker, or a restart)"""
+    stores = []
+
+    def make(key='test-key', **options) -> TokenStore:
+        store = TokenStore(db_path=str(tmp_path / 'tokens.db'), encryption_key=key, **options)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        await store.close()
+
+
+def count_reads(store, monkeypatch):
+    reads = []
+    execute = store.pool.execute
+
+    async def counted(sql, params=()):
+        if sql.startswith('SELECT token_data'):
+            reads.append(params)
+        return await execute(sql, params)
+
+    monkeypatch.setattr(store.pool, 'execute', counted)
+    return reads
+
+
+@pytest.mark.anyio
+async def test_tokens_are_encrypted_at_rest(make_store):
+    store = make_store()
+    await store.save('client-1', TOKENS)
+
+    (row,) = await store.pool.execute('SELECT token_data FROM oauth_tokens')
+    assert b'refresh-1' not in row['token_data']
+    assert await make_store().load('client-1') == TOKENS  # Decrypted from disk by a fresh store
+
+
+@pytest.mark.anyio
+async def test_wrong_key_reads_nothing(make_store):
+    await make_store().save('client-1', TOKENS)
+    assert await make_store(key='another-key').load('client-1') is None
+
+
+@pytest.mark.anyio
+async def test_missing_key_is_an_error(make_store, configure):
+    configure()
+    with pytest.raises(ValueError):
+        await make_store(key=None).save('client-1', TOKENS)
+
+
+@pytest.mark.anyio
+async def test_cache_serves_reads_until_it_expires(make_store, clock, monkeypatch):
+    store = make_store(cache_ttl=60)
+    await store.save('client-1', TOKENS)
+    reads = count_reads(store, monkeypatch)
+
+    assert await store.load('client-1') == TOKENS
+    assert store.get_cached('client-1') == TOKENS
+    assert reads == []
+
+    clock.value += 61
+    assert store.get_cached('client-1') is None
+    assert await store.load('client-1') == TOKENS
+    assert await store.load('client-1') == TOKENS
+    assert len(reads) == 1  # One disk read, then cached again
+
+    assert await store.load('client-1', fresh=True) == TOKENS
+    assert len(reads) == 2
+
+
+@pytest.mark.anyio
+async def test_save_and_delete_update_the_cache(make_store, monkeypatch):
+    store = make_store()
+    await store.save('client-1', TOKENS)
+    refreshed = dict(TOKENS, access_token='access-2')
+    await store.save('client-1', refreshed)
+    reads = count_reads(store, monkeypatch)
+
+    assert await store.load('client-1') == refreshed
+    await store.delete('client-1')
+    assert store.get_cached('client-1') is None
+    assert await store.load('client-1') is None
+    assert len(reads) == 1
+
+
+@pytest.mark.anyio
+async def test_clients_are_isolated(make_store):
+    store = make_store()
+    await store.save('client-1', TOKENS)
+    await store.save('client-2', dict(TOKENS, access_token='access-other'))
+    await store.delete('client-1')
+
+    assert await store.load('client-1') is None
+    assert (await store.load('client-2'))['access_token'] == 'access-other'
+    assert await store.load('client-3') is None
+    assert await store.client_ids() == ['client-2']
+
+
+@pytest.mark.anyio
+async def test_leases_have_one_owner_until_they_expire(make_store, monkeypatch):
+    first, second = make_store(), make_store()
+    assert await first.acquire_lease('refresh:client-1', 'a', ttl=30)
+    assert await first.acquire_lease('refresh:client-1', 'a', ttl=30)  # Renewal
+    assert not await second.acquire_lease('refresh:client-1', 'b', ttl=30)
+    assert await second.acquire_lease('refresh:client-2', 'b', ttl=30)
+
+    await first.release_lease('refresh:client-1', 'b')  # Only the holder can release
+    assert not await second.acquire_lease('refresh:client-1', 'b', ttl=30)
+    await first.release_lease('refresh:client-1', 'a')
+    assert await second.acquire_lease('refresh:client-1', 'b', ttl=-1)
+    assert await first.acquire_lease('refresh:client-1', 'a', ttl=30)  # Expired, so taken over
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.server.backplane import get_backplane
+from src.server.backplane.resp import RespError
+from src.server.webhooks.routes import router, signature_headers
+
+SECRET = 'webhook-test-secret'
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Events that reached the backplane"""
+    events = []
+
+    async def publish(event):
+        events.append(event)
+        return 1
+
+    monkeypatch.setattr(get_backplane(), 'publish', publish)
+    return events
+
+
+@pytest.fixture
+def client(configure, published):
+    configure(security={'secret_token': SECRET})
+    app = FastAPI()
+    app.include_router(router, prefix='/webhooks')
+    return TestClient(app)
+
+
+def post(client, event, secret=SECRET):
+    body = json.dumps(event).encode()
+    headers = {'Content-Type': 'application/json'}
+    if secret:
+        headers.update(signature_headers(secret, body))
+    return client.post('/webhooks/zoom', content=body, headers=headers)
+
+
+def tsp_created():
+    # Valid event whose schema doesn't require a payload
+    return {'event': 'user.tsp_created', 'event_ts': 1}
+
+
+def test_signed_event_is_published(client, published):
+    response = post(client, tsp_created())
+    assert response.status_code == 200
+    assert published == [tsp_created()]
+
+
+def test_unsigned_event_is_rejected(client, published):
+    assert post(client, tsp_created(), secret=None).status_code == 401
+    assert post(client, tsp_created(), secret='wrong').status_code == 401
+    assert published == []
+
+
+def test_without_secret_nothing_is_accepted(configure, client, published):
+    configure()
+    assert post(client, tsp_created(), secret=None).status_code == 503
+    assert published == []
+
+
+def test_url_validation_challenge(client):
+    response = post(client, {'event': 'endpoint.url_validation', 'payload': {'plainToken': 'abc'}}, secret=None)
+    assert response.status_code == 200
+    assert response.json()['plainToken'] == 'abc'
+
+
+def test_invalid_event_is_rejected(client, published):
+    assert post(client, {'event': 'meeting.chat_message_sent', 'event_ts': 1}).status_code == 400
+    assert published == []
+
+
+def test_backplane_errors_are_503(client, monkeypatch):
+    for error in (ConnectionError('down'), RespError('ERR readonly')):
+        async def publish(event, error=error):
+            raise error
+        monkeypatch.setattr(get_backplane(), 'publish', publish)
+        assert post(client, tsp_created()).status_code == 503
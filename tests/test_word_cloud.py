@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.server.websocket import word_cloud
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.word_cloud import WordCloudAggregator, WordFrequency, tokenize
+
+ROOM = '434343'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Word cloud clock only; patching time.monotonic itself would also move the event loop's"""
+    now = [1000.0]
+    monkeypatch.setattr(word_cloud, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_tokenize_drops_punctuation_short_words_and_stopwords():
+    assert tokenize("Thanks! That's a GREAT demo, really great.") == ['great', 'demo', 'great']
+
+
+def test_top_k_keeps_the_heaviest_words(clock):
+    frequency = WordFrequency(top_k=2)
+    frequency.add(['alpha', 'beta', 'gamma'])
+    frequency.add(['gamma', 'beta'])
+    frequency.add(['gamma'])
+
+    assert frequency.ranking() == [{'text': 'gamma', 'weight': 1.0}, {'text': 'beta', 'weight': 0.67}]
+
+
+def test_recent_words_outweigh_older_ones(clock):
+    frequency = WordFrequency(half_life=10)
+    frequency.add(['older'])
+    frequency.add(['older'])
+    clock[0] += 20  # Two half-lives: each old mention now counts a quarter
+    frequency.add(['newer'])
+
+    assert frequency.ranking() == [{'text': 'newer', 'weight': 1.0}, {'text': 'older', 'weight': 0.5}]
+
+
+def test_rescale_keeps_rankings(clock):
+    frequency = WordFrequency(half_life=1)
+    frequency.add(['steady'])
+    clock[0] += 25  # Weight passes the rescale threshold
+    frequency.add(['steady', 'fresh'])
+    frequency.add(['fresh'])
+
+    assert [entry['text'] for entry in frequency.ranking()] == ['fresh', 'steady']
+    assert max(frequency.counts.values()) < 10
+
+
+def test_memory_is_bounded(clock):
+    frequency = WordFrequency(top_k=5, max_words=100)
+    for index in range(1000):
+        frequency.add([f"word{index}"])
+    assert len(frequency.counts) <= 100
+    assert len(frequency.top) == 5
+
+
+@pytest.mark.anyio
+async def test_flush_publishes_diffs_only_when_the_order_changes(clock):
+    broker = OverlayBroker()
+    cloud = WordCloudAggregator(broker, interval=60)
+
+    cloud.add_message(ROOM, 'pizza pizza tacos')
+    assert cloud.flush(ROOM) == 0  # No subscribers, but the diff is recorded
+    assert cloud.snapshot(ROOM) == [{'text': 'pizza', 'weight': 1.0}, {'text': 'tacos', 'weight': 0.5}]
+    seq = broker.state.topics[(ROOM, 'word_cloud')].seq
+
+    cloud.add_message(ROOM, 'pizza')
+    cloud.flush(ROOM)
+    assert broker.state.topics[(ROOM, 'word_cloud')].seq == seq  # Same order, nothing sent
+
+    cloud.add_message(ROOM, 'tacos tacos tacos')
+    cloud.flush(ROOM)
+    assert broker.state.topics[(ROOM, 'word_cloud')].seq == seq + 1
+    assert [entry['text'] for entry in cloud.snapshot(ROOM)] == ['tacos', 'pizza']
+
+    cloud.reset(ROOM)
+    assert cloud.snapshot(ROOM) == []
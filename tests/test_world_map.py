@@ -0,0 +1,59 @@
+import pytest
+
+from src.server.geo import gazetteer
+from src.server.websocket.broker import OverlayBroker
+from src.server.websocket.dispatcher import EventDispatcher
+
+ROOM = '434343'
+
+
+@pytest.fixture
+def dispatcher():
+    return EventDispatcher(OverlayBroker())
+
+
+def registration(city=None, country=None, event='meeting.registration_created'):
+    return {
+        'event': event,
+        'payload': {'object': {'id': int(ROOM), 'registrant': {
+            'id': 'r1', 'first_name': 'Ada', 'email': 'ada@example.com', 'city': city, 'country': country
+        }}}
+    }
+
+
+def cells(dispatcher):
+    return sum(count for _, count in dispatcher.heat.snapshot(ROOM)['bins'])
+
+
+@pytest.mark.parametrize('text, name', [
+    ('London', 'London'),
+    ('São Paulo', 'Sao Paulo'),
+    ('Austin, TX, USA', 'Austin'),
+    ('greetings from melbourne', 'Melbourne'),
+    ('Barcelonna', 'Barcelona'),
+])
+def test_gazetteer_resolves_free_text(text, name):
+    assert gazetteer.resolve(text).name == name
+
+
+def test_gazetteer_country_codes():
+    assert gazetteer.country('de').name == 'Germany'
+    assert gazetteer.country('XX') is None
+    assert gazetteer.resolve('nowhere in particular') is None
+
+
+@pytest.mark.anyio
+async def test_registrations_fill_the_heat_map(dispatcher):
+    dispatcher.dispatch(registration(city='Tokyo', country='JP'))
+    dispatcher.dispatch(registration(city='Smallville', country='FR', event='webinar.registration_created'))
+    dispatcher.dispatch(registration())
+
+    assert cells(dispatcher) == 2
+
+
+def test_joins_do_not_touch_the_heat_map(dispatcher):
+    dispatcher.dispatch({
+        'event': 'meeting.participant_joined',
+        'payload': {'object': {'id': int(ROOM), 'participant': {'user_id': '1', 'user_name': 'Ada'}}}
+    })
+    assert cells(dispatcher) == 0